@@ -0,0 +1 @@
+"""Performance benchmarks for the Codex backend (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,378 @@
+"""In-process latency benchmark for the auth and user endpoints.
+
+The ASGI app is driven through ``httpx.ASGITransport`` against a throwaway
+SQLite file (the same approach as ``tests/conftest.py``), so results measure
+the application and database layers without any network in between.
+
+Run from ``backend/``::
+
+    python -m benchmarks.api_bench --users 1000 --requests 500 --output bench.json
+    python -m benchmarks.api_bench --baseline bench.json --threshold 0.2
+
+Caches and other runtime options are read from the usual environment
+variables (``TOKEN_CACHE_ENABLED``, ``PRINCIPAL_CACHE_TTL_SECONDS``, ...).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import json
+import math
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import time
+from typing import Any
+
+import httpx
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.app.db.base import Base
+from src.app.db.session import get_async_session, get_session, to_async_url
+from src.app.main import app
+from src.app.models import Permission, Role
+from src.app.models.role import role_closure, role_permissions
+from src.app.services.auth import auth_service
+from src.app.services.permissions import permission_engine
+from src.app.services.throttle import InMemoryRateLimitBackend, LoginThrottle, get_login_throttle
+from src.app.services.user_import import ImportRow
+from src.app.services.users import user_service
+
+BENCH_PASSWORD = "bench-password"
+ADMIN_EMAIL = "bench-admin@example.com"
+
+RequestFactory = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass(slots=True)
+class EndpointResult:
+    """Latency, throughput and SQL cost measured for one endpoint."""
+
+    name: str
+    requests: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    statements_per_request: float
+
+
+@dataclass(slots=True)
+class Workload:
+    """Seeded data shared by the endpoint scenarios."""
+
+    emails: list[str]
+    access_tokens: list[str]
+    refresh_tokens: list[str]
+    admin_token: str
+
+
+class StatementCounter:
+    """Count SQL statements issued through the given engines."""
+
+    def __init__(self, *engines: Engine) -> None:
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_: Any) -> None:
+        self.count += 1
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of already sorted ``values``."""
+
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+@contextmanager
+def bench_engines(database_path: Path) -> Iterator[tuple[Engine, AsyncEngine]]:
+    """Create the sync and async engines over a fresh SQLite file and wire them into the app."""
+
+    url = f"sqlite:///{database_path}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(to_async_url(url))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def _override_get_session() -> Iterator[Session]:
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def _override_get_async_session() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as session:
+            yield session
+
+    # Keep the throttle on the request path but with limits the benchmark never reaches.
+    throttle = LoginThrottle(InMemoryRateLimitBackend(), per_email=10**9, per_ip=10**9, window_seconds=60.0)
+
+    app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_async_session] = _override_get_async_session
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+    try:
+        yield engine, async_engine
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        app.dependency_overrides.pop(get_async_session, None)
+        app.dependency_overrides.pop(get_login_throttle, None)
+        engine.dispose()
+
+
+def seed(engine: Engine, users: int, extra_roles: int) -> list[str]:
+    """Seed ``users`` accounts holding the default viewer role plus ``extra_roles`` roles."""
+
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        user_service.ensure_default_roles(session)
+        role_names = [f"bench-role-{index}" for index in range(extra_roles)]
+        if role_names:
+            role_ids = session.execute(
+                insert(Role).returning(Role.id), [{"name": name} for name in role_names]
+            ).scalars().all()
+            # Effective roles and permissions resolve through the closure, which needs each role's self-row.
+            session.execute(
+                insert(role_closure),
+                [{"ancestor_id": role_id, "descendant_id": role_id, "paths": 1} for role_id in role_ids],
+            )
+            permission_ids = session.query(Permission.id).limit(2).all()
+            session.execute(
+                insert(role_permissions),
+                [{"role_id": role_id, "permission_id": pid} for role_id in role_ids for (pid,) in permission_ids],
+            )
+            session.commit()
+
+        hashed = auth_service.hash_password(BENCH_PASSWORD)
+        emails = [f"bench-{index}@example.com" for index in range(users)]
+        rows = [ImportRow(line=0, email=email, password_hash=hashed, roles=("viewer", *role_names)) for email in emails]
+        rows.append(ImportRow(line=0, email=ADMIN_EMAIL, password_hash=hashed, roles=("admin",)))
+        result = user_service.bulk_create_users(session, rows, batch_size=1000)
+        if result.failed:
+            raise RuntimeError(f"seeding failed: {result.errors[:3]}")
+        permission_engine.compile(session)
+    finally:
+        session.close()
+    return emails
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> dict[str, str]:
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return response.json()
+
+
+async def prepare_workload(client: httpx.AsyncClient, emails: list[str], sessions: int) -> Workload:
+    """Log in a sample of users once so token-based scenarios have credentials."""
+
+    sample = emails[: max(1, min(sessions, len(emails)))]
+    pairs = [await _login(client, email) for email in sample]
+    admin = await _login(client, ADMIN_EMAIL)
+    return Workload(
+        emails=emails,
+        access_tokens=[pair["access_token"] for pair in pairs],
+        refresh_tokens=[pair["refresh_token"] for pair in pairs],
+        admin_token=admin["access_token"],
+    )
+
+
+def scenarios(workload: Workload) -> dict[str, RequestFactory]:
+    """Return the request factories for each benchmarked endpoint."""
+
+    def _bearer(token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    async def login(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        email = workload.emails[index % len(workload.emails)]
+        return await client.post("/api/v1/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+
+    async def refresh(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        # Follow the rotation chain so the benchmark keeps working when refresh tokens are single-use.
+        slot = index % len(workload.refresh_tokens)
+        response = await client.post("/api/v1/auth/refresh", json={"refresh_token": workload.refresh_tokens[slot]})
+        if response.status_code == 200:
+            workload.refresh_tokens[slot] = response.json()["refresh_token"]
+        return response
+
+    async def auth_me(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        token = workload.access_tokens[index % len(workload.access_tokens)]
+        return await client.get("/api/v1/auth/me", headers=_bearer(token))
+
+    async def users_me(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        token = workload.access_tokens[index % len(workload.access_tokens)]
+        return await client.get("/api/v1/users/me", headers=_bearer(token))
+
+    async def admin_pulse(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.get("/api/v1/users/admin/pulse", headers=_bearer(workload.admin_token))
+
+    return {
+        "POST /auth/login": login,
+        "POST /auth/refresh": refresh,
+        "GET /auth/me": auth_me,
+        "GET /users/me": users_me,
+        "GET /users/admin/pulse": admin_pulse,
+    }
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    name: str,
+    factory: RequestFactory,
+    requests: int,
+    concurrency: int,
+    counter: StatementCounter,
+    warmup: int = 5,
+) -> EndpointResult:
+    """Issue ``requests`` calls with ``concurrency`` in flight and summarise the latencies."""
+
+    # Sequential warm-up rotates refresh tokens before the concurrent run, so no two
+    # workers ever race on the same chain slot with the same token.
+    for index in range(warmup):
+        await factory(client, index)
+
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def _worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await factory(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    statements_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - started
+    statements = counter.count - statements_before
+
+    latencies.sort()
+    return EndpointResult(
+        name=name,
+        requests=requests,
+        errors=errors,
+        mean_ms=sum(latencies) / len(latencies) * 1000,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        throughput_rps=requests / elapsed if elapsed else 0.0,
+        statements_per_request=statements / requests,
+    )
+
+
+async def run_suite(args: argparse.Namespace) -> list[EndpointResult]:
+    """Seed a fresh database and benchmark every selected endpoint."""
+
+    with tempfile.TemporaryDirectory() as directory, bench_engines(Path(directory) / "bench.db") as engines:
+        engine, async_engine = engines
+        emails = seed(engine, args.users, args.roles)
+        counter = StatementCounter(engine, async_engine.sync_engine)
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                workload = await prepare_workload(client, emails, args.concurrency * 4)
+                results = []
+                for name, factory in scenarios(workload).items():
+                    if args.only and not any(token in name for token in args.only):
+                        continue
+                    requests = args.login_requests if "login" in name else args.requests
+                    results.append(await run_endpoint(client, name, factory, requests, args.concurrency, counter))
+        finally:
+            await async_engine.dispose()
+    return results
+
+
+def compare(results: list[EndpointResult], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return human-readable regressions of ``results`` against a previous JSON report."""
+
+    previous = {entry["name"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result.name)
+        if before is None:
+            continue
+        if result.p95_ms > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{result.name}: p95 {before['p95_ms']:.2f} -> {result.p95_ms:.2f} ms")
+        if result.throughput_rps < before["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{result.name}: throughput {before['throughput_rps']:.0f} -> {result.throughput_rps:.0f} req/s"
+            )
+        if result.statements_per_request > before["statements_per_request"] + 1e-9:
+            regressions.append(
+                f"{result.name}: SQL {before['statements_per_request']:.2f} -> "
+                f"{result.statements_per_request:.2f} statements/request"
+            )
+    return regressions
+
+
+def print_table(results: list[EndpointResult]) -> None:
+    """Print a fixed-width summary table."""
+
+    header = f"{'endpoint':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'SQL/req':>9}{'errors':>8}"
+    print(header)  # noqa: T201 - benchmark output
+    for result in results:
+        print(  # noqa: T201 - benchmark output
+            f"{result.name:<24}{result.p50_ms:>9.2f}{result.p95_ms:>9.2f}{result.p99_ms:>9.2f}"
+            f"{result.throughput_rps:>10.0f}{result.statements_per_request:>9.2f}{result.errors:>8}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the auth and user endpoints in-process.")
+    parser.add_argument("--users", type=int, default=200, help="number of seeded users")
+    parser.add_argument("--roles", type=int, default=2, help="extra roles assigned to every seeded user")
+    parser.add_argument("--requests", type=int, default=300, help="requests per read endpoint")
+    parser.add_argument("--login-requests", type=int, default=20, help="requests for the bcrypt-bound login")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests kept in flight")
+    parser.add_argument("--only", nargs="*", help="substring filter on endpoint names")
+    parser.add_argument("--output", type=Path, help="write the JSON report to this path")
+    parser.add_argument("--baseline", type=Path, help="previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_suite(args))
+    print_table(results)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {
+            key: getattr(args, key) for key in ("users", "roles", "requests", "login_requests", "concurrency")
+        },
+        "results": [asdict(result) for result in results],
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    failed = any(result.errors for result in results)
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")  # noqa: T201 - benchmark output
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""Benchmark: sweep-based conflict detection versus pairwise comparison.
+
+Generates a synthetic planning of ``--assignments`` shifts spread over
+``--technicians`` people (mostly well-rested, with a few percent double
+bookings and short turnarounds), then times
+:func:`~src.app.services.conflicts.find_conflicts` on it. The baseline
+compares every pair of shifts; it is quadratic, so it runs on a smaller
+planning (``--pairwise``) with the same shifts per technician, and checks
+that both approaches find the same double bookings.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_conflicts
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import random
+import time
+from typing import Callable
+
+from src.app.services.conflicts import DOUBLE_BOOKING, PlannedAssignment, find_conflicts
+
+EPOCH = datetime(2026, 5, 4, tzinfo=timezone.utc)
+MIN_REST = timedelta(hours=11)
+
+
+def build_planning(assignments: int, technicians: int, seed: int = 7) -> list[PlannedAssignment]:
+    """Return ``assignments`` shifts in random order, a few percent of them conflicting."""
+
+    rng = random.Random(seed)
+    planning: list[PlannedAssignment] = []
+    per_technician = -(-assignments // technicians)
+    for technician_id in range(1, technicians + 1):
+        cursor = EPOCH + timedelta(hours=rng.randrange(24))
+        for _ in range(per_technician):
+            if len(planning) == assignments:
+                break
+            length = timedelta(hours=rng.randrange(4, 11))
+            roll = rng.random()
+            if roll < 0.02:
+                start_at = cursor - timedelta(hours=2)  # overlaps the previous shift
+            elif roll < 0.05:
+                start_at = cursor + timedelta(hours=rng.randrange(1, 11))  # short turnaround
+            else:
+                start_at = cursor + MIN_REST + timedelta(hours=rng.randrange(0, 6))
+            assignment_id = len(planning) + 1
+            planning.append(PlannedAssignment(assignment_id, technician_id, assignment_id, start_at, start_at + length))
+            cursor = max(cursor, start_at + length)
+    rng.shuffle(planning)
+    return planning
+
+
+def pairwise_double_bookings(planning: list[PlannedAssignment]) -> int:
+    """Count double bookings by comparing every two shifts (the quadratic baseline)."""
+
+    found = 0
+    for index, first in enumerate(planning):
+        for second in planning[index + 1 :]:
+            if (
+                first.technician_id == second.technician_id
+                and first.start_at < second.end_at
+                and second.start_at < first.end_at
+            ):
+                found += 1
+    return found
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=100_000, help="shifts in the swept planning")
+    parser.add_argument("--technicians", type=int, default=2_000)
+    parser.add_argument("--pairwise", type=int, default=4_000, help="shifts in the pairwise baseline run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    planning = build_planning(args.assignments, args.technicians)
+    seconds, conflicts = _best_of(lambda: find_conflicts(planning, min_rest=MIN_REST), args.repeat)
+    overlaps = sum(1 for conflict in conflicts if conflict.kind == DOUBLE_BOOKING)
+    print(  # noqa: T201 - benchmark output
+        f"sweep     {len(planning):7d} assignments  {seconds * 1e3:8.1f} ms  "
+        f"{overlaps} double bookings, {len(conflicts) - overlaps} rest violations"
+    )
+
+    technicians = max(1, args.technicians * args.pairwise // args.assignments)
+    small = build_planning(args.pairwise, technicians)
+    sweep_seconds, swept = _best_of(lambda: find_conflicts(small, min_rest=MIN_REST), args.repeat)
+    pairwise_seconds, counted = _best_of(lambda: pairwise_double_bookings(small), 1)
+    assert counted == sum(1 for conflict in swept if conflict.kind == DOUBLE_BOOKING), counted
+    print(  # noqa: T201 - benchmark output
+        f"pairwise  {len(small):7d} assignments  {pairwise_seconds * 1e3:8.1f} ms  "
+        f"(sweep {sweep_seconds * 1e3:.1f} ms on the same planning)"
+    )
+
+
+if __name__ == "__main__":
+    main()
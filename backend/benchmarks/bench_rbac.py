@@ -0,0 +1,50 @@
+"""Micro-benchmark: role-name set checks versus compiled permission bitmasks.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_rbac
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from src.app.services.permissions import has_permissions, mask_of
+
+
+def _set_check(user_roles: list[str], required: set[str]) -> bool:
+    # Mirrors the original ``require_roles`` check, rebuilt per request.
+    owned = {role.lower() for role in user_roles}
+    return not required.isdisjoint(owned)
+
+
+def _permission_set_check(granted: frozenset[str], required: frozenset[str]) -> bool:
+    return required <= granted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1_000_000, help="checks per measurement")
+    parser.add_argument("--roles", type=int, default=4, help="roles held by the simulated user")
+    args = parser.parse_args()
+
+    user_roles = [f"Role{index}" for index in range(args.roles)] + ["Admin"]
+    required_roles = {"admin"}
+    granted_names = frozenset(f"perm:{index}" for index in range(32))
+    required_names = frozenset({"perm:3", "perm:17"})
+    granted_mask = mask_of(range(32))
+    required_mask = mask_of((3, 17))
+
+    cases = {
+        "role set (original)": lambda: _set_check(user_roles, required_roles),
+        "permission set": lambda: _permission_set_check(granted_names, required_names),
+        "permission bitmask": lambda: has_permissions(granted_mask, required_mask),
+    }
+    for label, func in cases.items():
+        seconds = min(timeit.repeat(func, number=args.number, repeat=5))
+        print(f"{label:<22} {seconds / args.number * 1e9:8.1f} ns/check")  # noqa: T201 - benchmark output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Micro-benchmark: FastAPI's validate-and-encode response path versus ``ModelResponse``.
+
+Replays the response half of ``POST /auth/login`` and ``GET /users/me``:
+the default path re-validates the returned model against the route's
+``response_model`` and encodes it with the stdlib ``JSONResponse``, the fast
+path renders the already-built model once through pydantic-core.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_responses
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from src.app.api.responses import ModelResponse
+from src.app.main import app
+from src.app.schemas import RoleRead, TokenPair, UserRead
+from src.app.services.auth import auth_service
+from src.app.services.principals import Principal
+
+
+def _route(path: str, method: str) -> APIRoute:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods:
+            return route
+    raise LookupError(path)
+
+
+async def _per_call(func: Callable[[], Awaitable[Any]], number: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, time.perf_counter() - started)
+    return best / number
+
+
+async def _run(number: int) -> None:
+    token_pair = auth_service.create_token_pair("bench@example.com", ["admin", "viewer"])
+    principal = Principal(
+        7,
+        "bench@example.com",
+        True,
+        ("admin", "manager", "viewer"),
+        frozenset({"auth:login"}),
+        assigned_roles=("admin", "viewer"),
+    )
+    login_field = _route("/api/v1/auth/login", "POST").response_field
+    me_field = _route("/api/v1/users/me", "GET").response_field
+
+    async def login_default() -> bytes:
+        content = await serialize_response(field=login_field, response_content=TokenPair(**token_pair))
+        return JSONResponse(content).body
+
+    async def login_fast() -> bytes:
+        return ModelResponse(TokenPair.model_construct(**token_pair)).body
+
+    async def me_default() -> bytes:
+        user = UserRead(
+            id=principal.id,
+            email=principal.email,
+            is_active=principal.is_active,
+            roles=[RoleRead(name=name) for name in principal.assigned_roles],
+            effective_roles=[RoleRead(name=name) for name in principal.roles],
+        )
+        content = await serialize_response(field=me_field, response_content=user)
+        return JSONResponse(content).body
+
+    async def me_fast() -> bytes:
+        return ModelResponse(UserRead.from_principal(principal)).body
+
+    for label, default, fast in (
+        ("POST /auth/login", login_default, login_fast),
+        ("GET /users/me", me_default, me_fast),
+    ):
+        assert (await default()).replace(b" ", b"") == (await fast()).replace(b" ", b"")
+        before = await _per_call(default, number)
+        after = await _per_call(fast, number)
+        print(  # noqa: T201 - benchmark output
+            f"{label:<18} default {before * 1e6:6.2f} us   fast {after * 1e6:6.2f} us   "
+            f"saved {(before - after) * 1e6:6.2f} us/request"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="responses rendered per measurement")
+    args = parser.parse_args()
+    asyncio.run(_run(args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Helpers for ``ETag`` / ``If-None-Match`` conditional GETs."""
+
+from __future__ import annotations
+
+from fastapi import Request, Response, status
+
+from src.app.services.principals import Principal
+
+# Responses are per user and must be revalidated on every use.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def strong_etag(*parts: object) -> str:
+    """Return a strong entity tag built from ``parts``."""
+
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def principal_etag(principal: Principal) -> str:
+    """Return the entity tag of a user representation, derived from its version counter."""
+
+    return strong_etag("user", principal.id, principal.version)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return ``True`` when ``If-None-Match`` lists ``etag`` (or ``*``)."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def conditional_headers(response: Response, etag: str) -> None:
+    """Attach the validator and cache policy to a full response."""
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty ``304 Not Modified`` response carrying ``etag``."""
+
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    conditional_headers(response, etag)
+    return response
+
+
+__all__ = [
+    "PRIVATE_REVALIDATE",
+    "conditional_headers",
+    "etag_matches",
+    "not_modified",
+    "principal_etag",
+    "strong_etag",
+]
@@ -2,58 +2,174 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
+from typing import Any
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.db.session import get_session
+from src.app.core.config import settings
+from src.app.db.session import get_async_session
 from src.app.models import User
+from src.app.services.activity import ActivityTracker, get_activity_tracker
+from src.app.services.audit import ACCESS_DENIED, AuditLog, get_audit_log
 from src.app.services.auth import AuthError, auth_service
+from src.app.services.permissions import has_permissions, permission_engine
+from src.app.services.principals import Principal, principal_cache
 from src.app.services.users import user_service
 
 _bearer_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
-    session: Session = Depends(get_session),
-) -> User:
-    """Return the authenticated user from the provided bearer token."""
-
+def _token_payload(credentials: HTTPAuthorizationCredentials | None) -> dict[str, Any]:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     token = credentials.credentials
     try:
-        payload = auth_service.decode_token(token, expected_type="access")
+        return auth_service.decode_token(token, expected_type="access")
     except AuthError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
+
+def _payload_subject(payload: dict[str, Any]) -> str:
     subject = payload.get("sub")
     if not subject:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+    return subject
+
+
+def get_access_token_payload(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
+) -> dict[str, Any]:
+    """Return the verified claims of the bearer access token."""
+
+    payload = _token_payload(credentials)
+    _payload_subject(payload)
+    return payload
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
+    session: AsyncSession = Depends(get_async_session),
+    activity: ActivityTracker = Depends(get_activity_tracker),
+) -> User:
+    """Return the authenticated user from the provided bearer token."""
 
-    user = user_service.get_by_email(session, subject)
+    subject = _payload_subject(_token_payload(credentials))
+    user = await user_service.get_by_email_async(session, subject, with_roles=True)
     if user is None or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or unknown user")
 
+    activity.touch(subject)
     return user
 
 
-def require_roles(*roles: str) -> Callable[[User], User]:
-    """Dependency factory ensuring the current user owns one of the provided roles."""
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
+    session: AsyncSession = Depends(get_async_session),
+    activity: ActivityTracker = Depends(get_activity_tracker),
+) -> Principal:
+    """Return the authenticated principal, served from the principal cache when possible."""
+
+    principal = await _load_principal(_payload_subject(_token_payload(credentials)), session)
+    activity.touch(principal.email)
+    return principal
+
+
+async def _load_principal(subject: str, session: AsyncSession) -> Principal:
+    principal = principal_cache.get(subject)
+    if principal is None:
+        generation = principal_cache.generation
+        user = await user_service.get_by_email_async(session, subject, with_access=True)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or unknown user")
+        principal = Principal.from_user(user)
+        principal_cache.put(principal, generation)
+
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or unknown user")
+
+    return principal
+
+
+async def _ensure_active(subject: str, session: AsyncSession) -> None:
+    # Tokens with an embedded mask skip the principal load, but must not outlive a deactivation.
+    principal = principal_cache.get(subject)
+    active = principal.is_active if principal is not None else await user_service.is_active_async(session, subject)
+    if not active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or unknown user")
+
+
+def _record_denied(audit_log: AuditLog, request: Request, subject: str, detail: str) -> None:
+    audit_log.record(
+        ACCESS_DENIED,
+        subject=subject,
+        client_ip=request.client.host if request.client else None,
+        path=request.url.path,
+        detail=detail,
+    )
+
+
+def require_roles(*roles: str) -> Callable[[Principal], Awaitable[Principal]]:
+    """Dependency factory ensuring the current user owns one of the provided roles, directly or by inclusion."""
 
     required = {role.lower() for role in roles}
 
-    def _dependency(current_user: User = Depends(get_current_user)) -> User:
-        user_roles = {role.name.lower() for role in current_user.roles}
-        if required and required.isdisjoint(user_roles):
+    async def _dependency(
+        request: Request,
+        current_user: Principal = Depends(get_current_principal),
+        audit_log: AuditLog = Depends(get_audit_log),
+    ) -> Principal:
+        if required and not current_user.has_any_role(required):
+            _record_denied(audit_log, request, current_user.email, f"requires role {' or '.join(sorted(required))}")
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing required role")
         return current_user
 
     return _dependency
 
 
-__all__ = ["get_current_user", "require_roles"]
+def require_permissions(*permissions: str) -> Callable[..., Awaitable[None]]:
+    """Dependency factory ensuring the current user holds every listed permission.
+
+    The check is a single AND against the compiled permission mask. When
+    ``JWT_EMBED_PERMISSIONS`` is enabled the mask is read from the access token,
+    so instead of loading the principal only the account's ``is_active`` flag
+    is checked, from the principal cache when it holds the user.
+    """
+
+    names = tuple(permissions)
+    required_by_version: dict[int, int | None] = {}
+
+    async def _dependency(
+        request: Request,
+        credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
+        session: AsyncSession = Depends(get_async_session),
+        audit_log: AuditLog = Depends(get_audit_log),
+        activity: ActivityTracker = Depends(get_activity_tracker),
+    ) -> None:
+        payload = _token_payload(credentials)
+        catalog = await permission_engine.ensure_compiled_async(session)
+        if catalog.version not in required_by_version:
+            required_by_version.clear()
+            required_by_version[catalog.version] = permission_engine.required_mask(names)
+        required = required_by_version[catalog.version]
+
+        subject = _payload_subject(payload)
+        embedded = payload.get("pm")
+        if settings.jwt_embed_permissions and isinstance(embedded, int):
+            await _ensure_active(subject, session)
+            granted = embedded
+        else:
+            granted = (await _load_principal(subject, session)).permission_mask
+
+        if required is None or not has_permissions(granted, required):
+            _record_denied(audit_log, request, subject, f"requires permission {' and '.join(names)}")
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing required permission")
+        activity.touch(subject)
+
+    return _dependency
+
+
+__all__ = ["get_current_principal", "get_current_user", "require_permissions", "require_roles"]
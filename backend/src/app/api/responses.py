@@ -0,0 +1,39 @@
+"""Fast JSON response classes.
+
+FastAPI re-validates whatever a handler returns against ``response_model``
+and then encodes it again. Handlers that already hold the exact schema
+instance return :class:`ModelResponse`, which serialises it once through
+pydantic-core and skips that round-trip; ``response_model`` stays on the
+route for the OpenAPI schema. Everything else goes through orjson via the
+application's default :class:`ORJSONResponse`.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+
+
+class ModelResponse(ORJSONResponse):
+    """JSON response rendering an already-built pydantic model without re-validating it."""
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return to_json(content)
+        return super().render(content)
+
+
+__all__ = ["ModelResponse", "ORJSONResponse"]
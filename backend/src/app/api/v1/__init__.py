@@ -4,13 +4,19 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
+from .audit import router as audit_router
 from .auth import router as auth_router
 from .health import router as health_router
+from .metrics import router as metrics_router
+from .planning import router as planning_router
 from .users import router as users_router
 
 api_router = APIRouter()
 api_router.include_router(health_router)
 api_router.include_router(auth_router)
 api_router.include_router(users_router)
+api_router.include_router(audit_router)
+api_router.include_router(planning_router)
+api_router.include_router(metrics_router)
 
 __all__ = ["api_router"]
@@ -0,0 +1,56 @@
+"""Audit trail API endpoints."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.api.deps import require_roles
+from src.app.api.responses import ModelResponse
+from src.app.db.session import get_async_session
+from src.app.schemas.audit import AuditEventPage, AuditEventRead
+from src.app.services.audit import AuditLog, decode_cursor, encode_cursor, get_audit_log
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+
+@router.get(
+    "/events",
+    response_model=AuditEventPage,
+    summary="List audit events newest first with keyset pagination",
+    dependencies=[Depends(require_roles("admin"))],
+)
+async def list_audit_events(
+    since: datetime | None = Query(default=None, description="Only return events at or after this instant"),
+    until: datetime | None = Query(default=None, description="Only return events before this instant"),
+    event_type: str | None = Query(default=None, max_length=32),
+    subject: str | None = Query(default=None, max_length=255),
+    cursor: str | None = Query(default=None, description="Continue after the page that returned this cursor"),
+    limit: int = Query(default=100, ge=1, le=500),
+    session: AsyncSession = Depends(get_async_session),
+    audit_log: AuditLog = Depends(get_audit_log),
+) -> Response:
+    """Return one page of written audit events; events still queued for the writer are not visible yet."""
+
+    try:
+        position = decode_cursor(cursor) if cursor is not None else None
+    except (ValueError, OverflowError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    events = await audit_log.list_events_async(
+        session,
+        since=since,
+        until=until,
+        event_type=event_type,
+        subject=subject,
+        cursor=position,
+        limit=limit,
+    )
+    next_cursor = encode_cursor(events[-1]) if len(events) == limit else None
+    items = [AuditEventRead.model_validate(event) for event in events]
+    return ModelResponse(AuditEventPage.model_construct(items=items, next_cursor=next_cursor))
+
+
+__all__ = ["router"]
@@ -2,66 +2,194 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any
 
-from src.app.api.deps import get_current_user
-from src.app.db.session import get_session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.api.conditional import conditional_headers, etag_matches, not_modified, principal_etag
+from src.app.api.deps import get_access_token_payload, get_current_principal
+from src.app.api.responses import ModelResponse
+from src.app.core.config import settings
+from src.app.db.session import get_async_session
 from src.app.models import User
-from src.app.schemas.auth import LoginRequest, RefreshRequest, TokenPair
+from src.app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, TokenPair
 from src.app.schemas.user import UserRead
+from src.app.services.activity import ActivityTracker, get_activity_tracker
+from src.app.services.audit import (
+    LOGIN,
+    LOGIN_FAILED,
+    LOGOUT,
+    REFRESH,
+    REFRESH_FAILED,
+    AuditLog,
+    get_audit_log,
+)
 from src.app.services.auth import AuthError, auth_service
+from src.app.services.permissions import mask_of
+from src.app.services.principals import Principal
+from src.app.services.revocation import revocation_service
+from src.app.services.throttle import LoginThrottle, LoginThrottled, get_login_throttle
 from src.app.services.users import user_service
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _embedded_permission_mask(user: User) -> int | None:
+    if not settings.jwt_embed_permissions:
+        return None
+    return mask_of(permission.id for permission in user.effective_permissions)
+
+
+def _client_ip(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+
 @router.post("/login", response_model=TokenPair, summary="Authenticate a user with email and password")
-def login(payload: LoginRequest, session: Session = Depends(get_session)) -> TokenPair:
-    """Authenticate a user and return a token pair."""
+async def login(
+    payload: LoginRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    throttle: LoginThrottle = Depends(get_login_throttle),
+    audit_log: AuditLog = Depends(get_audit_log),
+    activity: ActivityTracker = Depends(get_activity_tracker),
+) -> Response:
+    """Authenticate a user and return a token pair; attempts are throttled before any hashing."""
+
+    client_ip = _client_ip(request)
+
+    def _failed(reason: str) -> None:
+        audit_log.record(
+            LOGIN_FAILED, subject=payload.email, client_ip=client_ip, path=request.url.path, detail=reason
+        )
 
-    user = user_service.get_by_email(session, payload.email)
+    try:
+        await throttle.check(payload.email, client_ip)
+    except LoginThrottled:
+        _failed("throttled")
+        raise
+
+    user = await user_service.get_by_email_async(
+        session,
+        payload.email,
+        with_access=True,
+    )
     if user is None:
+        _failed("unknown_user")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    roles = user_service.list_role_names(user)
+    roles = user_service.effective_role_names(user)
     if not roles:
+        _failed("no_roles")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User has no roles")
 
-    if not auth_service.verify_password(payload.password, user.hashed_password):
+    if settings.password_rehash_on_login:
+        verified, new_hash = await auth_service.verify_and_update_password_async(payload.password, user.hashed_password)
+    else:
+        verified = await auth_service.verify_password_async(payload.password, user.hashed_password)
+        new_hash = None
+    if not verified:
+        _failed("invalid_password")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash is not None:
+        # The stored bcrypt cost differs from PASSWORD_HASH_ROUNDS: roll it forward.
+        await user_service.upgrade_password_hash_async(session, user, new_hash)
 
-    token_pair = auth_service.create_token_pair(user.email, roles)
-    return TokenPair(**token_pair)
+    await throttle.record_success(payload.email)
+    audit_log.record(LOGIN, subject=user.email, client_ip=client_ip, path=request.url.path)
+    activity.touch(user.email, login=True)
+    token_pair = auth_service.create_token_pair(user.email, roles, _embedded_permission_mask(user))
+    return ModelResponse(TokenPair.model_construct(**token_pair))
 
 
 @router.post("/refresh", response_model=TokenPair, summary="Refresh an access token")
-def refresh(payload: RefreshRequest, session: Session = Depends(get_session)) -> TokenPair:
-    """Refresh the access token using a refresh token."""
+async def refresh(
+    payload: RefreshRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    audit_log: AuditLog = Depends(get_audit_log),
+    activity: ActivityTracker = Depends(get_activity_tracker),
+) -> Response:
+    """Exchange a refresh token for a new pair; each refresh token can be used once."""
+
+    def _failed(subject: str | None, reason: str) -> None:
+        audit_log.record(
+            REFRESH_FAILED, subject=subject, client_ip=_client_ip(request), path=request.url.path, detail=reason
+        )
 
     try:
         token_payload = auth_service.decode_token(payload.refresh_token, expected_type="refresh")
     except AuthError as exc:
+        _failed(None, "invalid_token")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
 
     subject = token_payload.get("sub")
     if subject is None:
+        _failed(None, "invalid_token")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-    user = user_service.get_by_email(session, subject)
+    user = await user_service.get_by_email_async(
+        session,
+        subject,
+        with_access=True,
+    )
     if user is None or not user.is_active:
+        _failed(subject, "inactive_user")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or unknown user")
 
-    roles = user_service.list_role_names(user)
-    token_pair = auth_service.create_token_pair(user.email, roles)
-    return TokenPair(**token_pair)
+    if not await revocation_service.rotate_async(session, token_payload):
+        _failed(subject, "reused_token")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token already used")
+
+    audit_log.record(REFRESH, subject=subject, client_ip=_client_ip(request), path=request.url.path)
+    activity.touch(subject)
+    roles = user_service.effective_role_names(user)
+    token_pair = auth_service.create_token_pair(user.email, roles, _embedded_permission_mask(user))
+    return ModelResponse(TokenPair.model_construct(**token_pair))
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    summary="Revoke the current access token and, optionally, a refresh token",
+)
+async def logout(
+    request: Request,
+    payload: LogoutRequest | None = None,
+    access_payload: dict[str, Any] = Depends(get_access_token_payload),
+    session: AsyncSession = Depends(get_async_session),
+    audit_log: AuditLog = Depends(get_audit_log),
+) -> Response:
+    """Revoke the bearer access token and the refresh token of the same subject."""
+
+    if payload is not None and payload.refresh_token:
+        try:
+            refresh_payload = auth_service.decode_token(payload.refresh_token, expected_type="refresh")
+        except AuthError as exc:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
+        if refresh_payload.get("sub") != access_payload["sub"]:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+        await revocation_service.revoke_async(session, refresh_payload, reason="logout")
+
+    await revocation_service.revoke_async(session, access_payload, reason="logout")
+    audit_log.record(LOGOUT, subject=access_payload["sub"], client_ip=_client_ip(request), path=request.url.path)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/me", response_model=UserRead, summary="Return the current authenticated user")
-def read_profile(current_user: User = Depends(get_current_user)) -> UserRead:
-    """Return details for the currently authenticated user."""
-
-    return UserRead.model_validate(current_user)
+async def read_profile(
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
+) -> Response:
+    """Return details for the currently authenticated user; answers ``If-None-Match`` with 304 when the user is unchanged."""
+
+    etag = principal_etag(current_user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = ModelResponse(UserRead.from_principal(current_user))
+    conditional_headers(response, etag)
+    return response
 
 
 __all__ = ["router"]
@@ -0,0 +1,26 @@
+"""Prometheus metrics endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.app.api.deps import require_roles
+from src.app.core.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Expose request and database metrics in Prometheus text format",
+    dependencies=[Depends(require_roles("admin"))],
+)
+async def read_metrics() -> PlainTextResponse:
+    """Render the process-wide metrics registry."""
+
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
+
+
+__all__ = ["router"]
@@ -0,0 +1,42 @@
+"""Planning API endpoints."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.api.deps import require_permissions
+from src.app.api.responses import ModelResponse
+from src.app.core.config import settings
+from src.app.db.session import get_async_session
+from src.app.schemas.planning import PlanningCheckRead
+from src.app.services.conflicts import check_planning_async, week_bounds
+
+router = APIRouter(prefix="/planning", tags=["planning"])
+
+
+@router.get(
+    "/week/conflicts",
+    response_model=PlanningCheckRead,
+    summary="Check a week's planning for double bookings and rest-period violations",
+    dependencies=[Depends(require_permissions("missions:view"))],
+)
+async def check_week(
+    day: date | None = Query(default=None, description="Any day of the week to check (default: this week)"),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Return every conflict touching the Monday-to-Monday UTC week containing ``day``."""
+
+    start_at, end_at = week_bounds(day or datetime.now(tz=timezone.utc).date())
+    check = await check_planning_async(
+        session,
+        start_at,
+        end_at,
+        min_rest=timedelta(hours=settings.planning_min_rest_hours),
+    )
+    return ModelResponse(PlanningCheckRead.model_validate(check))
+
+
+__all__ = ["router"]
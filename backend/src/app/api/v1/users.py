@@ -2,20 +2,91 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from collections.abc import AsyncIterator
 
-from src.app.api.deps import get_current_user, require_roles
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.api.conditional import conditional_headers, etag_matches, not_modified, principal_etag
+from src.app.api.deps import get_current_principal, require_permissions, require_roles
+from src.app.api.responses import ModelResponse
+from src.app.core.config import settings
+from src.app.db.session import get_async_session, get_async_session_factory
 from src.app.models import User
-from src.app.schemas.user import UserRead
+from src.app.schemas.user import UserImportError, UserImportReport, UserPage, UserRead
+from src.app.services.principals import Principal
+from src.app.services.user_import import aiter_rows, row_parser
+from src.app.services.users import user_service
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+_STREAM_PAGE_SIZE = 1000
+
+
+def _ndjson_line(user: User) -> bytes:
+    # Same shape as ``UserRead`` without building a pydantic model per row.
+    record = {
+        "id": user.id,
+        "email": user.email,
+        "is_active": user.is_active,
+        "roles": [{"name": name} for name in sorted(role.name for role in user.roles)],
+        "effective_roles": [{"name": name} for name in sorted(role.name for role in user.effective_roles)],
+    }
+    return orjson.dumps(record) + b"\n"
+
+
+async def _stream_users(
+    session_factory: async_sessionmaker[AsyncSession], after_id: int | None, role: str | None
+) -> AsyncIterator[bytes]:
+    async with session_factory() as session:
+        async for page in user_service.iter_users_async(
+            session, after_id=after_id, role=role, page_size=_STREAM_PAGE_SIZE
+        ):
+            yield b"".join(_ndjson_line(user) for user in page)
+
+
+@router.get(
+    "",
+    response_model=UserPage,
+    summary="List users with keyset pagination, or stream them all as NDJSON",
+    dependencies=[Depends(require_permissions("users:manage"))],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def list_users(
+    request: Request,
+    after: int | None = Query(default=None, ge=0, description="Return users with an id above this cursor"),
+    limit: int = Query(default=100, ge=1, le=500),
+    role: str | None = Query(default=None, description="Only return users holding this role"),
+    session: AsyncSession = Depends(get_async_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_async_session_factory),
+) -> Response:
+    """Return one page of users ordered by id; ``Accept: application/x-ndjson`` streams every match."""
+
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(_stream_users(session_factory, after, role), media_type=NDJSON_MEDIA_TYPE)
+
+    users = await user_service.list_users_async(session, after_id=after, limit=limit, role=role)
+    next_cursor = users[-1].id if len(users) == limit else None
+    items = [UserRead.from_user(user) for user in users]
+    return ModelResponse(UserPage.model_construct(items=items, next_cursor=next_cursor))
+
 
 @router.get("/me", response_model=UserRead, summary="Return the currently authenticated user")
-def read_current_user(current_user: User = Depends(get_current_user)) -> UserRead:
-    """Return details of the logged-in user."""
+async def read_current_user(
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
+) -> Response:
+    """Return details of the logged-in user; answers ``If-None-Match`` with 304 when the user is unchanged."""
 
-    return UserRead.model_validate(current_user)
+    etag = principal_etag(current_user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = ModelResponse(UserRead.from_principal(current_user))
+    conditional_headers(response, etag)
+    return response
 
 
 @router.get(
@@ -24,10 +95,40 @@ def read_current_user(current_user: User = Depends(get_current_user)) -> UserRea
     summary="Admin-only heartbeat endpoint",
     dependencies=[Depends(require_roles("admin"))],
 )
-def admin_pulse() -> dict[str, str]:
+async def admin_pulse() -> dict[str, str]:
     """Demonstrate RBAC by requiring the admin role."""
 
     return {"status": "admin-ok"}
 
 
+@router.post(
+    "/import",
+    response_model=UserImportReport,
+    summary="Bulk import users from a streamed CSV or NDJSON body",
+    dependencies=[Depends(require_permissions("users:manage"))],
+)
+async def import_users(
+    request: Request,
+    batch_size: int | None = Query(default=None, ge=1, le=5000),
+    session: AsyncSession = Depends(get_async_session),
+) -> UserImportReport:
+    """Create users from ``text/csv`` or ``application/x-ndjson`` rows, reporting per-row errors."""
+
+    try:
+        parser = row_parser(request.headers.get("content-type", ""))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)) from exc
+
+    result = await user_service.bulk_create_users_async(
+        session,
+        aiter_rows(request.stream(), parser),
+        batch_size=batch_size or settings.user_import_batch_size,
+    )
+    return UserImportReport(
+        created=result.created,
+        failed=result.failed,
+        errors=[UserImportError(line=error.line, email=error.email, message=error.message) for error in result.errors],
+    )
+
+
 __all__ = ["router"]
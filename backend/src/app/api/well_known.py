@@ -0,0 +1,32 @@
+"""Unversioned discovery endpoints served under ``/.well-known``."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from src.app.api.conditional import etag_matches
+from src.app.core.config import settings
+from src.app.services.keys import key_registry
+
+router = APIRouter(prefix="/.well-known", tags=["auth"])
+
+
+@router.get("/jwks.json", summary="Publish the public keys that verify access and refresh tokens")
+async def read_jwks(request: Request) -> Response:
+    """Return the JSON Web Key Set with long-lived cache headers and a strong ETag."""
+
+    if key_registry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tokens are not signed with public keys")
+
+    body, etag = key_registry.jwks()
+    max_age = settings.jwks_max_age_seconds
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={max_age}",
+        "ETag": etag,
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/jwk-set+json", headers=headers)
+
+
+__all__ = ["router"]
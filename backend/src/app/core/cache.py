@@ -0,0 +1,116 @@
+"""In-process caching primitives shared by the service layer."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+import time
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Point-in-time counters exposed by :class:`TTLCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of hits over lookups (``0.0`` when unused)."""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Size-bounded LRU mapping whose entries carry an absolute expiry.
+
+    All operations take a single lock so the cache can be shared by the
+    threadpool workers FastAPI uses for synchronous dependencies.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.monotonic) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def now(self) -> float:
+        """Return the current time on the cache clock."""
+
+        return self._clock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key`` or ``None`` when absent or expired."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        """Store ``value`` until ``expires_at`` (cache clock), evicting the LRU entry if full."""
+
+        with self._lock:
+            if expires_at <= self._clock():
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """Remove ``key`` and return its value when present."""
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Drop every entry while keeping the counters."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_size=self._max_size,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+__all__ = ["CacheStats", "TTLCache"]
@@ -6,6 +6,13 @@ from dataclasses import dataclass
 import os
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(slots=True)
 class Settings:
     """Runtime configuration resolved from environment variables."""
@@ -13,10 +20,58 @@ class Settings:
     app_name: str = "Codex API"
     app_version: str = "0.1.0"
     database_url: str = "sqlite:///./codex.db"
+    async_database_url: str = ""
+    database_replica_urls: tuple[str, ...] = ()
+    db_replica_eject_seconds: float = 30.0
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = -1
+    db_pool_pre_ping: bool = False
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 0
     jwt_secret: str = "change_me"
     jwt_algorithm: str = "HS256"
+    jwt_keys_dir: str = ""
+    jwt_active_kid: str = ""
+    jwt_keys_reload_seconds: float = 30.0
+    jwks_max_age_seconds: int = 3600
     access_token_expire_minutes: int = 15
     refresh_token_expire_minutes: int = 60
+    revocation_sync_interval_seconds: float = 5.0
+    jwt_embed_permissions: bool = False
+    jwt_token_profile: str = "standard"
+    token_cache_enabled: bool = False
+    token_cache_size: int = 4096
+    principal_cache_ttl_seconds: float = 0.0
+    principal_cache_size: int = 4096
+    # Opt-in: N > 0 hashes on N spawned processes per app worker; 0 hashes in threads.
+    password_hash_workers: int = 0
+    password_hash_queue_limit: int = 32
+    password_hash_retry_after_seconds: int = 1
+    password_hash_rounds: int = 12
+    password_rehash_on_login: bool = True
+    user_import_batch_size: int = 500
+    metrics_enabled: bool = True
+    startup_db_init: bool = True
+    startup_lock_path: str = ""
+    startup_lock_timeout_seconds: float = 120.0
+    login_throttle_enabled: bool = True
+    login_rate_per_email: int = 5
+    login_rate_per_ip: int = 30
+    login_rate_window_seconds: float = 60.0
+    login_throttle_max_keys: int = 100_000
+    audit_enabled: bool = True
+    audit_queue_size: int = 10_000
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 1.0
+    audit_spill_path: str = ""
+    activity_tracking_enabled: bool = True
+    activity_flush_interval_seconds: float = 5.0
+    activity_max_pending: int = 50_000
+    planning_min_rest_hours: float = 11.0
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -24,18 +79,116 @@ class Settings:
 
         defaults = cls()
         database_url = os.getenv("DATABASE_URL") or defaults.database_url
+        async_database_url = os.getenv("ASYNC_DATABASE_URL") or defaults.async_database_url
+        replica_urls = tuple(url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip())
+        replica_eject = float(os.getenv("DB_REPLICA_EJECT_SECONDS", defaults.db_replica_eject_seconds))
+        pool_size = int(os.getenv("DB_POOL_SIZE", defaults.db_pool_size))
+        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", defaults.db_max_overflow))
+        pool_timeout = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", defaults.db_pool_timeout_seconds))
+        pool_recycle = int(os.getenv("DB_POOL_RECYCLE_SECONDS", defaults.db_pool_recycle_seconds))
+        pool_pre_ping = _env_bool("DB_POOL_PRE_PING", defaults.db_pool_pre_ping)
+        journal_mode = os.getenv("SQLITE_JOURNAL_MODE", defaults.sqlite_journal_mode)
+        synchronous = os.getenv("SQLITE_SYNCHRONOUS", defaults.sqlite_synchronous)
+        busy_timeout = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", defaults.sqlite_busy_timeout_ms))
+        mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", defaults.sqlite_mmap_size))
         jwt_secret = os.getenv("JWT_SECRET") or defaults.jwt_secret
         jwt_algorithm = os.getenv("JWT_ALGORITHM") or defaults.jwt_algorithm
+        jwt_keys_dir = os.getenv("JWT_KEYS_DIR") or defaults.jwt_keys_dir
+        jwt_active_kid = os.getenv("JWT_ACTIVE_KID") or defaults.jwt_active_kid
+        jwt_keys_reload = float(os.getenv("JWT_KEYS_RELOAD_SECONDS", defaults.jwt_keys_reload_seconds))
+        jwks_max_age = int(os.getenv("JWKS_MAX_AGE_SECONDS", defaults.jwks_max_age_seconds))
         access_expire = int(os.getenv("JWT_ACCESS_EXPIRE_MINUTES", defaults.access_token_expire_minutes))
         refresh_expire = int(os.getenv("JWT_REFRESH_EXPIRE_MINUTES", defaults.refresh_token_expire_minutes))
+        revocation_sync = float(
+            os.getenv("REVOCATION_SYNC_INTERVAL_SECONDS", defaults.revocation_sync_interval_seconds)
+        )
+        embed_permissions = _env_bool("JWT_EMBED_PERMISSIONS", defaults.jwt_embed_permissions)
+        token_profile = os.getenv("JWT_TOKEN_PROFILE", defaults.jwt_token_profile).strip().lower()
+        if token_profile not in {"standard", "compact"}:
+            raise ValueError(f"Unsupported JWT_TOKEN_PROFILE: {token_profile!r}")
+        token_cache_enabled = _env_bool("TOKEN_CACHE_ENABLED", defaults.token_cache_enabled)
+        token_cache_size = int(os.getenv("TOKEN_CACHE_SIZE", defaults.token_cache_size))
+        principal_cache_ttl = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", defaults.principal_cache_ttl_seconds))
+        principal_cache_size = int(os.getenv("PRINCIPAL_CACHE_SIZE", defaults.principal_cache_size))
+        hash_workers = int(os.getenv("PASSWORD_HASH_WORKERS", defaults.password_hash_workers))
+        hash_queue_limit = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", defaults.password_hash_queue_limit))
+        hash_retry_after = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", defaults.password_hash_retry_after_seconds))
+        hash_rounds = int(os.getenv("PASSWORD_HASH_ROUNDS", defaults.password_hash_rounds))
+        rehash_on_login = _env_bool("PASSWORD_REHASH_ON_LOGIN", defaults.password_rehash_on_login)
+        import_batch_size = int(os.getenv("USER_IMPORT_BATCH_SIZE", defaults.user_import_batch_size))
+        metrics_enabled = _env_bool("METRICS_ENABLED", defaults.metrics_enabled)
+        startup_db_init = _env_bool("STARTUP_DB_INIT", defaults.startup_db_init)
+        startup_lock_path = os.getenv("STARTUP_LOCK_PATH") or defaults.startup_lock_path
+        startup_lock_timeout = float(os.getenv("STARTUP_LOCK_TIMEOUT_SECONDS", defaults.startup_lock_timeout_seconds))
+        throttle_enabled = _env_bool("LOGIN_THROTTLE_ENABLED", defaults.login_throttle_enabled)
+        rate_per_email = int(os.getenv("LOGIN_RATE_PER_EMAIL", defaults.login_rate_per_email))
+        rate_per_ip = int(os.getenv("LOGIN_RATE_PER_IP", defaults.login_rate_per_ip))
+        rate_window = float(os.getenv("LOGIN_RATE_WINDOW_SECONDS", defaults.login_rate_window_seconds))
+        throttle_max_keys = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", defaults.login_throttle_max_keys))
+        audit_enabled = _env_bool("AUDIT_ENABLED", defaults.audit_enabled)
+        audit_queue_size = int(os.getenv("AUDIT_QUEUE_SIZE", defaults.audit_queue_size))
+        audit_batch_size = int(os.getenv("AUDIT_BATCH_SIZE", defaults.audit_batch_size))
+        audit_flush_interval = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", defaults.audit_flush_interval_seconds))
+        audit_spill_path = os.getenv("AUDIT_SPILL_PATH") or defaults.audit_spill_path
+        activity_enabled = _env_bool("ACTIVITY_TRACKING_ENABLED", defaults.activity_tracking_enabled)
+        activity_interval = float(os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", defaults.activity_flush_interval_seconds))
+        activity_max_pending = int(os.getenv("ACTIVITY_MAX_PENDING", defaults.activity_max_pending))
+        min_rest_hours = float(os.getenv("PLANNING_MIN_REST_HOURS", defaults.planning_min_rest_hours))
         return cls(
             app_name=os.getenv("APP_NAME", defaults.app_name),
             app_version=os.getenv("APP_VERSION", defaults.app_version),
             database_url=database_url,
+            async_database_url=async_database_url,
+            database_replica_urls=replica_urls or defaults.database_replica_urls,
+            db_replica_eject_seconds=replica_eject,
+            db_pool_size=pool_size,
+            db_max_overflow=max_overflow,
+            db_pool_timeout_seconds=pool_timeout,
+            db_pool_recycle_seconds=pool_recycle,
+            db_pool_pre_ping=pool_pre_ping,
+            sqlite_journal_mode=journal_mode,
+            sqlite_synchronous=synchronous,
+            sqlite_busy_timeout_ms=busy_timeout,
+            sqlite_mmap_size=mmap_size,
             jwt_secret=jwt_secret,
             jwt_algorithm=jwt_algorithm,
+            jwt_keys_dir=jwt_keys_dir,
+            jwt_active_kid=jwt_active_kid,
+            jwt_keys_reload_seconds=jwt_keys_reload,
+            jwks_max_age_seconds=jwks_max_age,
             access_token_expire_minutes=access_expire,
             refresh_token_expire_minutes=refresh_expire,
+            revocation_sync_interval_seconds=revocation_sync,
+            jwt_embed_permissions=embed_permissions,
+            jwt_token_profile=token_profile,
+            token_cache_enabled=token_cache_enabled,
+            token_cache_size=token_cache_size,
+            principal_cache_ttl_seconds=principal_cache_ttl,
+            principal_cache_size=principal_cache_size,
+            password_hash_workers=hash_workers,
+            password_hash_queue_limit=hash_queue_limit,
+            password_hash_retry_after_seconds=hash_retry_after,
+            password_hash_rounds=hash_rounds,
+            password_rehash_on_login=rehash_on_login,
+            user_import_batch_size=import_batch_size,
+            metrics_enabled=metrics_enabled,
+            startup_db_init=startup_db_init,
+            startup_lock_path=startup_lock_path,
+            startup_lock_timeout_seconds=startup_lock_timeout,
+            login_throttle_enabled=throttle_enabled,
+            login_rate_per_email=rate_per_email,
+            login_rate_per_ip=rate_per_ip,
+            login_rate_window_seconds=rate_window,
+            login_throttle_max_keys=throttle_max_keys,
+            audit_enabled=audit_enabled,
+            audit_queue_size=audit_queue_size,
+            audit_batch_size=audit_batch_size,
+            audit_flush_interval_seconds=audit_flush_interval,
+            audit_spill_path=audit_spill_path,
+            activity_tracking_enabled=activity_enabled,
+            activity_flush_interval_seconds=activity_interval,
+            activity_max_pending=activity_max_pending,
+            planning_min_rest_hours=min_rest_hours,
         )
 
 
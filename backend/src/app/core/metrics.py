@@ -0,0 +1,274 @@
+"""Dependency-free request and database metrics rendered in Prometheus text format.
+
+:class:`MetricsMiddleware` records per-route counters keyed by the templated
+path (``/api/v1/users/{user_id}``), never the raw URL, so label cardinality is
+bounded by the route table. :func:`instrument_engine` adds SQLAlchemy cursor
+hooks that attribute statement counts and database time to the request being
+served through a context variable.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_QUERY_STARTED = "_metrics_query_started"
+
+
+@dataclass(slots=True)
+class RequestDbUsage:
+    """Statements and database seconds accumulated while serving one request."""
+
+    statements: int = 0
+    seconds: float = 0.0
+
+
+Collector = Callable[[], Iterable[str]]
+
+_request_db_usage: ContextVar[RequestDbUsage | None] = ContextVar("request_db_usage", default=None)
+
+
+@dataclass(slots=True)
+class _RouteSeries:
+    bucket_counts: list[int]
+    duration_sum: float = 0.0
+    count: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+    db_statements: int = 0
+    db_seconds: float = 0.0
+
+    def copy(self) -> _RouteSeries:
+        return _RouteSeries(
+            list(self.bucket_counts),
+            self.duration_sum,
+            self.count,
+            dict(self.statuses),
+            self.db_statements,
+            self.db_seconds,
+        )
+
+
+class MetricsRegistry:
+    """Thread-safe store for HTTP and database series."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self._routes: dict[tuple[str, str], _RouteSeries] = {}
+        self._in_flight = 0
+        self._db_statements = 0
+        self._db_seconds = 0.0
+        self._collectors: list[Collector] = []
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable returning extra exposition lines, evaluated on each render."""
+
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def request_started(self) -> None:
+        """Increment the in-flight gauge."""
+
+        with self._lock:
+            self._in_flight += 1
+
+    def observe_request(
+        self, method: str, route: str, status_code: int, seconds: float, db_usage: RequestDbUsage
+    ) -> None:
+        """Record a finished request and decrement the in-flight gauge."""
+
+        bucket = bisect_left(self._buckets, seconds)
+        key = (method, route)
+        with self._lock:
+            self._in_flight -= 1
+            series = self._routes.get(key)
+            if series is None:
+                series = self._routes[key] = _RouteSeries(bucket_counts=[0] * (len(self._buckets) + 1))
+            series.bucket_counts[bucket] += 1
+            series.duration_sum += seconds
+            series.count += 1
+            series.statuses[status_code] = series.statuses.get(status_code, 0) + 1
+            series.db_statements += db_usage.statements
+            series.db_seconds += db_usage.seconds
+
+    def observe_query(self, seconds: float) -> None:
+        """Record one SQL statement, whether or not a request is being served."""
+
+        with self._lock:
+            self._db_statements += 1
+            self._db_seconds += seconds
+
+    def reset(self) -> None:
+        """Drop every recorded series except the in-flight gauge."""
+
+        with self._lock:
+            self._routes.clear()
+            self._db_statements = 0
+            self._db_seconds = 0.0
+
+    def render(self) -> str:
+        """Return all series in the Prometheus text exposition format."""
+
+        with self._lock:
+            routes = sorted((key, series.copy()) for key, series in self._routes.items())
+            in_flight = self._in_flight
+            db_statements = self._db_statements
+            db_seconds = self._db_seconds
+
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP http_requests_total Finished requests by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), series in routes:
+            labels = _labels(method=method, route=route)
+            for status_code, count in sorted(series.statuses.items()):
+                lines.append(f'http_requests_total{{{labels},status="{status_code}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), series in routes:
+            labels = _labels(method=method, route=route)
+            cumulative = 0
+            for bound, count in zip(self._buckets, series.bucket_counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {series.duration_sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {series.count}")
+
+        lines += [
+            "# HELP http_request_db_statements_total SQL statements issued while serving a route.",
+            "# TYPE http_request_db_statements_total counter",
+        ]
+        lines += [
+            f"http_request_db_statements_total{{{_labels(method=method, route=route)}}} {series.db_statements}"
+            for (method, route), series in routes
+        ]
+        lines += [
+            "# HELP http_request_db_seconds_total Time spent in SQL statements while serving a route.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        lines += [
+            f"http_request_db_seconds_total{{{_labels(method=method, route=route)}}} {series.db_seconds}"
+            for (method, route), series in routes
+        ]
+        lines += [
+            "# HELP db_statements_total SQL statements issued by the process.",
+            "# TYPE db_statements_total counter",
+            f"db_statements_total {db_statements}",
+            "# HELP db_seconds_total Time spent in SQL statements by the process.",
+            "# TYPE db_seconds_total counter",
+            f"db_seconds_total {db_seconds}",
+        ]
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def format_family(name: str, help_text: str, kind: str, samples: Iterable[tuple[dict[str, str], float]]) -> list[str]:
+    """Render one metric family with its ``HELP`` and ``TYPE`` headers."""
+
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{{{_labels(**labels)}}} {value}" if labels else f"{name} {value}")
+    return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding :class:`MetricsRegistry` for every HTTP request."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry | None = None) -> None:
+        self.app = app
+        self.registry = registry or metrics_registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        usage = RequestDbUsage()
+        token = _request_db_usage.set(usage)
+
+        async def _send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db_usage.reset(token)
+            # The router stores the matched route in the scope; its path is the template.
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.observe_request(scope["method"], path, status_code, elapsed, usage)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *_: Any) -> None:
+    if context is not None:
+        setattr(context, _QUERY_STARTED, time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *_: Any) -> None:
+    started = getattr(context, _QUERY_STARTED, None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    metrics_registry.observe_query(elapsed)
+    usage = _request_db_usage.get()
+    if usage is not None:
+        usage.statements += 1
+        usage.seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the statement hooks to ``engine`` (pass ``async_engine.sync_engine`` for async engines)."""
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+metrics_registry = MetricsRegistry()
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Collector",
+    "DEFAULT_BUCKETS",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "RequestDbUsage",
+    "format_family",
+    "instrument_engine",
+    "metrics_registry",
+]
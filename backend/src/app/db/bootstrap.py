@@ -0,0 +1,205 @@
+"""Run schema and catalog initialisation once per deploy across workers.
+
+Every worker first compares the fingerprint stored in ``app_meta`` with the
+one it was built with; when they match the database is ready and boot costs a
+single SELECT. Otherwise the worker takes the startup lock (a PostgreSQL
+advisory lock, or an exclusive file lock for other backends), re-checks the
+fingerprint and only then initialises. Workers that lose the race block on
+the lock and find the fingerprint already written when they get it.
+
+``create_all`` only creates missing tables, so :func:`upgrade_schema` brings
+tables created by an older build up to date by adding the mapped columns and
+indexes they lack.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import hashlib
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.schema import CreateColumn
+
+from src.app.db.base import Base
+from src.app.models import AppMeta
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+READY_KEY = "startup_fingerprint"
+_ADVISORY_LOCK_ID = 0x436F646578  # "Codex"
+_LOCK_POLL_SECONDS = 0.05
+
+
+class StartupLockTimeout(RuntimeError):
+    """Raised when the startup lock could not be acquired in time."""
+
+
+def schema_fingerprint(*parts: str) -> str:
+    """Return a digest of the mapped schema and the given extra ``parts`` (version, catalog...)."""
+
+    tables = sorted(
+        f"{table.name}({','.join(column.name for column in table.columns)})"
+        for table in Base.metadata.sorted_tables
+    )
+    return hashlib.sha256("|".join([*tables, *parts]).encode("utf-8")).hexdigest()
+
+
+def upgrade_schema(engine: Engine) -> list[str]:
+    """Add mapped columns and indexes missing from existing tables; return their names.
+
+    Safe to run repeatedly: only what the database lacks is created. A new
+    column must be nullable or have a server default so existing rows get a
+    value.
+    """
+
+    added: list[str] = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        existing = set(inspector.get_table_names())
+        preparer = connection.dialect.identifier_preparer
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    raise RuntimeError(f"Cannot add {table.name}.{column.name}: NOT NULL without a server default")
+                definition = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {definition}"))
+                added.append(f"{table.name}.{column.name}")
+            indexed = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexed:
+                    index.create(connection)
+                    added.append(str(index.name))
+    if added:
+        logger.info("Upgraded schema: added %s", ", ".join(added))
+    return added
+
+
+def default_lock_path(app_name: str) -> Path:
+    """Return the per-host lock file used when none is configured."""
+
+    slug = "".join(char if char.isalnum() else "-" for char in app_name.lower())
+    return Path(tempfile.gettempdir()) / f"{slug}-startup.lock"
+
+
+class StartupCoordinator:
+    """Serialise one-time database initialisation between the workers of a deploy."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        fingerprint: str,
+        lock_path: Path,
+        timeout_seconds: float = 120.0,
+    ) -> None:
+        self._engine = engine
+        self._session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        self._fingerprint = fingerprint
+        self._lock_path = lock_path
+        self._timeout = timeout_seconds
+
+    def is_ready(self) -> bool:
+        """Return whether the stored fingerprint matches this build (``False`` before the first deploy)."""
+
+        with self._session_factory() as session:
+            try:
+                stored = session.execute(select(AppMeta.value).where(AppMeta.key == READY_KEY)).scalar()
+            except SQLAlchemyError:
+                return False
+        return stored == self._fingerprint
+
+    def run(self, initialise: Callable[[Session], None]) -> bool:
+        """Run ``initialise`` unless another worker already did; return ``True`` when this one ran it."""
+
+        if self.is_ready():
+            return False
+        started = time.perf_counter()
+        with self._lock():
+            waited = time.perf_counter() - started
+            if self.is_ready():
+                logger.info("Startup initialisation done by another worker (waited %.1f ms)", waited * 1000)
+                return False
+            with self._session_factory() as session:
+                initialise(session)
+                session.merge(AppMeta(key=READY_KEY, value=self._fingerprint))
+                session.commit()
+        logger.info("Startup initialisation completed in %.1f ms", (time.perf_counter() - started) * 1000)
+        return True
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if self._engine.dialect.name == "postgresql":
+            with self._advisory_lock():
+                yield
+        else:
+            with self._file_lock():
+                yield
+
+    @contextmanager
+    def _advisory_lock(self) -> Iterator[None]:
+        with self._engine.connect() as connection:
+            # SET LOCAL ends with this transaction, so the pooled connection goes back without the timeout.
+            connection.execute(text(f"SET LOCAL lock_timeout = '{int(self._timeout * 1000)}ms'"))
+            try:
+                connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            except SQLAlchemyError as exc:
+                raise StartupLockTimeout("Timed out waiting for the startup advisory lock") from exc
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+                connection.commit()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover - Windows
+            logger.warning("File locks unavailable; startup initialisation is not serialised")
+            yield
+            return
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            deadline = time.monotonic() + self._timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise StartupLockTimeout(f"Timed out waiting for {self._lock_path}") from None
+                    time.sleep(_LOCK_POLL_SECONDS)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+__all__ = [
+    "READY_KEY",
+    "StartupCoordinator",
+    "StartupLockTimeout",
+    "default_lock_path",
+    "schema_fingerprint",
+    "upgrade_schema",
+]
@@ -0,0 +1,183 @@
+"""Connection pool configuration, SQLite pragmas and pool statistics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from src.app.core.config import Settings
+
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+
+
+class _WaitTimer:
+    """Accumulate how long pool checkouts waited for a connection."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.acquisitions = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.acquisitions += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+
+class TimedQueuePool(QueuePool):
+    """:class:`QueuePool` that records the time spent waiting for a connection."""
+
+    wait_timer: _WaitTimer
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_timer = _WaitTimer()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_timer.record(time.perf_counter() - started)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async-adapted variant of :class:`TimedQueuePool`."""
+
+    wait_timer: _WaitTimer
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_timer = _WaitTimer()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_timer.record(time.perf_counter() - started)
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """Point-in-time view of an engine's connection pool."""
+
+    pool: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    acquisitions: int
+    wait_seconds_total: float
+    max_wait_seconds: float
+
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in {None, "", ":memory:"}
+
+
+def engine_options(database_url: str, config: Settings, *, is_async: bool = False) -> dict[str, Any]:
+    """Return ``create_engine`` keyword arguments for ``database_url`` built from ``config``.
+
+    Pool sizing only applies to queue pools; in-memory SQLite keeps the
+    library's single-connection pool.
+    """
+
+    options: dict[str, Any] = {"pool_pre_ping": config.db_pool_pre_ping}
+    if make_url(database_url).get_backend_name() == "sqlite" and not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+    if _is_sqlite_memory(database_url):
+        return options
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout_seconds,
+        pool_recycle=config.db_pool_recycle_seconds,
+    )
+    return options
+
+
+def sqlite_pragmas(config: Settings) -> list[str]:
+    """Return the ``PRAGMA`` statements to run on every new SQLite connection."""
+
+    pragmas = []
+    journal_mode = config.sqlite_journal_mode.strip().upper()
+    if journal_mode:
+        if journal_mode not in _JOURNAL_MODES:
+            raise ValueError(f"Unsupported SQLite journal mode: {config.sqlite_journal_mode}")
+        pragmas.append(f"PRAGMA journal_mode={journal_mode}")
+    synchronous = config.sqlite_synchronous.strip().upper()
+    if synchronous:
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"Unsupported SQLite synchronous mode: {config.sqlite_synchronous}")
+        pragmas.append(f"PRAGMA synchronous={synchronous}")
+    if config.sqlite_busy_timeout_ms > 0:
+        pragmas.append(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}")
+    if config.sqlite_mmap_size > 0:
+        pragmas.append(f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}")
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, config: Settings) -> None:
+    """Run the configured pragmas on each connection ``engine`` opens (no-op for other backends).
+
+    Pass ``async_engine.sync_engine`` for async engines.
+    """
+
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(config)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def pool_stats(pool: Pool, name: str) -> PoolStats:
+    """Return a :class:`PoolStats` snapshot for ``pool``; non-queue pools report zeros."""
+
+    timer: _WaitTimer | None = getattr(pool, "wait_timer", None)
+    if isinstance(pool, QueuePool):
+        size, checked_out, checked_in = pool.size(), pool.checkedout(), pool.checkedin()
+        overflow = max(0, pool.overflow())
+    else:
+        size = checked_out = checked_in = overflow = 0
+    return PoolStats(
+        pool=name,
+        size=size,
+        checked_out=checked_out,
+        checked_in=checked_in,
+        overflow=overflow,
+        acquisitions=timer.acquisitions if timer else 0,
+        wait_seconds_total=timer.total_seconds if timer else 0.0,
+        max_wait_seconds=timer.max_seconds if timer else 0.0,
+    )
+
+
+__all__ = [
+    "PoolStats",
+    "TimedAsyncQueuePool",
+    "TimedQueuePool",
+    "apply_sqlite_pragmas",
+    "engine_options",
+    "pool_stats",
+    "sqlite_pragmas",
+]
@@ -0,0 +1,211 @@
+"""Route read-only statements to replicas and everything else to the primary.
+
+:class:`RoutingSession` sends plain ``SELECT`` statements to one replica of
+its :class:`ReplicaSet`, chosen round-robin on the first read and kept until
+the session commits, rolls back or closes, so the reads of one transaction
+see a single snapshot. Writes, ``SELECT ... FOR UPDATE``, textual SQL and
+flushes go to the primary; once a session has touched the primary it stays
+there, so a request reads its own writes. A replica whose connection fails is
+ejected for a cool-down period and the failed read is retried on the primary;
+when no replica is healthy reads go to the primary directly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import itertools
+import logging
+from threading import Lock
+import time
+from typing import Any, Callable
+
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ReplicaStats:
+    """Point-in-time counters exposed by :class:`ReplicaSet`."""
+
+    replicas: int
+    healthy: int
+    routed_reads: int
+    fallbacks: int
+    ejections: int
+
+
+class ReplicaSet:
+    """Round-robin choice among replica engines, skipping ejected ones."""
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        *,
+        eject_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._engines = tuple(engines)
+        self._eject_seconds = eject_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._ejected_until = [0.0] * len(self._engines)
+        self._cursor = itertools.count()
+        self._routed = 0
+        self._fallbacks = 0
+        self._ejections = 0
+        for engine in self._engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    @property
+    def engines(self) -> tuple[Engine, ...]:
+        """Return the replica engines in configuration order."""
+
+        return self._engines
+
+    def choose(self) -> Engine | None:
+        """Return the next healthy replica, or ``None`` when reads must go to the primary."""
+
+        count = len(self._engines)
+        if count == 0:
+            return None
+        now = self._clock()
+        with self._lock:
+            start = next(self._cursor)
+            for offset in range(count):
+                index = (start + offset) % count
+                # An expired ejection readmits the replica; the next failure ejects it again.
+                if self._ejected_until[index] <= now:
+                    self._routed += 1
+                    return self._engines[index]
+            self._fallbacks += 1
+        return None
+
+    def is_healthy(self, engine: Engine) -> bool:
+        """Return whether ``engine`` is currently eligible for reads."""
+
+        with self._lock:
+            return self._ejected_until[self._engines.index(engine)] <= self._clock()
+
+    def record_fallback(self) -> None:
+        """Count a read that a failed replica handed back to the primary."""
+
+        with self._lock:
+            self._fallbacks += 1
+
+    def eject(self, engine: Engine) -> None:
+        """Stop routing reads to ``engine`` for the cool-down period."""
+
+        with self._lock:
+            index = self._engines.index(engine)
+            self._ejected_until[index] = self._clock() + self._eject_seconds
+            self._ejections += 1
+        logger.warning("Ejected read replica %s for %.0f s", engine.url, self._eject_seconds)
+
+    def stats(self) -> ReplicaStats:
+        """Return a snapshot of routing and health counters."""
+
+        now = self._clock()
+        with self._lock:
+            return ReplicaStats(
+                replicas=len(self._engines),
+                healthy=sum(1 for until in self._ejected_until if until <= now),
+                routed_reads=self._routed,
+                fallbacks=self._fallbacks,
+                ejections=self._ejections,
+            )
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        # Only connection-level failures eject; a bad query says nothing about the replica.
+        if context.is_disconnect or context.connection is None:
+            self.eject(context.engine)
+
+
+def _is_read(clause: Any) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+def _pin_to_primary(session: "RoutingSession", flush_context: Any, instances: Any) -> None:
+    # Reads issued while flushing (collection loads, server defaults) must see the rows being written.
+    session.use_primary()
+
+
+class RoutingSession(Session):
+    """:class:`Session` that sends plain reads to one replica of a :class:`ReplicaSet` until it writes.
+
+    Pass ``replicas`` through the session factory, e.g.
+    ``sessionmaker(bind=engine, class_=RoutingSession, replicas=replica_set)``;
+    without replicas it behaves like a plain :class:`Session`.
+    """
+
+    def __init__(self, *args: Any, replicas: ReplicaSet | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.pinned_to_primary = replicas is None
+        # The replica serving this transaction's reads; ``None`` once chosen means the primary.
+        self._replica: Engine | None = None
+        self._chosen = False
+        if replicas is not None:
+            event.listen(self, "before_flush", _pin_to_primary)
+
+    def use_primary(self) -> None:
+        """Send every later statement of this session to the primary."""
+
+        self.pinned_to_primary = True
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kwargs: Any) -> Any:
+        if not self.pinned_to_primary and _is_read(clause):
+            if not self._chosen:
+                self._replica = self.replicas.choose()  # type: ignore[union-attr]
+                self._chosen = True
+            if self._replica is not None:
+                return self._replica
+        elif not self.pinned_to_primary:
+            self.pinned_to_primary = True
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return self._with_fallback(super().execute, statement, *args, **kwargs)
+
+    def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return self._with_fallback(super().scalars, statement, *args, **kwargs)
+
+    def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return self._with_fallback(super().scalar, statement, *args, **kwargs)
+
+    def commit(self) -> None:
+        super().commit()
+        self._forget_replica()
+
+    def rollback(self) -> None:
+        super().rollback()
+        self._forget_replica()
+
+    def close(self) -> None:
+        super().close()
+        self._forget_replica()
+
+    def _with_fallback(self, method: Callable[..., Any], statement: Any, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return method(statement, *args, **kwargs)
+        except DBAPIError:
+            replica = self._replica
+            # Retry only reads whose replica was just ejected; a bad query would fail on the primary too.
+            if replica is None or self.pinned_to_primary or self.replicas.is_healthy(replica):  # type: ignore[union-attr]
+                raise
+        # Nothing has been written yet, so dropping the broken replica connection loses no work.
+        self.rollback()
+        self._chosen = True
+        self.replicas.record_fallback()  # type: ignore[union-attr]
+        return method(statement, *args, **kwargs)
+
+    def _forget_replica(self) -> None:
+        self._replica = None
+        self._chosen = False
+
+
+__all__ = ["ReplicaSet", "ReplicaStats", "RoutingSession"]
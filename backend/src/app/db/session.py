@@ -2,19 +2,120 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.app.core.config import settings
+from src.app.core.metrics import format_family
+from src.app.db.pool import PoolStats, apply_sqlite_pragmas, engine_options, pool_stats
+from src.app.db.routing import ReplicaSet, RoutingSession
 
-_connect_args: dict[str, object] = {}
-if settings.database_url.startswith("sqlite"):  # pragma: no cover - branch ensures sqlite compatibility
-    _connect_args["check_same_thread"] = False
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
 
-engine = create_engine(settings.database_url, connect_args=_connect_args)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+def to_async_url(database_url: str) -> str:
+    """Return the async-driver equivalent of a synchronous database URL."""
+
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.drivername in _ASYNC_DRIVERS.values() or backend not in _ASYNC_DRIVERS:
+        return database_url
+    return url.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _create_sync_engine(database_url: str) -> Engine:
+    created = create_engine(database_url, **engine_options(database_url, settings))
+    apply_sqlite_pragmas(created, settings)
+    return created
+
+
+def _create_async_engine(database_url: str) -> AsyncEngine:
+    created = create_async_engine(database_url, **engine_options(database_url, settings, is_async=True))
+    apply_sqlite_pragmas(created.sync_engine, settings)
+    return created
+
+
+_async_database_url = settings.async_database_url or to_async_url(settings.database_url)
+
+engine = _create_sync_engine(settings.database_url)
+async_engine = _create_async_engine(_async_database_url)
+
+# Without replicas the routing sessions behave exactly like plain sessions.
+replica_set = ReplicaSet(
+    [_create_sync_engine(url) for url in settings.database_replica_urls],
+    eject_seconds=settings.db_replica_eject_seconds,
+)
+async_replica_engines = [_create_async_engine(to_async_url(url)) for url in settings.database_replica_urls]
+async_replica_set = ReplicaSet(
+    [replica.sync_engine for replica in async_replica_engines],
+    eject_seconds=settings.db_replica_eject_seconds,
+)
+_sync_replicas = replica_set if replica_set.engines else None
+_async_replicas = async_replica_set if async_replica_set.engines else None
+
+SessionLocal = sessionmaker(
+    bind=engine,
+    class_=RoutingSession,
+    replicas=_sync_replicas,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    replicas=_async_replicas,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def database_pool_stats() -> list[PoolStats]:
+    """Return pool statistics for the sync and async engines, replicas included."""
+
+    stats = [pool_stats(engine.pool, "sync"), pool_stats(async_engine.sync_engine.pool, "async")]
+    for index, replica in enumerate(replica_set.engines):
+        stats.append(pool_stats(replica.pool, f"sync-replica-{index}"))
+    for index, replica in enumerate(async_replica_set.engines):
+        stats.append(pool_stats(replica.pool, f"async-replica-{index}"))
+    return stats
+
+
+_POOL_FAMILIES = (
+    ("db_pool_size", "Configured number of pooled connections.", "gauge", "size"),
+    ("db_pool_checked_out", "Connections currently checked out of the pool.", "gauge", "checked_out"),
+    ("db_pool_overflow", "Connections opened beyond the pool size.", "gauge", "overflow"),
+    ("db_pool_acquisitions_total", "Connections handed out by the pool.", "counter", "acquisitions"),
+    ("db_pool_wait_seconds_total", "Time spent waiting for a pooled connection.", "counter", "wait_seconds_total"),
+    ("db_pool_max_wait_seconds", "Longest wait for a pooled connection.", "gauge", "max_wait_seconds"),
+)
+
+
+_REPLICA_FAMILIES = (
+    ("db_replica_healthy", "Read replicas currently receiving reads.", "gauge", "healthy"),
+    ("db_replica_reads_total", "Read transactions routed to a replica.", "counter", "routed_reads"),
+    ("db_replica_fallbacks_total", "Reads sent to the primary because no replica was healthy.", "counter", "fallbacks"),
+    ("db_replica_ejections_total", "Replicas ejected after a connection failure.", "counter", "ejections"),
+)
+
+
+def pool_metric_lines() -> list[str]:
+    """Render :func:`database_pool_stats` for the metrics endpoint."""
+
+    stats = database_pool_stats()
+    lines: list[str] = []
+    for name, help_text, kind, attribute in _POOL_FAMILIES:
+        lines += format_family(name, help_text, kind, (({"pool": s.pool}, getattr(s, attribute)) for s in stats))
+    replicas = [(label, replicas.stats()) for label, replicas in (("sync", replica_set), ("async", async_replica_set))]
+    if any(stats.replicas for _, stats in replicas):
+        for name, help_text, kind, attribute in _REPLICA_FAMILIES:
+            samples = (({"session": label}, getattr(stats, attribute)) for label, stats in replicas)
+            lines += format_family(name, help_text, kind, samples)
+    return lines
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -27,4 +128,35 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
-__all__ = ["SessionLocal", "engine", "get_session"]
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the async session factory for responses that outlive the request's dependencies.
+
+    Streaming responses keep reading after ``yield`` dependencies have been
+    closed, so they open their own session from this factory.
+    """
+
+    return AsyncSessionLocal
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session for ``async def`` FastAPI dependencies."""
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+__all__ = [
+    "AsyncSessionLocal",
+    "SessionLocal",
+    "async_engine",
+    "async_replica_engines",
+    "async_replica_set",
+    "database_pool_stats",
+    "engine",
+    "get_async_session",
+    "get_async_session_factory",
+    "get_session",
+    "pool_metric_lines",
+    "replica_set",
+    "to_async_url",
+]
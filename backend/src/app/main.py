@@ -1,29 +1,143 @@
-"""Main FastAPI application instance."""
+"""FastAPI application factory and the default application instance."""
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from src.app.api.responses import ORJSONResponse
 from src.app.api.v1 import api_router
-from src.app.core import settings
-from src.app.db.session import SessionLocal
+from src.app.api.well_known import router as well_known_router
+from src.app.core.config import Settings, settings
+from src.app.core.metrics import MetricsMiddleware, instrument_engine, metrics_registry
+from src.app.db.bootstrap import StartupCoordinator, default_lock_path, schema_fingerprint
+from src.app.db.session import (
+    SessionLocal,
+    async_engine,
+    async_replica_engines,
+    engine,
+    pool_metric_lines,
+    replica_set,
+)
 from src.app.db.utils import create_all_tables
+from src.app.services.activity import activity_metric_lines, activity_tracker
+from src.app.services.audit import audit_log, audit_metric_lines
+from src.app.services.hashing import PasswordHasherBusy, password_hasher
+from src.app.services.permissions import permission_engine
+from src.app.services.revocation import revocation_service
+from src.app.services.throttle import LoginThrottled
 from src.app.services.users import user_service
 
-app = FastAPI(title=settings.app_name, version=settings.app_version)
-app.include_router(api_router, prefix="/api/v1")
 
+async def _on_hasher_busy(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+    """Shed load with 503 instead of queueing more password hashing work."""
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication temporarily overloaded"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _on_login_throttled(request: Request, exc: LoginThrottled) -> JSONResponse:
+    """Reject throttled login attempts before they reach the password hasher."""
+
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many login attempts"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
-@app.on_event("startup")
-def _on_startup() -> None:
-    """Initialise database tables and default roles on application startup."""
 
+def _initialise_database(session: Session) -> None:
     create_all_tables()
+    user_service.ensure_default_roles(session)
+
+
+def startup(config: Settings) -> None:
+    """Prepare the database once per deploy, then warm this worker's in-memory state.
+
+    With ``startup_db_init`` disabled (read-only replicas) nothing is written:
+    the schema and catalog are assumed to be managed by the primary, and only
+    the permission masks and the token denylist are read.
+    """
+
+    if config.startup_db_init:
+        coordinator = StartupCoordinator(
+            engine,
+            fingerprint=schema_fingerprint(config.app_version, user_service.catalog_hash()),
+            lock_path=Path(config.startup_lock_path) if config.startup_lock_path else default_lock_path(config.app_name),
+            timeout_seconds=config.startup_lock_timeout_seconds,
+        )
+        coordinator.run(_initialise_database)
+
     session = SessionLocal()
     try:
-        user_service.ensure_default_roles(session)
+        permission_engine.compile(session)
+        revocation_service.load(session, purge=config.startup_db_init)
     finally:
         session.close()
 
 
-__all__ = ["app"]
+def create_app(config: Settings | None = None) -> FastAPI:
+    """Build the application for ``config`` (defaults to the environment settings).
+
+    Database engines are process-wide and always follow the environment
+    settings; ``config`` controls the application itself and its startup.
+    """
+
+    config = config or settings
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # Waiting on the startup lock must not stall the event loop.
+        await asyncio.to_thread(startup, config)
+        audit_log.start()
+        activity_tracker.start()
+        revocation_service.start()
+        try:
+            yield
+        finally:
+            # Drain queued audit events and activity timestamps while the engines are still open.
+            await asyncio.to_thread(audit_log.stop)
+            await asyncio.to_thread(activity_tracker.stop)
+            await asyncio.to_thread(revocation_service.stop)
+            password_hasher.shutdown()
+            await async_engine.dispose()
+            for replica in async_replica_engines:
+                await replica.dispose()
+
+    app = FastAPI(
+        title=config.app_name,
+        version=config.app_version,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+    app.include_router(api_router, prefix="/api/v1")
+    app.include_router(well_known_router)
+    app.add_exception_handler(PasswordHasherBusy, _on_hasher_busy)
+    app.add_exception_handler(LoginThrottled, _on_login_throttled)
+
+    if config.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        instrument_engine(engine)
+        instrument_engine(async_engine.sync_engine)
+        for replica in (*replica_set.engines, *(replica.sync_engine for replica in async_replica_engines)):
+            instrument_engine(replica)
+        metrics_registry.add_collector(pool_metric_lines)
+        metrics_registry.add_collector(audit_metric_lines)
+        metrics_registry.add_collector(activity_metric_lines)
+
+    return app
+
+
+app = create_app()
+
+
+__all__ = ["app", "create_app", "startup"]
@@ -1,7 +1,12 @@
 """ORM models exposed by the Codex backend."""
 
+from .app_meta import AppMeta
+from .assignment import Assignment
+from .audit_event import AuditEvent
+from .mission import Mission
 from .permission import Permission
+from .revoked_token import RevokedToken
 from .role import Role
 from .user import User
 
-__all__ = ["Permission", "Role", "User"]
+__all__ = ["AppMeta", "Assignment", "AuditEvent", "Mission", "Permission", "RevokedToken", "Role", "User"]
@@ -0,0 +1,23 @@
+"""Key/value metadata stored alongside the application schema."""
+
+from __future__ import annotations
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.db.base import Base
+
+
+class AppMeta(Base):
+    """Small key/value record used for schema and catalog bookkeeping."""
+
+    __tablename__ = "app_meta"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[str] = mapped_column(String(255))
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helpers used for debugging
+        return f"AppMeta(key={self.key!r}, value={self.value!r})"
+
+
+__all__ = ["AppMeta"]
@@ -0,0 +1,42 @@
+"""Assignment of a technician to a mission."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.app.db.base import Base
+
+
+class Assignment(Base):
+    """A technician booked on a mission for ``[start_at, end_at)``.
+
+    The booked hours usually match the mission's but may cover only part of it
+    (a technician leaving after set-up), so conflict checks use these columns.
+    """
+
+    __tablename__ = "assignments"
+    __table_args__ = (
+        UniqueConstraint("mission_id", "user_id", name="uq_assignments_mission_user"),
+        CheckConstraint("end_at > start_at", name="ck_assignments_interval"),
+        # Planning windows are loaded by time range; conflicts are swept per technician.
+        Index("ix_assignments_start_at_end_at", "start_at", "end_at"),
+        Index("ix_assignments_user_start_at", "user_id", "start_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    mission_id: Mapped[int] = mapped_column(ForeignKey("missions.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    mission = relationship("Mission", back_populates="assignments")
+    user = relationship("User")
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helpers used for debugging
+        return f"Assignment(id={self.id!r}, mission_id={self.mission_id!r}, user_id={self.user_id!r})"
+
+
+__all__ = ["Assignment"]
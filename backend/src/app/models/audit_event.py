@@ -0,0 +1,35 @@
+"""Authentication and authorisation audit trail."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.db.base import Base
+
+
+class AuditEvent(Base):
+    """A login, refresh, logout or access-denied event written by the audit writer."""
+
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        # Time-range scans and their keyset pagination walk this index in order.
+        Index("ix_audit_events_occurred_at_id", "occurred_at", "id"),
+        Index("ix_audit_events_subject_occurred_at", "subject", "occurred_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    event_type: Mapped[str] = mapped_column(String(32))
+    subject: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    client_ip: Mapped[str | None] = mapped_column(String(45), nullable=True)
+    path: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    detail: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helpers used for debugging
+        return f"AuditEvent(id={self.id!r}, event_type={self.event_type!r}, subject={self.subject!r})"
+
+
+__all__ = ["AuditEvent"]
@@ -0,0 +1,31 @@
+"""Mission model definition."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.app.db.base import Base
+
+
+class Mission(Base):
+    """A scheduled job (set-up, show, tear-down...) that technicians are assigned to."""
+
+    __tablename__ = "missions"
+    __table_args__ = (CheckConstraint("end_at > start_at", name="ck_missions_interval"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    title: Mapped[str] = mapped_column(String(200))
+    venue: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    assignments = relationship("Assignment", back_populates="mission", cascade="all, delete-orphan")
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helpers used for debugging
+        return f"Mission(id={self.id!r}, title={self.title!r})"
+
+
+__all__ = ["Mission"]
@@ -0,0 +1,34 @@
+"""Revoked JWT identifiers."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.db.base import Base
+
+
+class RevokedToken(Base):
+    """A token ``jti`` that must no longer be accepted.
+
+    The primary key doubles as the refresh-rotation guard: a refresh token can
+    only be exchanged by the request that manages to insert its ``jti``.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    subject: Mapped[str] = mapped_column(String(255))
+    token_type: Mapped[str] = mapped_column(String(16))
+    reason: Mapped[str] = mapped_column(String(32))
+    expires_at: Mapped[int] = mapped_column(Integer, index=True)
+    # Workers poll ``revoked_at`` to pick up revocations made elsewhere.
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helpers used for debugging
+        return f"RevokedToken(jti={self.jti!r}, reason={self.reason!r})"
+
+
+__all__ = ["RevokedToken"]
@@ -14,6 +14,25 @@ role_permissions = Table(
     Column("permission_id", ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True),
 )
 
+# Direct inclusions: holders of ``parent_id`` also hold ``child_id``.
+role_hierarchy = Table(
+    "role_hierarchy",
+    Base.metadata,
+    Column("parent_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    Column("child_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+# Transitive closure of ``role_hierarchy``, maintained incrementally by UserService.
+# Every role is its own ancestor; ``paths`` counts the distinct inclusion paths so
+# removing one edge of a diamond keeps the rows still reachable another way.
+role_closure = Table(
+    "role_closure",
+    Base.metadata,
+    Column("ancestor_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    Column("descendant_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True, index=True),
+    Column("paths", Integer, nullable=False, default=1),
+)
+
 
 class Role(Base):
     """Represents a RBAC role with associated permissions."""
@@ -31,4 +50,4 @@ class Role(Base):
         return f"Role(id={self.id!r}, name={self.name!r})"
 
 
-__all__ = ["Role", "role_permissions"]
+__all__ = ["Role", "role_closure", "role_hierarchy", "role_permissions"]
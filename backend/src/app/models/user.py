@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Table
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Table, join
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.db.base import Base
+from src.app.models.permission import Permission
+from src.app.models.role import Role, role_closure, role_permissions
 
 user_roles = Table(
     "user_roles",
@@ -24,8 +28,32 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     hashed_password: Mapped[str] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Bumped by UserService on every change visible through the API; feeds response ETags.
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
+    # Written behind by ActivityTracker, so they may lag the request by one flush interval.
+    last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     roles = relationship("Role", secondary=user_roles, back_populates="users")
+    # Read-only views through the role closure: assigned roles plus every role they include.
+    effective_roles = relationship(
+        Role,
+        secondary=join(user_roles, role_closure, user_roles.c.role_id == role_closure.c.ancestor_id),
+        primaryjoin=lambda: User.id == user_roles.c.user_id,
+        secondaryjoin=Role.id == role_closure.c.descendant_id,
+        collection_class=set,
+        viewonly=True,
+    )
+    effective_permissions = relationship(
+        Permission,
+        secondary=join(user_roles, role_closure, user_roles.c.role_id == role_closure.c.ancestor_id).join(
+            role_permissions, role_permissions.c.role_id == role_closure.c.descendant_id
+        ),
+        primaryjoin=lambda: User.id == user_roles.c.user_id,
+        secondaryjoin=Permission.id == role_permissions.c.permission_id,
+        collection_class=set,
+        viewonly=True,
+    )
 
     def __repr__(self) -> str:  # pragma: no cover - repr helpers used for debugging
         return f"User(id={self.id!r}, email={self.email!r})"
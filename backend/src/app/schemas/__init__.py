@@ -1,12 +1,22 @@
 """Expose pydantic schemas."""
 
-from .auth import LoginRequest, RefreshRequest, TokenPair
-from .user import RoleRead, UserRead
+from .audit import AuditEventPage, AuditEventRead
+from .auth import LoginRequest, LogoutRequest, RefreshRequest, TokenPair
+from .planning import ConflictRead, PlanningCheckRead
+from .user import RoleRead, UserImportError, UserImportReport, UserPage, UserRead
 
 __all__ = [
+    "AuditEventPage",
+    "AuditEventRead",
+    "ConflictRead",
     "LoginRequest",
+    "LogoutRequest",
+    "PlanningCheckRead",
     "RefreshRequest",
     "RoleRead",
     "TokenPair",
+    "UserImportError",
+    "UserImportReport",
+    "UserPage",
     "UserRead",
 ]
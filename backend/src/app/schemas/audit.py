@@ -0,0 +1,31 @@
+"""Pydantic schemas for the audit log API."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class AuditEventRead(BaseModel):
+    """Public representation of an audit event."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    occurred_at: datetime
+    event_type: str
+    subject: str | None = None
+    client_ip: str | None = None
+    path: str | None = None
+    detail: str | None = None
+
+
+class AuditEventPage(BaseModel):
+    """One keyset page of audit events, newest first; pass ``next_cursor`` as ``cursor``."""
+
+    items: list[AuditEventRead]
+    next_cursor: str | None = None
+
+
+__all__ = ["AuditEventPage", "AuditEventRead"]
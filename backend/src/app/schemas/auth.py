@@ -8,7 +8,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class LoginRequest(BaseModel):
     """Request body for the login endpoint."""
 
-    email: str = Field(..., examples=["admin@example.com"])
+    email: str = Field(..., max_length=255, examples=["admin@example.com"])
     password: str = Field(..., min_length=1)
 
 
@@ -18,6 +18,12 @@ class RefreshRequest(BaseModel):
     refresh_token: str = Field(..., min_length=10)
 
 
+class LogoutRequest(BaseModel):
+    """Request body for logging out; the refresh token is revoked alongside the access token."""
+
+    refresh_token: str | None = Field(default=None, min_length=10)
+
+
 class TokenPair(BaseModel):
     """Response returned after a successful authentication or refresh."""
 
@@ -28,4 +34,4 @@ class TokenPair(BaseModel):
     token_type: str = "bearer"
 
 
-__all__ = ["LoginRequest", "RefreshRequest", "TokenPair"]
+__all__ = ["LoginRequest", "LogoutRequest", "RefreshRequest", "TokenPair"]
@@ -0,0 +1,34 @@
+"""Pydantic schemas for planning checks."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ConflictRead(BaseModel):
+    """A double booking or rest-period violation between two assignments of one technician."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: str
+    technician_id: int
+    first_assignment_id: int
+    second_assignment_id: int
+    start_at: datetime
+    end_at: datetime
+
+
+class PlanningCheckRead(BaseModel):
+    """Conflicts found in a planning window (a Monday-to-Monday week, in UTC)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    start_at: datetime
+    end_at: datetime
+    assignments: int
+    conflicts: list[ConflictRead]
+
+
+__all__ = ["ConflictRead", "PlanningCheckRead"]
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Iterable
+
 from pydantic import BaseModel, ConfigDict, Field
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from src.app.models import User
+    from src.app.services.principals import Principal
+
 
 class RoleRead(BaseModel):
     """Public representation of a role."""
@@ -14,7 +20,11 @@ class RoleRead(BaseModel):
 
 
 class UserRead(BaseModel):
-    """Public representation of a user."""
+    """Public representation of a user.
+
+    ``roles`` lists the roles assigned to the user; ``effective_roles`` adds
+    every role they include through the role hierarchy.
+    """
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -22,6 +32,65 @@ class UserRead(BaseModel):
     email: str
     is_active: bool
     roles: list[RoleRead] = Field(default_factory=list)
+    effective_roles: list[RoleRead] = Field(default_factory=list)
+
+    @classmethod
+    def from_user(cls, user: "User") -> "UserRead":
+        """Build the public representation from a user loaded with ``roles`` and ``effective_roles``."""
+
+        return cls._from_fields(
+            user.id,
+            user.email,
+            user.is_active,
+            (role.name for role in user.roles),
+            (role.name for role in user.effective_roles),
+        )
+
+    @classmethod
+    def from_principal(cls, principal: "Principal") -> "UserRead":
+        """Build the public representation from a cached principal without touching the ORM."""
+
+        return cls._from_fields(
+            principal.id, principal.email, principal.is_active, principal.assigned_roles, principal.roles
+        )
+
+    @classmethod
+    def _from_fields(
+        cls, id: int, email: str, is_active: bool, roles: Iterable[str], effective_roles: Iterable[str]
+    ) -> "UserRead":
+        # Validating plain dicts in pydantic-core costs less than one ``model_construct`` per role.
+        return cls.model_validate(
+            {
+                "id": id,
+                "email": email,
+                "is_active": is_active,
+                "roles": [{"name": name} for name in sorted(roles)],
+                "effective_roles": [{"name": name} for name in sorted(effective_roles)],
+            }
+        )
+
+
+class UserPage(BaseModel):
+    """One keyset page of users; pass ``next_cursor`` as ``after`` to fetch the next page."""
+
+    items: list[UserRead]
+    next_cursor: int | None = None
+
+
+class UserImportError(BaseModel):
+    """A row rejected by a bulk user import."""
+
+    line: int
+    email: str | None = None
+    message: str
+
+
+class UserImportReport(BaseModel):
+    """Outcome of a bulk user import."""
+
+    created: int
+    failed: int
+    errors: list[UserImportError] = Field(default_factory=list)
 
 
-__all__ = ["RoleRead", "UserRead"]
+__all__ = ["RoleRead", "UserImportError", "UserImportReport", "UserPage", "UserRead"]
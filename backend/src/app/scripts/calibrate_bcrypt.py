@@ -0,0 +1,69 @@
+"""Measure bcrypt cost on this host and recommend PASSWORD_HASH_ROUNDS for a latency target."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+from src.app.services.hashing import MAX_ROUNDS, MIN_ROUNDS
+
+# Below this cost bcrypt no longer slows offline guessing meaningfully.
+RECOMMENDED_MIN_ROUNDS = 10
+
+
+def measure_rounds(rounds: int, samples: int = 5) -> float:
+    """Return the median seconds to hash one password at cost ``rounds``."""
+
+    password = b"calibration-password"
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(password, salt)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def recommend_rounds(timings: dict[int, float], target_seconds: float, floor: int = RECOMMENDED_MIN_ROUNDS) -> int:
+    """Return the highest measured cost within ``target_seconds``, never below ``floor``."""
+
+    within = [rounds for rounds, seconds in timings.items() if seconds <= target_seconds]
+    return max([floor, *within])
+
+
+def calibrate(target_seconds: float, samples: int = 5, start: int = MIN_ROUNDS) -> dict[int, float]:
+    """Time increasing costs until one exceeds ``target_seconds`` (each step doubles the work)."""
+
+    timings: dict[int, float] = {}
+    for rounds in range(start, MAX_ROUNDS + 1):
+        timings[rounds] = measure_rounds(rounds, samples)
+        if timings[rounds] > target_seconds:
+            break
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print per-cost hash times and the recommended setting."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="hash latency budget per login")
+    parser.add_argument("--samples", type=int, default=5, help="hashes timed per cost")
+    parser.add_argument("--floor", type=int, default=RECOMMENDED_MIN_ROUNDS, help="never recommend a lower cost")
+    args = parser.parse_args(argv)
+
+    target = args.target_ms / 1000
+    timings = calibrate(target, args.samples)
+    for rounds, seconds in timings.items():
+        print(f"rounds={rounds:>2}  {seconds * 1000:8.1f} ms")  # noqa: T201 - script feedback
+    recommended = recommend_rounds(timings, target, args.floor)
+    if timings.get(recommended, float("inf")) > target:
+        print(f"Warning: the minimum cost {recommended} exceeds {args.target_ms:.0f} ms on this host")  # noqa: T201
+    print(f"PASSWORD_HASH_ROUNDS={recommended}")  # noqa: T201 - script feedback
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+"""Generate a PEM signing key for asymmetric JWT signing."""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+_CURVES = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+
+
+def generate_private_pem(algorithm: str, rsa_bits: int = 2048) -> bytes:
+    """Return a new unencrypted PKCS#8 private key suitable for ``algorithm``."""
+
+    if algorithm in _CURVES:
+        key = ec.generate_private_key(_CURVES[algorithm]())
+    elif algorithm.startswith("RS"):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=rsa_bits)
+    else:
+        raise ValueError(f"Unsupported algorithm: {algorithm}")
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Write ``<kid>.pem`` into the keys directory and print the kid to activate."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("keys_dir", type=Path, help="directory referenced by JWT_KEYS_DIR")
+    parser.add_argument("--algorithm", default="RS256", help="RS256/RS384/RS512 or ES256/ES384/ES512")
+    parser.add_argument("--kid", help="key id; defaults to a UTC timestamp")
+    parser.add_argument("--rsa-bits", type=int, default=2048)
+    args = parser.parse_args(argv)
+
+    kid = args.kid or datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
+    args.keys_dir.mkdir(parents=True, exist_ok=True)
+    path = args.keys_dir / f"{kid}.pem"
+    if path.exists():
+        parser.error(f"{path} already exists")
+    path.write_bytes(generate_private_pem(args.algorithm.upper(), args.rsa_bits))
+    path.chmod(0o600)
+    print(f"Wrote {path}; set JWT_ACTIVE_KID={kid} to sign with it")  # noqa: T201 - script feedback
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
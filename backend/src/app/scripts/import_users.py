@@ -0,0 +1,53 @@
+"""Bulk import users from a CSV or NDJSON file."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from src.app.core import settings
+from src.app.db.session import SessionLocal
+from src.app.db.utils import create_all_tables
+from src.app.services.hashing import password_hasher
+from src.app.services.user_import import iter_rows, row_parser
+from src.app.services.users import user_service
+
+_FORMATS = {".csv": "text/csv", ".ndjson": "application/x-ndjson", ".jsonl": "application/x-ndjson"}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Import users from the file given on the command line; return the number of failed rows."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path, help="CSV (with header) or NDJSON file")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="override detection from the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.user_import_batch_size)
+    args = parser.parse_args(argv)
+
+    media_type = args.format or _FORMATS.get(args.path.suffix.lower())
+    if media_type is None:
+        parser.error(f"cannot infer the format of {args.path}; pass --format")
+
+    create_all_tables()
+    session = SessionLocal()
+    try:
+        user_service.ensure_default_roles(session)
+        with args.path.open(encoding="utf-8-sig", newline="") as handle:
+            result = user_service.bulk_create_users(
+                session,
+                iter_rows(handle, row_parser(media_type)),
+                batch_size=args.batch_size,
+            )
+    finally:
+        session.close()
+        password_hasher.shutdown()
+
+    print(f"Created {result.created} users, {result.failed} rows failed")  # noqa: T201 - script feedback
+    for error in result.errors:
+        print(f"  line {error.line} ({error.email or '-'}): {error.message}")  # noqa: T201 - script feedback
+    return result.failed
+
+
+if __name__ == "__main__":
+    print(f"Using database: {settings.database_url}")  # noqa: T201 - script feedback
+    raise SystemExit(1 if main() else 0)
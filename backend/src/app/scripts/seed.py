@@ -5,6 +5,7 @@ from __future__ import annotations
 from src.app.core import settings
 from src.app.db.session import SessionLocal
 from src.app.db.utils import create_all_tables
+from src.app.services.hashing import password_hasher
 from src.app.services.users import user_service
 
 ADMIN_EMAIL = "admin@example.com"
@@ -26,6 +27,7 @@ def main() -> None:
             print("Admin user already exists")  # noqa: T201 - script feedback
     finally:
         session.close()
+        password_hasher.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,28 @@
 """Service layer exports."""
 
 from .auth import AuthService, AuthError, auth_service
+from .hashing import PasswordHasher, PasswordHasherBusy, password_hasher
+from .permissions import PermissionEngine, permission_engine
+from .principals import Principal, PrincipalCache, principal_cache
+from .revocation import RevocationService, TokenDenylist, revocation_service, token_denylist
 from .users import UserService, user_service
 
 __all__ = [
     "AuthError",
     "AuthService",
+    "PasswordHasher",
+    "PasswordHasherBusy",
+    "PermissionEngine",
+    "Principal",
+    "PrincipalCache",
+    "RevocationService",
+    "TokenDenylist",
     "UserService",
     "auth_service",
+    "password_hasher",
+    "permission_engine",
+    "principal_cache",
+    "revocation_service",
+    "token_denylist",
     "user_service",
 ]
@@ -0,0 +1,249 @@
+"""Write-behind tracking of ``User.last_login_at`` and ``User.last_seen_at``.
+
+Updating the timestamps inline would turn every authenticated read into a
+write transaction. Instead :meth:`ActivityTracker.touch` records the newest
+timestamp per user in memory, so any number of requests by one user within a
+flush interval collapse into a single pending row. A background thread
+writes all pending rows with one executemany ``UPDATE`` per interval, and
+:meth:`ActivityTracker.stop` flushes whatever is left on shutdown.
+
+Memory is bounded by ``max_pending`` users: once full, touches for users not
+already pending are dropped (and counted) and the writer is woken early.
+The ``UPDATE`` only ever moves a timestamp forward, so flushes from several
+workers can land in any order.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+from threading import Event, Lock, Thread
+
+from sqlalchemy import ColumnElement, bindparam, case, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.app.core.config import settings
+from src.app.core.metrics import format_family
+from src.app.db.session import SessionLocal
+from src.app.models import User
+
+logger = logging.getLogger(__name__)
+
+_users = User.__table__
+
+
+def _utcnow() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+def _newer(column: ColumnElement[datetime], parameter: str) -> ColumnElement[datetime]:
+    # Keep the stored value unless the pending one is present and later.
+    value = bindparam(parameter, type_=column.type)
+    return case((value.is_(None), column), (column.is_(None), value), (column < value, value), else_=column)
+
+
+# One statement, executed once with a parameter set per pending user.
+_UPDATE_ACTIVITY = (
+    update(_users)
+    .where(_users.c.email == bindparam("subject"))
+    .values(
+        last_login_at=_newer(_users.c.last_login_at, "login_at"),
+        last_seen_at=_newer(_users.c.last_seen_at, "seen_at"),
+    )
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityStats:
+    """Point-in-time counters exposed by :class:`ActivityTracker`."""
+
+    pending: int
+    touches: int
+    coalesced: int
+    dropped: int
+    flushes: int
+    rows_written: int
+    write_failures: int
+
+
+class ActivityTracker:
+    """Coalescing buffer of user activity timestamps with a periodic bulk writer."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        enabled: bool = True,
+        flush_interval_seconds: float = 5.0,
+        max_pending: int = 50_000,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        if max_pending <= 0:
+            raise ValueError("max_pending must be positive")
+        self.enabled = enabled
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval_seconds
+        self._max_pending = max_pending
+        self._clock = clock
+        # subject -> [last_login_at, last_seen_at]; swapped out whole on every flush.
+        self._pending: dict[str, list[datetime | None]] = {}
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._wake = Event()
+        self._stopping = Event()
+        self._thread: Thread | None = None
+        self._touches = 0
+        self._coalesced = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._rows_written = 0
+        self._write_failures = 0
+
+    def touch(self, subject: str, *, login: bool = False) -> None:
+        """Record that ``subject`` (the user's email) was seen now; ``login`` also sets the last login."""
+
+        if not self.enabled:
+            return
+        now = self._clock()
+        with self._lock:
+            self._touches += 1
+            entry = self._pending.get(subject)
+            if entry is None:
+                if len(self._pending) >= self._max_pending:
+                    self._dropped += 1
+                    self._wake.set()
+                    return
+                self._pending[subject] = [now if login else None, now]
+                return
+            self._coalesced += 1
+            if login:
+                entry[0] = now
+            entry[1] = now
+
+    def start(self) -> None:
+        """Start the background writer."""
+
+        if not self.enabled or self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the writer and flush every pending timestamp."""
+
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            thread.join(timeout if timeout is not None else self._flush_interval + 5)
+        self.flush()
+
+    def flush(self) -> int:
+        """Write all pending timestamps with one bulk ``UPDATE``; return how many users were written."""
+
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            rows = [
+                {"subject": subject, "login_at": login_at, "seen_at": seen_at}
+                for subject, (login_at, seen_at) in pending.items()
+            ]
+            session = self._session_factory()
+            try:
+                session.execute(_UPDATE_ACTIVITY, rows)
+                session.commit()
+            except SQLAlchemyError:
+                session.rollback()
+                logger.exception("Activity timestamps of %d users could not be written", len(rows))
+                self._restore(pending)
+                return 0
+            finally:
+                session.close()
+        with self._lock:
+            self._flushes += 1
+            self._rows_written += len(rows)
+        return len(rows)
+
+    def stats(self) -> ActivityStats:
+        """Return a snapshot of the buffer and writer counters."""
+
+        with self._lock:
+            return ActivityStats(
+                pending=len(self._pending),
+                touches=self._touches,
+                coalesced=self._coalesced,
+                dropped=self._dropped,
+                flushes=self._flushes,
+                rows_written=self._rows_written,
+                write_failures=self._write_failures,
+            )
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            if not self._stopping.is_set():
+                self.flush()
+
+    def _restore(self, pending: dict[str, list[datetime | None]]) -> None:
+        # Merge a failed batch back so the next flush retries it; touches made meanwhile are newer and win.
+        with self._lock:
+            self._write_failures += 1
+            for subject, (login_at, seen_at) in pending.items():
+                entry = self._pending.get(subject)
+                if entry is not None:
+                    entry[0] = entry[0] or login_at
+                elif len(self._pending) < self._max_pending:
+                    self._pending[subject] = [login_at, seen_at]
+                else:
+                    self._dropped += 1
+
+
+_ACTIVITY_FAMILIES = (
+    ("activity_pending_users", "Users with activity timestamps waiting to be written.", "gauge", "pending"),
+    ("activity_touches_total", "Activity touches recorded.", "counter", "touches"),
+    ("activity_touches_coalesced_total", "Touches merged into an already pending user.", "counter", "coalesced"),
+    ("activity_touches_dropped_total", "Touches lost because the pending buffer was full.", "counter", "dropped"),
+    ("activity_flushes_total", "Bulk activity updates committed.", "counter", "flushes"),
+    ("activity_rows_written_total", "User rows updated by activity flushes.", "counter", "rows_written"),
+    ("activity_write_failures_total", "Activity flushes that failed and were retried.", "counter", "write_failures"),
+)
+
+
+def activity_metric_lines() -> list[str]:
+    """Render :meth:`ActivityTracker.stats` of the process-wide tracker for the metrics endpoint."""
+
+    stats = activity_tracker.stats()
+    lines: list[str] = []
+    for name, help_text, kind, attribute in _ACTIVITY_FAMILIES:
+        lines += format_family(name, help_text, kind, [({}, getattr(stats, attribute))])
+    return lines
+
+
+activity_tracker = ActivityTracker(
+    SessionLocal,
+    enabled=settings.activity_tracking_enabled,
+    flush_interval_seconds=settings.activity_flush_interval_seconds,
+    max_pending=settings.activity_max_pending,
+)
+
+
+def get_activity_tracker() -> ActivityTracker:
+    """FastAPI dependency returning the process-wide activity tracker."""
+
+    return activity_tracker
+
+
+__all__ = [
+    "ActivityStats",
+    "ActivityTracker",
+    "activity_metric_lines",
+    "activity_tracker",
+    "get_activity_tracker",
+]
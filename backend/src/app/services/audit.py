@@ -0,0 +1,500 @@
+"""Asynchronous, batched audit trail for authentication and authorisation events.
+
+Request handlers call :meth:`AuditLog.record`, which only appends to a bounded
+in-memory queue. A background writer thread drains the queue and bulk-inserts
+up to ``batch_size`` rows at a time, at least every ``flush_interval``
+seconds, so audited endpoints never wait on an audit commit. When the queue is
+full (or a write fails) events are appended to a JSON-lines spill file if one
+is configured, and dropped otherwise; both outcomes are counted. Spilled
+events are replayed into the table when the writer next starts, and
+:meth:`AuditLog.stop` drains everything still queued.
+
+Spill files are shared safely through ``flock``: writers lock the file for
+each append, and replay claims every file matching ``spill_glob`` (any
+worker's, including ones left by crashed processes) under an exclusive lock,
+inserts it in one transaction and unlinks it. A writer whose file was
+replayed under it starts a new one.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+import json
+import logging
+import os
+from pathlib import Path
+import queue
+from threading import Event, Lock, Thread
+import time
+from typing import IO, Any
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.app.core.config import settings
+from src.app.core.metrics import format_family
+from src.app.db.session import SessionLocal
+from src.app.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+LOGIN = "login"
+LOGIN_FAILED = "login_failed"
+REFRESH = "refresh"
+REFRESH_FAILED = "refresh_failed"
+LOGOUT = "logout"
+ACCESS_DENIED = "access_denied"
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# Oversized values are cut to their column, so one bad row cannot fail a whole batch.
+_LIMITS = {
+    name: AuditEvent.__table__.c[name].type.length for name in ("event_type", "subject", "client_ip", "path", "detail")
+}
+
+
+def _clip(value: str | None, name: str) -> str | None:
+    return value[: _LIMITS[name]] if value is not None else None
+
+
+def _utcnow() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive values are taken as UTC, matching what the writer stores.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class AuditRecord:
+    """One event waiting in the queue."""
+
+    event_type: str
+    subject: str | None = None
+    client_ip: str | None = None
+    path: str | None = None
+    detail: str | None = None
+    occurred_at: datetime = field(default_factory=_utcnow)
+
+
+@dataclass(frozen=True, slots=True)
+class AuditStats:
+    """Point-in-time counters exposed by :class:`AuditLog`."""
+
+    queued: int
+    recorded: int
+    written: int
+    spilled: int
+    dropped: int
+    replayed: int
+    batches: int
+    write_failures: int
+
+
+def encode_cursor(event: AuditEvent) -> str:
+    """Return the opaque keyset cursor pointing just past ``event``."""
+
+    micros = (_as_utc(event.occurred_at) - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{event.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor produced by :func:`encode_cursor`; raises :class:`ValueError` when malformed."""
+
+    micros, _, event_id = cursor.partition(".")
+    return _EPOCH + timedelta(microseconds=int(micros)), int(event_id)
+
+
+class AuditLog:
+    """Bounded audit queue with a background bulk writer."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        enabled: bool = True,
+        queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        spill_path: Path | None = None,
+        spill_glob: str | None = None,
+    ) -> None:
+        if queue_size <= 0 or batch_size <= 0:
+            raise ValueError("queue_size and batch_size must be positive")
+        self.enabled = enabled
+        self._session_factory = session_factory
+        # ``None`` is a wake-up sentinel from :meth:`stop`, never an event.
+        self._queue: queue.Queue[AuditRecord | None] = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_seconds
+        self._spill_path = spill_path
+        # Files in the spill directory to replay; defaults to this process's own file.
+        self._spill_glob = spill_glob or (spill_path.name if spill_path is not None else None)
+        self._spill_file: IO[str] | None = None
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._spill_lock = Lock()
+        self._stopping = Event()
+        self._thread: Thread | None = None
+        self._recorded = 0
+        self._written = 0
+        self._spilled = 0
+        self._dropped = 0
+        self._replayed = 0
+        self._batches = 0
+        self._write_failures = 0
+
+    def record(
+        self,
+        event_type: str,
+        *,
+        subject: str | None = None,
+        client_ip: str | None = None,
+        path: str | None = None,
+        detail: str | None = None,
+    ) -> None:
+        """Queue an event without blocking; spill or drop it when the queue is full.
+
+        Values longer than their column are truncated.
+        """
+
+        if not self.enabled:
+            return
+        record = AuditRecord(
+            _clip(event_type, "event_type"),
+            _clip(subject, "subject"),
+            _clip(client_ip, "client_ip"),
+            _clip(path, "path"),
+            _clip(detail, "detail"),
+        )
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._overflow([record])
+            return
+        with self._lock:
+            self._recorded += 1
+
+    def start(self) -> None:
+        """Replay any spilled events, then start the background writer."""
+
+        if not self.enabled or self._thread is not None:
+            return
+        self.replay_spill()
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the writer and write every event still queued."""
+
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass  # a full queue means the writer is not waiting for events
+            thread.join(timeout if timeout is not None else self._flush_interval + 5)
+        self.flush()
+        with self._spill_lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def flush(self) -> int:
+        """Write everything queued right now from the calling thread; return how many rows were written."""
+
+        written = 0
+        while True:
+            batch = self._drain(self._batch_size)
+            if not batch:
+                return written
+            written += self._write(batch)
+
+    def replay_spill(self) -> int:
+        """Insert the events of every matching spill file and delete the files; return how many were replayed."""
+
+        if self._spill_path is None or self._spill_glob is None:
+            return 0
+        replayed = 0
+        for path in sorted(self._spill_path.parent.glob(self._spill_glob)):
+            replayed += self._replay_file(path)
+        with self._lock:
+            self._replayed += replayed
+        return replayed
+
+    def stats(self) -> AuditStats:
+        """Return a snapshot of the queue and writer counters."""
+
+        with self._lock:
+            return AuditStats(
+                queued=self._queue.qsize(),
+                recorded=self._recorded,
+                written=self._written,
+                spilled=self._spilled,
+                dropped=self._dropped,
+                replayed=self._replayed,
+                batches=self._batches,
+                write_failures=self._write_failures,
+            )
+
+    def list_events(
+        self,
+        session: Session,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        event_type: str | None = None,
+        subject: str | None = None,
+        cursor: tuple[datetime, int] | None = None,
+        limit: int = 100,
+    ) -> list[AuditEvent]:
+        """Return written events newest first, walking ``(occurred_at, id)`` backwards from ``cursor``."""
+
+        statement = select(AuditEvent)
+        if since is not None:
+            statement = statement.where(AuditEvent.occurred_at >= _as_utc(since))
+        if until is not None:
+            statement = statement.where(AuditEvent.occurred_at < _as_utc(until))
+        if event_type is not None:
+            statement = statement.where(AuditEvent.event_type == event_type)
+        if subject is not None:
+            statement = statement.where(AuditEvent.subject == subject)
+        if cursor is not None:
+            position = tuple_(_as_utc(cursor[0]), cursor[1])
+            statement = statement.where(tuple_(AuditEvent.occurred_at, AuditEvent.id) < position)
+        statement = statement.order_by(AuditEvent.occurred_at.desc(), AuditEvent.id.desc()).limit(limit)
+        return list(session.scalars(statement))
+
+    async def list_events_async(self, session: AsyncSession, **filters: Any) -> list[AuditEvent]:
+        """Awaitable variant of :meth:`list_events`."""
+
+        return await session.run_sync(lambda sync_session: self.list_events(sync_session, **filters))
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self) -> list[AuditRecord]:
+        # Block for the first event, then fill the batch until it is full or the interval has passed.
+        try:
+            first = self._queue.get(timeout=self._flush_interval)
+        except queue.Empty:
+            return []
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                record = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if record is None:
+                break
+            batch.append(record)
+        return batch
+
+    def _drain(self, limit: int) -> list[AuditRecord]:
+        batch: list[AuditRecord] = []
+        while len(batch) < limit:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:
+                batch.append(record)
+        return batch
+
+    def _insert(self, records: Sequence[AuditRecord]) -> bool:
+        # All chunks commit together, so a failure leaves nothing half-written.
+        with self._write_lock:
+            session = self._session_factory()
+            try:
+                for start in range(0, len(records), self._batch_size):
+                    chunk = records[start : start + self._batch_size]
+                    session.execute(insert(AuditEvent), [asdict(record) for record in chunk])
+                session.commit()
+            except SQLAlchemyError:
+                session.rollback()
+                logger.exception("Audit batch of %d events could not be written", len(records))
+                with self._lock:
+                    self._write_failures += 1
+                return False
+            finally:
+                session.close()
+        with self._lock:
+            self._written += len(records)
+            self._batches += 1
+        return True
+
+    def _write(self, batch: Sequence[AuditRecord]) -> int:
+        if not self._insert(batch):
+            self._overflow(batch)
+            return 0
+        return len(batch)
+
+    def _replay_file(self, path: Path) -> int:
+        try:
+            handle = path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return 0  # claimed by another worker
+        with handle:
+            _lock_file(handle)
+            try:
+                if os.fstat(handle.fileno()).st_nlink == 0:
+                    return 0  # replayed and removed while we waited for the lock
+                records = [_record_from_json(line) for line in handle.read().splitlines() if line.strip()]
+                if records and not self._insert(records):
+                    return 0  # keep the file for the next start
+                path.unlink()
+                return len(records)
+            finally:
+                _unlock_file(handle)
+
+    def _overflow(self, records: Iterable[AuditRecord]) -> None:
+        records = list(records)
+        spilled = False
+        if self._spill_path is not None:
+            # Never wait for the file lock while holding ``self._lock``: replay takes them the other way round.
+            with self._spill_lock:
+                try:
+                    spill_file = self._locked_spill_file()
+                    try:
+                        spill_file.writelines(_record_to_json(record) + "\n" for record in records)
+                        spill_file.flush()
+                    finally:
+                        _unlock_file(spill_file)
+                    spilled = True
+                except OSError:
+                    logger.exception("Audit spill file %s is not writable", self._spill_path)
+        with self._lock:
+            if spilled:
+                self._spilled += len(records)
+            else:
+                self._dropped += len(records)
+
+    def _locked_spill_file(self) -> IO[str]:
+        # Called with ``self._spill_lock`` held; returns the spill file locked for one append.
+        while True:
+            if self._spill_file is None:
+                self._spill_path.parent.mkdir(parents=True, exist_ok=True)  # type: ignore[union-attr]
+                self._spill_file = self._spill_path.open("a", encoding="utf-8")  # type: ignore[union-attr]
+            _lock_file(self._spill_file)
+            if os.fstat(self._spill_file.fileno()).st_nlink:
+                return self._spill_file
+            # Another worker replayed and removed the file: start a fresh one.
+            _unlock_file(self._spill_file)
+            self._spill_file.close()
+            self._spill_file = None
+
+
+def _lock_file(handle: IO[str]) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(handle: IO[str]) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _record_to_json(record: AuditRecord) -> str:
+    data = asdict(record)
+    data["occurred_at"] = record.occurred_at.isoformat()
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _record_from_json(line: str) -> AuditRecord:
+    data = json.loads(line)
+    data["occurred_at"] = datetime.fromisoformat(data["occurred_at"])
+    return AuditRecord(**data)
+
+
+_AUDIT_FAMILIES = (
+    ("audit_queue_depth", "Audit events waiting for the writer.", "gauge", "queued"),
+    ("audit_events_recorded_total", "Audit events accepted into the queue.", "counter", "recorded"),
+    ("audit_events_written_total", "Audit events inserted into the audit table.", "counter", "written"),
+    ("audit_events_spilled_total", "Audit events appended to the spill file.", "counter", "spilled"),
+    ("audit_events_dropped_total", "Audit events lost to overload or write failures.", "counter", "dropped"),
+    ("audit_write_failures_total", "Audit batches that failed to insert.", "counter", "write_failures"),
+)
+
+
+def audit_metric_lines() -> list[str]:
+    """Render :meth:`AuditLog.stats` of the process-wide audit log for the metrics endpoint."""
+
+    stats = audit_log.stats()
+    lines: list[str] = []
+    for name, help_text, kind, attribute in _AUDIT_FAMILIES:
+        lines += format_family(name, help_text, kind, [({}, getattr(stats, attribute))])
+    return lines
+
+
+def _spill_path() -> Path | None:
+    # ``{pid}`` keeps the spill files of several workers on one host apart.
+    if not settings.audit_spill_path:
+        return None
+    return Path(settings.audit_spill_path.format(pid=os.getpid()))
+
+
+def _spill_glob() -> str | None:
+    # Replay matches every worker's file, including those of processes that are gone.
+    if not settings.audit_spill_path:
+        return None
+    return Path(settings.audit_spill_path).name.replace("{pid}", "*")
+
+
+audit_log = AuditLog(
+    SessionLocal,
+    enabled=settings.audit_enabled,
+    queue_size=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval_seconds=settings.audit_flush_interval_seconds,
+    spill_path=_spill_path(),
+    spill_glob=_spill_glob(),
+)
+
+
+def get_audit_log() -> AuditLog:
+    """FastAPI dependency returning the process-wide audit log."""
+
+    return audit_log
+
+
+__all__ = [
+    "ACCESS_DENIED",
+    "LOGIN",
+    "LOGIN_FAILED",
+    "LOGOUT",
+    "REFRESH",
+    "REFRESH_FAILED",
+    "AuditLog",
+    "AuditRecord",
+    "AuditStats",
+    "audit_log",
+    "audit_metric_lines",
+    "decode_cursor",
+    "encode_cursor",
+    "get_audit_log",
+]
@@ -3,13 +3,25 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Any
+import hashlib
+import secrets
+import time
+from typing import Any, Sequence
 from uuid import uuid4
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
+from src.app.core.cache import CacheStats, TTLCache
 from src.app.core.config import settings
+from src.app.services.hashing import PasswordHasher, password_hasher
+from src.app.services.keys import KeyRegistry, key_registry
+from src.app.services.revocation import TokenDenylist, token_denylist
+
+
+_COMPACT_TYPES = {"access": "a"}
+_EXPANDED_TYPES = {short: name for name, short in _COMPACT_TYPES.items()}
+# 9 random bytes encode to a 12-character jti: plenty for tokens living minutes.
+_COMPACT_JTI_BYTES = 9
 
 
 class AuthError(RuntimeError):
@@ -17,20 +29,66 @@ class AuthError(RuntimeError):
 
 
 class AuthService:
-    """Provide password hashing and JWT helpers."""
+    """Provide password hashing and JWT helpers.
+
+    Tokens are signed with ``settings.jwt_secret`` unless a :class:`KeyRegistry`
+    is given, in which case they are signed with its active key and carry its
+    ``kid`` header.
+    """
+
+    def __init__(
+        self,
+        token_cache: TTLCache[bytes, dict[str, Any]] | None = None,
+        hasher: PasswordHasher | None = None,
+        denylist: TokenDenylist | None = None,
+        keys: KeyRegistry | None = None,
+    ) -> None:
+        self._token_cache = token_cache
+        self._hasher = hasher or password_hasher
+        self._denylist = denylist if denylist is not None else token_denylist
+        self._keys = keys
+
+    def token_cache_stats(self) -> CacheStats | None:
+        """Return verified-token cache counters, or ``None`` when caching is disabled."""
 
-    def __init__(self) -> None:
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        return self._token_cache.stats() if self._token_cache is not None else None
 
     def hash_password(self, password: str) -> str:
         """Return a bcrypt hash for the provided password."""
 
-        return self._pwd_context.hash(password)
+        return self._hasher.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify that the provided password matches the stored hash."""
 
-        return self._pwd_context.verify(plain_password, hashed_password)
+        return self._hasher.verify(plain_password, hashed_password)
+
+    def hash_passwords(self, passwords: Sequence[str]) -> list[str]:
+        """Return bcrypt hashes for ``passwords``, computed in parallel."""
+
+        return self._hasher.hash_many(passwords)
+
+    async def hash_passwords_async(self, passwords: Sequence[str]) -> list[str]:
+        """Awaitable variant of :meth:`hash_passwords`."""
+
+        return await self._hasher.hash_many_async(passwords)
+
+    async def hash_password_async(self, password: str) -> str:
+        """Awaitable variant of :meth:`hash_password`."""
+
+        return await self._hasher.hash_async(password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Awaitable variant of :meth:`verify_password`."""
+
+        return await self._hasher.verify_async(plain_password, hashed_password)
+
+    async def verify_and_update_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify the password; the second item is a new hash when the stored bcrypt cost is outdated."""
+
+        return await self._hasher.verify_and_update_async(plain_password, hashed_password)
 
     def _create_token(
         self,
@@ -50,13 +108,49 @@ class AuthService:
         }
         if payload:
             to_encode.update(payload)
-        return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+        return self._sign(to_encode)
+
+    def _sign(self, claims: dict[str, Any]) -> str:
+        if self._keys is None:
+            return jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+        signing_key = self._keys.signing_key()
+        return jwt.encode(
+            claims,
+            signing_key.private,
+            algorithm=signing_key.algorithm,
+            headers={"kid": signing_key.kid},
+        )
+
+    def create_access_token(
+        self,
+        subject: str,
+        roles: list[str],
+        permission_mask: int | None = None,
+    ) -> str:
+        """Generate an access token embedding the user roles and, optionally, the permission mask.
 
-    def create_access_token(self, subject: str, roles: list[str]) -> str:
-        """Generate an access token embedding the user roles."""
+        With ``JWT_TOKEN_PROFILE=compact`` the token carries only ``sub``,
+        ``exp``, ``t``, a 12-character ``jti`` (so logout can still revoke it)
+        and the ``pm`` bitmask; role names and ``iat`` are left out. Roles are
+        always resolved from the principal, never the token.
+        """
 
         expires = timedelta(minutes=settings.access_token_expire_minutes)
-        return self._create_token(subject, "access", expires, {"roles": roles})
+        if settings.jwt_token_profile == "compact":
+            claims: dict[str, Any] = {
+                "sub": subject,
+                "t": _COMPACT_TYPES["access"],
+                "exp": int(time.time() + expires.total_seconds()),
+                "jti": secrets.token_urlsafe(_COMPACT_JTI_BYTES),
+            }
+            if permission_mask is not None:
+                claims["pm"] = permission_mask
+            return self._sign(claims)
+
+        claims = {"roles": roles}
+        if permission_mask is not None:
+            claims["pm"] = permission_mask
+        return self._create_token(subject, "access", expires, claims)
 
     def create_refresh_token(self, subject: str) -> str:
         """Generate a refresh token for the provided subject."""
@@ -65,12 +159,29 @@ class AuthService:
         return self._create_token(subject, "refresh", expires)
 
     def decode_token(self, token: str, expected_type: str | None = None) -> dict[str, Any]:
-        """Decode a JWT token and optionally validate its type."""
-
-        try:
-            payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        except JWTError as exc:  # pragma: no cover - jose raises multiple subclasses we treat the same way
-            raise AuthError("Invalid token") from exc
+        """Decode a JWT token and optionally validate its type.
+
+        When the verified-token cache is enabled, a token seen before is served
+        from the cache without re-checking its signature until its ``exp``.
+        Revoked ``jti`` values are rejected from the in-process denylist.
+        """
+
+        cache = self._token_cache
+        if cache is None:
+            payload = self._verify_token(token)
+        else:
+            cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+            cached = cache.get(cache_key)
+            if cached is None:
+                payload = self._verify_token(token)
+                exp = payload.get("exp")
+                if isinstance(exp, (int, float)):
+                    cache.set(cache_key, dict(payload), float(exp))
+            else:
+                payload = dict(cached)
+
+        if payload.get("jti") in self._denylist:
+            raise AuthError("Token revoked")
 
         token_type = payload.get("type")
         if expected_type and token_type != expected_type:
@@ -78,15 +189,44 @@ class AuthService:
 
         return payload
 
-    def create_token_pair(self, subject: str, roles: list[str]) -> dict[str, str]:
+    def _verify_token(self, token: str) -> dict[str, Any]:
+        try:
+            if self._keys is None:
+                payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+            else:
+                key = self._keys.verification_key(jwt.get_unverified_header(token).get("kid"))
+                if key is None:
+                    raise AuthError("Unknown signing key")
+                payload = jwt.decode(token, key.public, algorithms=[key.algorithm])
+        except JWTError as exc:  # pragma: no cover - jose raises multiple subclasses we treat the same way
+            raise AuthError("Invalid token") from exc
+        compact_type = payload.pop("t", None)
+        if compact_type is not None:
+            # Both profiles are accepted so tokens issued before a switch stay valid.
+            payload["type"] = _EXPANDED_TYPES.get(compact_type)
+        return payload
+
+    def create_token_pair(
+        self,
+        subject: str,
+        roles: list[str],
+        permission_mask: int | None = None,
+    ) -> dict[str, str]:
         """Return a pair of access and refresh tokens."""
 
-        access = self.create_access_token(subject, roles)
+        access = self.create_access_token(subject, roles, permission_mask)
         refresh = self.create_refresh_token(subject)
         return {"access_token": access, "refresh_token": refresh, "token_type": "bearer"}
 
 
-auth_service = AuthService()
+def _build_token_cache() -> TTLCache[bytes, dict[str, Any]] | None:
+    if not settings.token_cache_enabled:
+        return None
+    # Entries expire on the token's own ``exp`` claim, which is wall-clock based.
+    return TTLCache(settings.token_cache_size, clock=time.time)
+
+
+auth_service = AuthService(token_cache=_build_token_cache(), keys=key_registry)
 
 
 __all__ = ["AuthError", "AuthService", "auth_service"]
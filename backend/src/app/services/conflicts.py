@@ -0,0 +1,187 @@
+"""Planning conflict detection: double-booked technicians and short rest periods.
+
+:func:`find_conflicts` sorts the planning once by technician and start time,
+then sweeps each technician's assignments in order while keeping a min-heap
+of the assignments still running, keyed by their end. When an assignment
+starts, it overlaps exactly the heap entries that have not ended yet, so the
+sweep costs O(n log n) plus one step per reported conflict instead of
+comparing every pair. The same pass tracks the assignment that ended last:
+one starting after it but within ``min_rest`` is a rest-period violation.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from heapq import heappop, heappush
+from itertools import groupby
+from operator import attrgetter
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.app.models import Assignment
+
+DOUBLE_BOOKING = "double_booking"
+REST_PERIOD = "rest_period"
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedAssignment:
+    """The part of an :class:`~src.app.models.Assignment` the conflict sweep needs."""
+
+    id: int
+    technician_id: int
+    mission_id: int
+    start_at: datetime
+    end_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class Conflict:
+    """Two assignments of one technician that collide.
+
+    For a double booking ``[start_at, end_at)`` is the overlap; for a rest
+    period it is the too-short gap between the two assignments.
+    """
+
+    kind: str
+    technician_id: int
+    first_assignment_id: int
+    second_assignment_id: int
+    start_at: datetime
+    end_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class PlanningCheck:
+    """Conflicts found in one planning window."""
+
+    start_at: datetime
+    end_at: datetime
+    assignments: int
+    conflicts: list[Conflict]
+
+
+_SWEEP_ORDER = attrgetter("technician_id", "start_at", "end_at", "id")
+
+
+def find_conflicts(
+    planning: Iterable[PlannedAssignment],
+    *,
+    min_rest: timedelta = timedelta(hours=11),
+) -> list[Conflict]:
+    """Return every double booking and rest-period violation in ``planning``.
+
+    Assignments are half-open intervals, so one ending exactly when the next
+    starts is not a double booking (but is a rest violation when ``min_rest``
+    is positive). Conflicts come out grouped by technician, in start order.
+    Raises :class:`ValueError` for an assignment that does not end after it starts.
+    """
+
+    conflicts: list[Conflict] = []
+    for technician_id, assignments in groupby(sorted(planning, key=_SWEEP_ORDER), key=attrgetter("technician_id")):
+        running: list[tuple[datetime, int, PlannedAssignment]] = []
+        latest: PlannedAssignment | None = None
+        for current in assignments:
+            start_at = current.start_at
+            if current.end_at <= start_at:
+                raise ValueError(f"assignment {current.id} ends before it starts")
+            while running and running[0][0] <= start_at:
+                heappop(running)
+            for end_at, _, other in running:
+                conflicts.append(
+                    Conflict(DOUBLE_BOOKING, technician_id, other.id, current.id, start_at, min(end_at, current.end_at))
+                )
+            # Anything still running ends after ``start_at``, so only a clean gap can be too short.
+            if latest is not None and latest.end_at <= start_at and start_at - latest.end_at < min_rest:
+                conflicts.append(Conflict(REST_PERIOD, technician_id, latest.id, current.id, latest.end_at, start_at))
+            heappush(running, (current.end_at, current.id, current))
+            if latest is None or current.end_at > latest.end_at:
+                latest = current
+    return conflicts
+
+
+def week_bounds(day: date) -> tuple[datetime, datetime]:
+    """Return the UTC Monday-to-Monday window containing ``day``."""
+
+    monday = day - timedelta(days=day.weekday())
+    start_at = datetime.combine(monday, time.min, tzinfo=timezone.utc)
+    return start_at, start_at + timedelta(days=7)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive; every stored value is UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _within(conflict: Conflict, start_at: datetime, end_at: datetime) -> bool:
+    # Half-open windows; a zero-length gap (back-to-back assignments) sits at its single instant.
+    if conflict.start_at == conflict.end_at:
+        return start_at <= conflict.start_at < end_at
+    return conflict.start_at < end_at and conflict.end_at > start_at
+
+
+def load_planning(session: Session, start_at: datetime, end_at: datetime) -> list[PlannedAssignment]:
+    """Return the assignments overlapping ``[start_at, end_at)`` without building ORM objects."""
+
+    statement = select(
+        Assignment.id, Assignment.user_id, Assignment.mission_id, Assignment.start_at, Assignment.end_at
+    ).where(Assignment.start_at < end_at, Assignment.end_at > start_at)
+    rows = session.execute(statement)
+    return [
+        PlannedAssignment(assignment_id, user_id, mission_id, _as_utc(starts), _as_utc(ends))
+        for assignment_id, user_id, mission_id, starts, ends in rows
+    ]
+
+
+def check_planning(
+    session: Session,
+    start_at: datetime,
+    end_at: datetime,
+    *,
+    min_rest: timedelta = timedelta(hours=11),
+) -> PlanningCheck:
+    """Find the conflicts touching ``[start_at, end_at)``.
+
+    Assignments up to ``min_rest`` outside the window are loaded too, so a
+    short rest across the window's edges (Sunday night to Monday morning) is
+    still reported; conflicts lying wholly outside the window are not.
+    """
+
+    planning = load_planning(session, start_at - min_rest, end_at + min_rest)
+    conflicts = [
+        conflict for conflict in find_conflicts(planning, min_rest=min_rest) if _within(conflict, start_at, end_at)
+    ]
+    in_window = sum(1 for assignment in planning if assignment.start_at < end_at and assignment.end_at > start_at)
+    return PlanningCheck(start_at, end_at, in_window, conflicts)
+
+
+async def check_planning_async(
+    session: AsyncSession,
+    start_at: datetime,
+    end_at: datetime,
+    *,
+    min_rest: timedelta = timedelta(hours=11),
+) -> PlanningCheck:
+    """Awaitable variant of :func:`check_planning`."""
+
+    return await session.run_sync(
+        lambda sync_session: check_planning(sync_session, start_at, end_at, min_rest=min_rest)
+    )
+
+
+__all__ = [
+    "DOUBLE_BOOKING",
+    "REST_PERIOD",
+    "Conflict",
+    "PlannedAssignment",
+    "PlanningCheck",
+    "check_planning",
+    "check_planning_async",
+    "find_conflicts",
+    "load_planning",
+    "week_bounds",
+]
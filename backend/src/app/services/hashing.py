@@ -0,0 +1,351 @@
+"""Bounded executor for bcrypt password hashing and verification."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+import multiprocessing
+import os
+from threading import Lock
+import time
+from typing import Any, Callable, TypeVar
+
+from passlib.context import CryptContext
+
+from src.app.core.config import settings
+
+T = TypeVar("T")
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+# Passwords per batch job: a login queued behind an import waits for at most one chunk.
+BATCH_CHUNK_SIZE = 4
+
+_pwd_contexts: dict[int, CryptContext] = {}
+
+
+def _context(rounds: int) -> CryptContext:
+    # Built lazily so each pool worker process owns its own contexts.
+    context = _pwd_contexts.get(rounds)
+    if context is None:
+        context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        _pwd_contexts[rounds] = context
+    return context
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str, rounds: int) -> bool:
+    return _context(rounds).verify(plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    # One job: the rehash reuses the worker that already verified the password.
+    return _context(rounds).verify_and_update(plain_password, hashed_password)
+
+
+def _hash_batch(passwords: list[str], rounds: int) -> list[str]:
+    return [_hash(password, rounds) for password in passwords]
+
+
+def _chunks(items: Sequence[str], size: int) -> list[list[str]]:
+    return [list(items[start : start + size]) for start in range(0, len(items), size)]
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing queue is full and the request should be retried later."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class HasherStats:
+    """Point-in-time counters exposed by :class:`PasswordHasher`."""
+
+    workers: int
+    queue_limit: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    total_seconds: float
+    max_seconds: float
+
+    @property
+    def mean_seconds(self) -> float:
+        """Return the mean hash/verify latency (``0.0`` when unused)."""
+
+        return self.total_seconds / self.completed if self.completed else 0.0
+
+
+class PasswordHasher:
+    """Run bcrypt work on a dedicated process pool with a bounded admission queue.
+
+    ``workers=0`` runs the work inline in the calling thread (in the event
+    loop's default thread pool for the ``*_async`` variants) while keeping the
+    admission limit and metrics; the test suite uses it to avoid spawning pools.
+    New hashes use ``rounds`` (the bcrypt cost); hashes stored with another
+    cost are reported by :meth:`verify_and_update` so callers can replace them.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, retry_after_seconds: int = 1, rounds: int = 12) -> None:
+        if queue_limit <= 0:
+            raise ValueError("queue_limit must be positive")
+        if not MIN_ROUNDS <= rounds <= MAX_ROUNDS:
+            raise ValueError(f"rounds must be between {MIN_ROUNDS} and {MAX_ROUNDS}")
+        self._workers = workers
+        self._rounds = rounds
+        self._queue_limit = queue_limit
+        self._retry_after = retry_after_seconds
+        self._executor: Executor | None = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self._in_default_executor = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    @property
+    def rounds(self) -> int:
+        """Return the bcrypt cost used for new hashes."""
+
+        return self._rounds
+
+    def hash(self, password: str) -> str:
+        """Return a bcrypt hash for ``password``."""
+
+        return self._run(_hash, password, self._rounds)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify ``plain_password`` against ``hashed_password``."""
+
+        return self._run(_verify, plain_password, hashed_password, self._rounds)
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Verify the password and, when the stored cost differs from ``rounds``, return a replacement hash."""
+
+        return self._run(_verify_and_update, plain_password, hashed_password, self._rounds)
+
+    async def hash_async(self, password: str) -> str:
+        """Awaitable variant of :meth:`hash` that never blocks the event loop."""
+
+        return await self._run_async(_hash, password, self._rounds)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Awaitable variant of :meth:`verify` that never blocks the event loop."""
+
+        return await self._run_async(_verify, plain_password, hashed_password, self._rounds)
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Awaitable variant of :meth:`verify_and_update` that never blocks the event loop."""
+
+        return await self._run_async(_verify_and_update, plain_password, hashed_password, self._rounds)
+
+    def hash_many(self, passwords: Sequence[str]) -> list[str]:
+        """Hash ``passwords`` in parallel, in order, holding one admission slot per chunk in flight.
+
+        Chunks are submitted only while slots are free and never more than the
+        pool can run at once, so concurrent logins are still admitted (or shed)
+        and wait behind at most one chunk.
+        """
+
+        if not passwords:
+            return []
+        chunks = _chunks(passwords, BATCH_CHUNK_SIZE)
+        results: list[list[str]] = [[] for _ in chunks]
+        pending: dict[Future[list[str]], int] = {}
+        started = time.perf_counter()
+        with self._slot(), self._batch_executor() as (executor, parallelism):
+            held, submitted = 1, 0
+            try:
+                while submitted < len(chunks) or pending:
+                    while submitted < len(chunks) and len(pending) < parallelism:
+                        if len(pending) == held:
+                            if not self._try_acquire():
+                                break
+                            held += 1
+                        pending[executor.submit(_hash_batch, chunks[submitted], self._rounds)] = submitted
+                        submitted += 1
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+                    held = self._release_surplus(held, len(pending))
+            finally:
+                for future in pending:
+                    future.cancel()
+                self._release(held - 1)
+        self._record_batch(time.perf_counter() - started, len(passwords))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def hash_many_async(self, passwords: Sequence[str]) -> list[str]:
+        """Awaitable variant of :meth:`hash_many`."""
+
+        if not passwords:
+            return []
+        chunks = _chunks(passwords, BATCH_CHUNK_SIZE)
+        results: list[list[str]] = [[] for _ in chunks]
+        pending: dict[asyncio.Future[list[str]], int] = {}
+        started = time.perf_counter()
+        with self._slot(), self._batch_executor() as (executor, parallelism):
+            held, submitted = 1, 0
+            try:
+                while submitted < len(chunks) or pending:
+                    while submitted < len(chunks) and len(pending) < parallelism:
+                        if len(pending) == held:
+                            if not self._try_acquire():
+                                break
+                            held += 1
+                        future = asyncio.wrap_future(executor.submit(_hash_batch, chunks[submitted], self._rounds))
+                        pending[future] = submitted
+                        submitted += 1
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+                    held = self._release_surplus(held, len(pending))
+            finally:
+                for future in pending:
+                    future.cancel()
+                self._release(held - 1)
+        self._record_batch(time.perf_counter() - started, len(passwords))
+        return [hashed for chunk in results for hashed in chunk]
+
+    def stats(self) -> HasherStats:
+        """Return a snapshot of queue depth and latency counters."""
+
+        with self._lock:
+            return HasherStats(
+                workers=self._workers,
+                queue_limit=self._queue_limit,
+                in_flight=self._in_flight,
+                queue_depth=self._queue_depth(),
+                completed=self._completed,
+                rejected=self._rejected,
+                total_seconds=self._total_seconds,
+                max_seconds=self._max_seconds,
+            )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; a later call transparently starts a new pool."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        with self._lock:
+            if self._in_flight >= self._queue_limit:
+                self._rejected += 1
+                raise PasswordHasherBusy(self._retry_after)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _try_acquire(self) -> bool:
+        # Non-raising admission for the extra slots a batch takes while they are free.
+        with self._lock:
+            if self._in_flight >= self._queue_limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self, count: int) -> None:
+        if count > 0:
+            with self._lock:
+                self._in_flight -= count
+
+    def _release_surplus(self, held: int, running: int) -> int:
+        # Keep the slot owned by _slot() plus one per running chunk; hand the rest back.
+        keep = max(1, running)
+        self._release(held - keep)
+        return min(held, keep)
+
+    @contextmanager
+    def _batch_executor(self) -> Iterator[tuple[Executor, int]]:
+        executor = self._get_executor()
+        if executor is not None:
+            yield executor, self._workers
+            return
+        # bcrypt releases the GIL, so threads still hash in parallel without a pool.
+        threads = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            yield pool, threads
+
+    def _queue_depth(self) -> int:
+        if self._workers > 0:
+            return max(0, self._in_flight - self._workers)
+        # Sync callers and batches already run on their own threads (anyio's pool, the batch pool); only
+        # *_async jobs can wait, for a thread of asyncio's default executor (ThreadPoolExecutor's default size).
+        return max(0, self._in_default_executor - min(32, (os.cpu_count() or 1) + 4))
+
+    def _get_executor(self) -> Executor | None:
+        if self._workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the server process already runs threads (audit writer, anyio workers).
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _record(self, elapsed: float) -> None:
+        with self._lock:
+            self._completed += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    def _record_batch(self, elapsed: float, count: int) -> None:
+        # A batch's wall time covers many parallel hashes, so it says nothing about the slowest single job.
+        with self._lock:
+            self._completed += count
+            self._total_seconds += elapsed
+
+    def _run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._slot():
+            started = time.perf_counter()
+            executor = self._get_executor()
+            result = func(*args) if executor is None else executor.submit(func, *args).result()
+            self._record(time.perf_counter() - started)
+        return result
+
+    async def _run_async(self, func: Callable[..., T], *args: Any) -> T:
+        with self._slot():
+            started = time.perf_counter()
+            executor = self._get_executor()
+            if executor is None:
+                with self._lock:
+                    self._in_default_executor += 1
+                try:
+                    result = await asyncio.to_thread(func, *args)
+                finally:
+                    with self._lock:
+                        self._in_default_executor -= 1
+            else:
+                result = await asyncio.wrap_future(executor.submit(func, *args))
+            self._record(time.perf_counter() - started)
+        return result
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    queue_limit=settings.password_hash_queue_limit,
+    retry_after_seconds=settings.password_hash_retry_after_seconds,
+    rounds=settings.password_hash_rounds,
+)
+
+
+__all__ = ["MAX_ROUNDS", "MIN_ROUNDS", "HasherStats", "PasswordHasher", "PasswordHasherBusy", "password_hasher"]
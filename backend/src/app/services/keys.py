@@ -0,0 +1,208 @@
+"""Asymmetric JWT signing keys and the published JSON Web Key Set.
+
+Keys are PEM files named ``<kid>.pem`` in ``settings.jwt_keys_dir``. The key
+named by ``settings.jwt_active_kid`` signs new tokens; every key in the
+directory, private or public-only, stays valid for verification and is
+published in the JWKS. Rotating is therefore: add the new key file, switch
+the active kid, and delete the old file once its tokens have expired.
+
+Each worker re-reads the directory when its ``*.pem`` files change, checked
+at most every ``settings.jwt_keys_reload_seconds``, so a key added to every
+node becomes valid for verification (and appears in the JWKS) without a
+restart.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Any, Callable
+
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+from src.app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = frozenset({"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"})
+
+
+class KeyConfigurationError(RuntimeError):
+    """Raised when the signing keys cannot be loaded."""
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    """A parsed key; ``private`` is ``None`` for verification-only keys."""
+
+    kid: str
+    algorithm: str
+    public: Key
+    private: Key | None
+
+    def public_jwk(self) -> dict[str, Any]:
+        """Return the public half as a JWK entry."""
+
+        data = {name: _text(value) for name, value in self.public.to_dict().items()}
+        data.update(kid=self.kid, use="sig", alg=self.algorithm)
+        return data
+
+
+def _text(value: Any) -> Any:
+    return value.decode("ascii") if isinstance(value, bytes) else value
+
+
+@dataclass(frozen=True, slots=True)
+class _KeySet:
+    active: SigningKey
+    by_kid: dict[str, SigningKey]
+    jwks_body: bytes
+    etag: str
+
+
+def _parse_key(path: Path, algorithm: str) -> SigningKey:
+    try:
+        key = jwk.construct(path.read_text(encoding="ascii"), algorithm)
+    except (OSError, JWKError, ValueError) as exc:
+        raise KeyConfigurationError(f"Cannot load signing key {path}: {exc}") from exc
+    if key.is_public():
+        return SigningKey(kid=path.stem, algorithm=algorithm, public=key, private=None)
+    return SigningKey(kid=path.stem, algorithm=algorithm, public=key.public_key(), private=key)
+
+
+class KeyRegistry:
+    """Parsed signing keys, cached until :meth:`reload` swaps in a new set atomically.
+
+    With ``reload_seconds`` above zero, lookups also reload the set once the
+    key files' names, sizes or modification times change; a directory that
+    fails to load keeps the previous set.
+    """
+
+    def __init__(
+        self,
+        keys_dir: Path,
+        active_kid: str,
+        algorithm: str,
+        *,
+        reload_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise KeyConfigurationError(f"Unsupported asymmetric algorithm: {algorithm}")
+        self._keys_dir = keys_dir
+        self._active_kid = active_kid
+        self._algorithm = algorithm
+        self._reload_seconds = reload_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._fingerprint = self._files()
+        self._keys = self._load()
+        self._next_check = clock() + reload_seconds
+
+    @property
+    def algorithm(self) -> str:
+        """Return the JWS algorithm shared by every key."""
+
+        return self._algorithm
+
+    def signing_key(self) -> SigningKey:
+        """Return the key that signs new tokens."""
+
+        return self._current().active
+
+    def verification_key(self, kid: str | None) -> SigningKey | None:
+        """Return the key for ``kid``, or ``None`` when it is unknown."""
+
+        return self._current().by_kid.get(kid) if kid else None
+
+    def jwks(self) -> tuple[bytes, str]:
+        """Return the serialised JWKS document and its strong ETag."""
+
+        keys = self._current()
+        return keys.jwks_body, keys.etag
+
+    def reload(self, active_kid: str | None = None) -> None:
+        """Re-read the key directory, optionally switching the active key."""
+
+        with self._lock:
+            if active_kid is not None:
+                self._active_kid = active_kid
+            self._fingerprint = self._files()
+            self._keys = self._load()
+
+    def _current(self) -> _KeySet:
+        if self._reload_seconds > 0 and self._clock() >= self._next_check:
+            self._reload_if_changed()
+        return self._keys
+
+    def _reload_if_changed(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if now < self._next_check:
+                return
+            self._next_check = now + self._reload_seconds
+            fingerprint = self._files()
+            if fingerprint == self._fingerprint:
+                return
+            try:
+                self._keys = self._load()
+            except KeyConfigurationError:
+                # Likely a rotation in progress; keep serving the previous keys and retry next time.
+                logger.exception("Signing keys in %s could not be reloaded", self._keys_dir)
+                return
+            self._fingerprint = fingerprint
+            logger.info("Reloaded signing keys from %s", self._keys_dir)
+
+    def _files(self) -> tuple[tuple[str, int, int], ...]:
+        try:
+            stats = [(path.name, path.stat()) for path in self._keys_dir.glob("*.pem")]
+        except OSError:
+            return ()
+        return tuple(sorted((name, stat.st_size, stat.st_mtime_ns) for name, stat in stats))
+
+    def _load(self) -> _KeySet:
+        if not self._keys_dir.is_dir():
+            raise KeyConfigurationError(f"JWT keys directory not found: {self._keys_dir}")
+        by_kid = {path.stem: _parse_key(path, self._algorithm) for path in sorted(self._keys_dir.glob("*.pem"))}
+        active = by_kid.get(self._active_kid)
+        if active is None or active.private is None:
+            raise KeyConfigurationError(f"Active key {self._active_kid!r} has no private key in {self._keys_dir}")
+        document = {"keys": [key.public_jwk() for key in by_kid.values()]}
+        body = json.dumps(document, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return _KeySet(active=active, by_kid=by_kid, jwks_body=body, etag=etag)
+
+
+def load_key_registry(config: Settings) -> KeyRegistry | None:
+    """Return the registry for asymmetric algorithms, or ``None`` for shared-secret HMAC signing."""
+
+    if config.jwt_algorithm.upper().startswith("HS"):
+        return None
+    if not config.jwt_keys_dir or not config.jwt_active_kid:
+        raise KeyConfigurationError("JWT_KEYS_DIR and JWT_ACTIVE_KID are required for asymmetric signing")
+    return KeyRegistry(
+        Path(config.jwt_keys_dir),
+        config.jwt_active_kid,
+        config.jwt_algorithm.upper(),
+        reload_seconds=config.jwt_keys_reload_seconds,
+    )
+
+
+key_registry = load_key_registry(settings)
+
+
+__all__ = [
+    "ASYMMETRIC_ALGORITHMS",
+    "KeyConfigurationError",
+    "KeyRegistry",
+    "SigningKey",
+    "key_registry",
+    "load_key_registry",
+]
@@ -0,0 +1,138 @@
+"""Compiled RBAC permission bitmasks.
+
+Each permission owns the bit ``1 << Permission.id``. Ids are assigned by the
+database, so masks are stable across workers and restarts and can be embedded
+in access tokens.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.app.models import Permission
+from src.app.services.users import user_service
+
+
+def permission_bit(permission_id: int) -> int:
+    """Return the mask bit owned by the permission with ``permission_id``."""
+
+    return 1 << permission_id
+
+
+def mask_of(permission_ids: Iterable[int]) -> int:
+    """Fold permission ids into a single bitmask."""
+
+    mask = 0
+    for permission_id in permission_ids:
+        mask |= 1 << permission_id
+    return mask
+
+
+def has_permissions(granted: int, required: int) -> bool:
+    """Return ``True`` when every bit of ``required`` is present in ``granted``."""
+
+    return granted & required == required
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledCatalog:
+    """Immutable name-to-bit lookup table produced by :class:`PermissionEngine`."""
+
+    version: int = 0
+    permission_bits: dict[str, int] = field(default_factory=dict)
+
+
+class PermissionEngine:
+    """Compile permission names into the mask bits that :func:`require_permissions` checks.
+
+    The catalog is compiled at startup and marked stale whenever
+    :class:`UserService` reports a catalog-wide change; the next caller holding
+    a session recompiles it.
+    """
+
+    def __init__(self) -> None:
+        self._catalog = CompiledCatalog()
+        self._stale = True
+        self._invalidations = 0
+        self._lock = Lock()
+
+    @property
+    def catalog(self) -> CompiledCatalog:
+        """Return the current compiled catalog."""
+
+        return self._catalog
+
+    @property
+    def is_stale(self) -> bool:
+        """Return whether the catalog must be recompiled before use."""
+
+        return self._stale
+
+    def invalidate(self) -> None:
+        """Mark the compiled catalog as stale."""
+
+        with self._lock:
+            self._invalidations += 1
+            self._stale = True
+
+    def compile(self, session: Session) -> CompiledCatalog:
+        """Load the permissions in one query and rebuild the name-to-bit table.
+
+        Granted masks come from each principal's effective permissions (or the
+        token), so only the bits of required permissions are compiled here.
+        """
+
+        invalidations = self._invalidations
+        permissions = session.execute(select(Permission.id, Permission.name)).all()
+        permission_bits = {name: permission_bit(permission_id) for permission_id, name in permissions}
+
+        with self._lock:
+            self._catalog = CompiledCatalog(version=self._catalog.version + 1, permission_bits=permission_bits)
+            # A change reported while loading keeps the catalog stale.
+            self._stale = invalidations != self._invalidations
+            return self._catalog
+
+    async def ensure_compiled_async(self, session: AsyncSession) -> CompiledCatalog:
+        """Return the catalog, recompiling it through ``session`` first when stale."""
+
+        if self._stale:
+            return await session.run_sync(self.compile)
+        return self._catalog
+
+    def required_mask(self, names: Iterable[str]) -> int | None:
+        """Return the mask for ``names``, or ``None`` when one of them is unknown."""
+
+        bits = self._catalog.permission_bits
+        mask = 0
+        for name in names:
+            bit = bits.get(name)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+
+def _on_user_change(email: str | None) -> None:
+    # Only catalog-wide changes can add or remove permissions.
+    if email is None:
+        permission_engine.invalidate()
+
+
+permission_engine = PermissionEngine()
+user_service.add_change_listener(_on_user_change)
+
+
+__all__ = [
+    "CompiledCatalog",
+    "PermissionEngine",
+    "has_permissions",
+    "mask_of",
+    "permission_bit",
+    "permission_engine",
+]
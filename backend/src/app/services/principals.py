@@ -0,0 +1,126 @@
+"""Authenticated principal snapshots and their in-process cache."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+import time
+from typing import Callable, Iterable
+
+from src.app.core.cache import CacheStats, TTLCache
+from src.app.core.config import settings
+from src.app.models import User
+from src.app.services.permissions import mask_of
+from src.app.services.users import user_service
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Immutable view of an authenticated user used for authorisation checks.
+
+    ``roles`` holds the effective role names (assigned plus inherited) that
+    authorisation checks use; ``assigned_roles`` only the directly assigned ones.
+    """
+
+    id: int
+    email: str
+    is_active: bool
+    roles: tuple[str, ...]
+    permissions: frozenset[str]
+    permission_mask: int = 0
+    version: int = 0
+    assigned_roles: tuple[str, ...] = ()
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Snapshot ``user`` (loaded ``with_access``) with its inherited roles and permissions."""
+
+        roles = tuple(sorted(role.name for role in user.effective_roles))
+        granted = {permission.id: permission.name for permission in user.effective_permissions}
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            roles=roles,
+            permissions=frozenset(granted.values()),
+            permission_mask=mask_of(granted),
+            version=user.version,
+            assigned_roles=tuple(sorted(role.name for role in user.roles)),
+        )
+
+    def has_any_role(self, roles: Iterable[str]) -> bool:
+        """Return ``True`` when the principal owns at least one of ``roles`` (case-insensitive)."""
+
+        owned = {role.lower() for role in self.roles}
+        return not owned.isdisjoint(role.lower() for role in roles)
+
+
+class PrincipalCache:
+    """TTL-bounded principal cache keyed by email and invalidated on user changes.
+
+    A generation counter guards against a request that loaded a principal
+    before an invalidation re-inserting the stale snapshot afterwards.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._cache: TTLCache[str, Principal] = TTLCache(max_size, clock=clock)
+        self._generation = 0
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether entries are retained at all."""
+
+        return self._ttl > 0
+
+    @property
+    def generation(self) -> int:
+        """Return the current invalidation generation; pass it back to :meth:`put`."""
+
+        with self._lock:
+            return self._generation
+
+    def get(self, email: str) -> Principal | None:
+        """Return the cached principal for ``email`` if present and fresh."""
+
+        if not self.enabled:
+            return None
+        return self._cache.get(email)
+
+    def put(self, principal: Principal, generation: int) -> None:
+        """Cache ``principal`` unless an invalidation happened since ``generation`` was read."""
+
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._cache.set(principal.email, principal, self._cache.now() + self._ttl)
+
+    def invalidate(self, email: str | None = None) -> None:
+        """Drop the entry for ``email``, or every entry when ``email`` is ``None``."""
+
+        with self._lock:
+            self._generation += 1
+            if email is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(email)
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters for the cache."""
+
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+user_service.add_change_listener(principal_cache.invalidate)
+
+
+__all__ = ["Principal", "PrincipalCache", "principal_cache"]
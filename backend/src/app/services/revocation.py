@@ -0,0 +1,256 @@
+"""Refresh-token rotation and token revocation.
+
+Revocations are persisted in ``revoked_tokens`` and mirrored in an in-process
+:class:`TokenDenylist`, so :meth:`AuthService.decode_token` rejects revoked
+tokens with a set lookup instead of a database round-trip. Each worker loads
+the unexpired rows at startup, then a background thread picks up the rows
+other workers revoked since (``revoked_at`` past the newest one seen) every
+``sync_interval_seconds``; entries leave the denylist once their token would
+have expired anyway.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import heapq
+import logging
+from threading import Event, Lock, Thread
+import time
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.app.core.config import settings
+from src.app.db.session import SessionLocal
+from src.app.models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# ``revoked_at`` is stamped at insert time but becomes visible at commit (and SQLite
+# stores whole seconds), so every sync re-reads a short window before the newest row.
+_SYNC_OVERLAP = timedelta(seconds=5)
+
+
+@dataclass(frozen=True, slots=True)
+class DenylistStats:
+    """Point-in-time counters exposed by :class:`TokenDenylist`."""
+
+    size: int
+    added: int
+    pruned: int
+
+
+class TokenDenylist:
+    """Set of revoked ``jti`` values, each dropped once its token's ``exp`` has passed."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = Lock()
+        self._expiry: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._added = 0
+        self._pruned = 0
+
+    def __contains__(self, jti: object) -> bool:
+        expires_at = self._expiry.get(jti)  # type: ignore[arg-type]
+        return expires_at is not None and expires_at > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Deny ``jti`` until ``expires_at`` (epoch seconds)."""
+
+        with self._lock:
+            self._prune_locked(self._clock())
+            if expires_at > self._expiry.get(jti, 0.0):
+                self._expiry[jti] = expires_at
+                heapq.heappush(self._heap, (expires_at, jti))
+                self._added += 1
+
+    def load(self, entries: Iterable[tuple[str, float]]) -> None:
+        """Add many ``(jti, expires_at)`` pairs, typically the persisted rows at startup."""
+
+        for jti, expires_at in entries:
+            self.add(jti, expires_at)
+
+    def prune(self) -> int:
+        """Drop expired entries and return how many were removed."""
+
+        with self._lock:
+            return self._prune_locked(self._clock())
+
+    def clear(self) -> None:
+        """Forget every entry."""
+
+        with self._lock:
+            self._expiry.clear()
+            self._heap.clear()
+
+    def stats(self) -> DenylistStats:
+        """Return a snapshot of the denylist counters."""
+
+        with self._lock:
+            return DenylistStats(size=len(self._expiry), added=self._added, pruned=self._pruned)
+
+    def _prune_locked(self, now: float) -> int:
+        removed = 0
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(heap)
+            # A later re-add keeps a newer expiry; only drop the matching entry.
+            if self._expiry.get(jti) == expires_at:
+                del self._expiry[jti]
+                removed += 1
+        self._pruned += removed
+        return removed
+
+
+class RevocationService:
+    """Persist revocations, rotate refresh tokens and keep the denylist in sync."""
+
+    def __init__(
+        self,
+        denylist: TokenDenylist,
+        session_factory: Callable[[], Session] | None = None,
+        *,
+        sync_interval_seconds: float = 0.0,
+    ) -> None:
+        self._denylist = denylist
+        self._session_factory = session_factory
+        self._sync_interval = sync_interval_seconds
+        self._last_seen: datetime | None = None
+        self._sync_lock = Lock()
+        self._stopping = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def denylist(self) -> TokenDenylist:
+        """Return the in-process denylist consulted by token decoding."""
+
+        return self._denylist
+
+    def load(self, session: Session, *, purge: bool = True) -> int:
+        """Load unexpired rows into the denylist and return how many were loaded.
+
+        ``purge`` first deletes expired rows; read-only replicas pass ``False``.
+        """
+
+        now = int(time.time())
+        if purge:
+            session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            session.commit()
+        with self._sync_lock:
+            return self._load_since(session, None)
+
+    def sync(self, session: Session) -> int:
+        """Load the rows revoked since the newest one seen (by any worker); return how many were read."""
+
+        with self._sync_lock:
+            since = None if self._last_seen is None else self._last_seen - _SYNC_OVERLAP
+            return self._load_since(session, since)
+
+    def start(self) -> None:
+        """Start the background thread calling :meth:`sync` every ``sync_interval_seconds``."""
+
+        if self._session_factory is None or self._sync_interval <= 0 or self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="denylist-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background sync thread."""
+
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join(timeout if timeout is not None else self._sync_interval + 5)
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._sync_interval):
+            session = self._session_factory()
+            try:
+                self.sync(session)
+            except SQLAlchemyError:
+                logger.exception("Revoked tokens could not be synchronised")
+            finally:
+                session.close()
+
+    def _load_since(self, session: Session, since: datetime | None) -> int:
+        statement = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > int(time.time())
+        )
+        if since is not None:
+            statement = statement.where(RevokedToken.revoked_at >= since)
+        rows = session.execute(statement).all()
+        self._denylist.load((jti, float(expires_at)) for jti, expires_at, _ in rows)
+        newest = max((revoked_at for _, _, revoked_at in rows if revoked_at is not None), default=None)
+        if newest is not None and (self._last_seen is None or newest > self._last_seen):
+            self._last_seen = newest
+        return len(rows)
+
+    def revoke(self, session: Session, payload: dict[str, Any], reason: str) -> bool:
+        """Revoke the token described by ``payload``; return ``False`` when it was already revoked."""
+
+        jti = payload.get("jti")
+        exp = payload.get("exp")
+        if not isinstance(jti, str) or not isinstance(exp, (int, float)):
+            return False
+        session.add(
+            RevokedToken(
+                jti=jti,
+                subject=str(payload.get("sub", "")),
+                token_type=str(payload.get("type", "")),
+                reason=reason,
+                expires_at=int(exp),
+            )
+        )
+        try:
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            newly_revoked = False
+        else:
+            newly_revoked = True
+        self._denylist.add(jti, float(exp))
+        return newly_revoked
+
+    def rotate(self, session: Session, payload: dict[str, Any]) -> bool:
+        """Consume a refresh token; ``False`` means another request already used it."""
+
+        return self.revoke(session, payload, reason="rotated")
+
+    async def load_async(self, session: AsyncSession, *, purge: bool = True) -> int:
+        """Awaitable variant of :meth:`load`."""
+
+        return await session.run_sync(self.load, purge=purge)
+
+    async def revoke_async(self, session: AsyncSession, payload: dict[str, Any], reason: str) -> bool:
+        """Awaitable variant of :meth:`revoke`."""
+
+        return await session.run_sync(self.revoke, payload, reason)
+
+    async def rotate_async(self, session: AsyncSession, payload: dict[str, Any]) -> bool:
+        """Awaitable variant of :meth:`rotate`."""
+
+        return await session.run_sync(self.rotate, payload)
+
+
+token_denylist = TokenDenylist()
+revocation_service = RevocationService(
+    token_denylist, SessionLocal, sync_interval_seconds=settings.revocation_sync_interval_seconds
+)
+
+
+__all__ = [
+    "DenylistStats",
+    "RevocationService",
+    "TokenDenylist",
+    "revocation_service",
+    "token_denylist",
+]
@@ -0,0 +1,195 @@
+"""Sliding-window throttling of login attempts per account and per client IP.
+
+Attempts are checked before the user lookup and the bcrypt verification, so
+a credential-stuffing burst is rejected for the cost of two counter updates.
+The per-IP limit is checked first and an attempt it rejects is not counted
+against the account; a successful login clears the account's counter, so
+only failed attempts accumulate towards locking it.
+Counters live behind :class:`RateLimitBackend`; the in-memory backend keeps a
+bounded, LRU-evicted map per process, and a shared store can implement the
+same protocol for multi-node deployments.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import math
+from threading import Lock
+import time
+from typing import Callable, Protocol
+
+from src.app.core.config import settings
+
+
+class LoginThrottled(RuntimeError):
+    """Raised when a login attempt exceeds its rate limit."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Too many login attempts")
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(Protocol):
+    """Storage for sliding-window counters."""
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        """Record an attempt for ``key``; return ``0`` when allowed, else the seconds to wait.
+
+        Rejected attempts are not counted, so a blocked caller is released on
+        schedule however hard it keeps retrying.
+        """
+
+    async def reset(self, key: str) -> None:
+        """Forget the counters of ``key``."""
+
+
+@dataclass(slots=True)
+class _Window:
+    start: float
+    current: int = 0
+    previous: int = 0
+
+
+class InMemoryRateLimitBackend:
+    """Sliding-window counters in a bounded LRU map (two integers per key).
+
+    The sliding window is approximated from the current and previous fixed
+    windows, weighting the previous count by how much of it still overlaps.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        if max_keys <= 0:
+            raise ValueError("max_keys must be positive")
+        self._max_keys = max_keys
+        self._clock = clock
+        self._lock = Lock()
+        self._windows: OrderedDict[str, _Window] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        now = self._clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = _Window(start=now - now % window_seconds)
+                self._windows[key] = window
+                if len(self._windows) > self._max_keys:
+                    self._windows.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._windows.move_to_end(key)
+                self._roll(window, now, window_seconds)
+
+            elapsed = now - window.start
+            overlap = 1.0 - elapsed / window_seconds
+            if window.previous * overlap + window.current < limit:
+                window.current += 1
+                return 0.0
+            return self._retry_after(window, elapsed, limit, window_seconds)
+
+    async def reset(self, key: str) -> None:
+        with self._lock:
+            self._windows.pop(key, None)
+
+    @staticmethod
+    def _roll(window: _Window, now: float, window_seconds: float) -> None:
+        periods = int((now - window.start) // window_seconds)
+        if periods <= 0:
+            return
+        window.previous = window.current if periods == 1 else 0
+        window.current = 0
+        window.start += periods * window_seconds
+
+    @staticmethod
+    def _retry_after(window: _Window, elapsed: float, limit: int, window_seconds: float) -> float:
+        if window.current >= limit or window.previous == 0:
+            # Blocked by this window alone: wait for it to become the previous one.
+            return window_seconds - elapsed
+        # Wait until the previous window's weight has decayed below the remaining budget.
+        unblocked_at = window_seconds * (1.0 - (limit - window.current) / window.previous)
+        return max(unblocked_at - elapsed, 0.001)
+
+
+class LoginThrottle:
+    """Apply the per-email and per-IP login limits from :class:`Settings`."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        *,
+        per_email: int,
+        per_ip: int,
+        window_seconds: float,
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.per_email = per_email
+        self.per_ip = per_ip
+        self.window_seconds = window_seconds
+        self.enabled = enabled
+
+    async def check(self, email: str, client_ip: str | None) -> None:
+        """Count a login attempt, raising :class:`LoginThrottled` when a limit is exceeded."""
+
+        if not self.enabled:
+            return
+        if client_ip:
+            # A spraying client must not lock out the accounts it targets once its own limit trips.
+            self._raise_if_waiting(await self.backend.hit(f"login:ip:{client_ip}", self.per_ip, self.window_seconds))
+        self._raise_if_waiting(await self.backend.hit(_email_key(email), self.per_email, self.window_seconds))
+
+    async def record_success(self, email: str) -> None:
+        """Clear the per-email counter after a verified login, so only failures count against the account."""
+
+        if self.enabled:
+            await self.backend.reset(_email_key(email))
+
+    async def reset_account(self, email: str) -> None:
+        """Clear the per-email counter, e.g. after an administrator unlocks the account."""
+
+        await self.backend.reset(_email_key(email))
+
+    @staticmethod
+    def _raise_if_waiting(wait: float) -> None:
+        if wait > 0:
+            raise LoginThrottled(max(1, math.ceil(wait)))
+
+
+def _email_key(email: str) -> str:
+    return f"login:email:{email.strip().lower()}"
+
+
+def build_login_throttle(backend: RateLimitBackend | None = None) -> LoginThrottle:
+    """Return a :class:`LoginThrottle` configured from ``settings``."""
+
+    return LoginThrottle(
+        backend or InMemoryRateLimitBackend(max_keys=settings.login_throttle_max_keys),
+        per_email=settings.login_rate_per_email,
+        per_ip=settings.login_rate_per_ip,
+        window_seconds=settings.login_rate_window_seconds,
+        enabled=settings.login_throttle_enabled,
+    )
+
+
+login_throttle = build_login_throttle()
+
+
+def get_login_throttle() -> LoginThrottle:
+    """FastAPI dependency returning the process-wide login throttle."""
+
+    return login_throttle
+
+
+__all__ = [
+    "InMemoryRateLimitBackend",
+    "LoginThrottle",
+    "LoginThrottled",
+    "RateLimitBackend",
+    "build_login_throttle",
+    "get_login_throttle",
+    "login_throttle",
+]
@@ -0,0 +1,251 @@
+"""Streaming parsers and result types for bulk user imports.
+
+Both supported formats are parsed one line at a time so an import never holds
+more than one batch of rows in memory:
+
+- CSV with a header row containing ``email``, ``password`` (or
+  ``password_hash``) and optionally ``roles`` (``;`` or ``|`` separated) and
+  ``is_active``; a quoted field may span lines, up to
+  :data:`MAX_CSV_RECORD_LINES` lines per record;
+- NDJSON with one object per line using the same keys, ``roles`` being a list
+  or a separated string.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+import csv
+from dataclasses import dataclass, field
+import json
+import re
+from typing import Any, Protocol
+
+MAX_REPORTED_ERRORS = 1000
+MAX_CSV_RECORD_LINES = 100
+
+_ROLE_SEPARATOR = re.compile(r"[;|]")
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRow:
+    """A validated-shape import record; ``error`` is set when the line could not be parsed."""
+
+    line: int
+    email: str = ""
+    password: str | None = None
+    password_hash: str | None = None
+    roles: tuple[str, ...] = ()
+    is_active: bool = True
+    error: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRowError:
+    """Per-row failure reported by a bulk import."""
+
+    line: int
+    email: str | None
+    message: str
+
+
+@dataclass(slots=True)
+class BulkImportResult:
+    """Summary of a bulk import; at most :data:`MAX_REPORTED_ERRORS` errors are kept."""
+
+    created: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    def add_error(self, line: int, email: str | None, message: str) -> None:
+        """Record a failed row."""
+
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=line, email=email or None, message=message))
+
+
+class RowParser(Protocol):
+    """Incremental parser turning one text line into an :class:`ImportRow`."""
+
+    def parse(self, line: str) -> ImportRow | None:
+        """Return the row for ``line`` or ``None`` for header, blank and incomplete lines."""
+
+    def finish(self) -> ImportRow | None:
+        """Return the row still buffered at the end of the input, if any."""
+
+
+def _split_roles(value: Any) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        parts: Iterable[Any] = _ROLE_SEPARATOR.split(value)
+    elif isinstance(value, list):
+        parts = value
+    else:
+        raise ValueError("roles must be a list or a separated string")
+    return tuple(str(part).strip() for part in parts if str(part).strip())
+
+
+def _parse_active(value: Any) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in _FALSE_VALUES
+
+
+def _ends_quoted(line: str, quoted: bool) -> bool:
+    # Follow csv's quoting state through ``line`` (default dialect: ``"`` quotes, ``""`` escapes one).
+    at_field_start, closed = not quoted, False
+    for char in line:
+        if quoted:
+            if char == '"':
+                quoted, closed = False, True
+            continue
+        if char == '"' and (at_field_start or closed):
+            quoted = True
+        at_field_start, closed = char == ",", False
+    return quoted
+
+
+def _row_from_mapping(line: int, record: dict[str, Any]) -> ImportRow:
+    try:
+        return ImportRow(
+            line=line,
+            email=str(record.get("email") or "").strip().lower(),
+            password=record.get("password") or None,
+            password_hash=record.get("password_hash") or None,
+            roles=_split_roles(record.get("roles")),
+            is_active=_parse_active(record.get("is_active")),
+        )
+    except ValueError as exc:
+        return ImportRow(line=line, email=str(record.get("email") or ""), error=str(exc))
+
+
+class CsvRowParser:
+    """Parse CSV lines; the first non-blank record is the header.
+
+    Lines ending inside a quoted field are buffered until the record closes,
+    and the row reports the line it started on.
+    """
+
+    def __init__(self) -> None:
+        self._header: list[str] | None = None
+        self._line = 0
+        self._start = 0
+        self._pending: list[str] = []
+        self._quoted = False
+
+    def parse(self, line: str) -> ImportRow | None:
+        self._line += 1
+        if not self._pending:
+            if not line.strip():
+                return None
+            self._start = self._line
+        self._pending.append(line)
+        self._quoted = _ends_quoted(line, self._quoted)
+        if not self._quoted:
+            return self._take()
+        if len(self._pending) >= MAX_CSV_RECORD_LINES:
+            return self._take(f"quoted field spans more than {MAX_CSV_RECORD_LINES} lines")
+        return None
+
+    def finish(self) -> ImportRow | None:
+        return self._take("unterminated quoted field") if self._pending else None
+
+    def _take(self, error: str | None = None) -> ImportRow | None:
+        lines, self._pending, self._quoted = self._pending, [], False
+        if error is not None:
+            return ImportRow(line=self._start, error=error)
+        values = next(csv.reader([f"{line}\n" for line in lines]))
+        if self._header is None:
+            self._header = [name.strip().lower() for name in values]
+            return None
+        if len(values) != len(self._header):
+            return ImportRow(line=self._start, error=f"expected {len(self._header)} columns, got {len(values)}")
+        return _row_from_mapping(self._start, dict(zip(self._header, values)))
+
+
+class NdjsonRowParser:
+    """Parse newline-delimited JSON objects."""
+
+    def __init__(self) -> None:
+        self._line = 0
+
+    def parse(self, line: str) -> ImportRow | None:
+        self._line += 1
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            return ImportRow(line=self._line, error=f"invalid JSON: {exc.msg}")
+        if not isinstance(record, dict):
+            return ImportRow(line=self._line, error="expected a JSON object")
+        return _row_from_mapping(self._line, record)
+
+    def finish(self) -> ImportRow | None:
+        return None
+
+
+def row_parser(media_type: str) -> RowParser:
+    """Return the parser matching ``media_type`` (``text/csv`` or ``application/x-ndjson``)."""
+
+    base = media_type.split(";", 1)[0].strip().lower()
+    if base in {"text/csv", "csv"}:
+        return CsvRowParser()
+    if base in {"application/x-ndjson", "application/ndjson", "application/jsonl", "ndjson", "jsonl"}:
+        return NdjsonRowParser()
+    raise ValueError(f"Unsupported import format: {media_type}")
+
+
+def iter_rows(lines: Iterable[str], parser: RowParser) -> Iterator[ImportRow]:
+    """Yield parsed rows from an iterable of text lines."""
+
+    for line in lines:
+        row = parser.parse(line.rstrip("\r\n"))
+        if row is not None:
+            yield row
+    row = parser.finish()
+    if row is not None:
+        yield row
+
+
+async def aiter_rows(chunks: AsyncIterable[bytes], parser: RowParser) -> AsyncIterator[ImportRow]:
+    """Yield parsed rows from a stream of raw body chunks."""
+
+    buffer = b""
+    first = True
+    async for chunk in chunks:
+        buffer += chunk
+        if first and buffer.startswith(b"\xef\xbb\xbf"):
+            buffer = buffer[3:]
+        first = False
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            row = parser.parse(raw.decode("utf-8", errors="replace").rstrip("\r"))
+            if row is not None:
+                yield row
+    if buffer:
+        row = parser.parse(buffer.decode("utf-8", errors="replace").rstrip("\r"))
+        if row is not None:
+            yield row
+    row = parser.finish()
+    if row is not None:
+        yield row
+
+
+__all__ = [
+    "BulkImportResult",
+    "CsvRowParser",
+    "ImportRow",
+    "ImportRowError",
+    "MAX_CSV_RECORD_LINES",
+    "MAX_REPORTED_ERRORS",
+    "NdjsonRowParser",
+    "RowParser",
+    "aiter_rows",
+    "iter_rows",
+    "row_parser",
+]
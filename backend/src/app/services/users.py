@@ -2,20 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+import hashlib
+import json
+import logging
+import time
+from typing import Callable, Iterable, Sequence, TypeVar
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, bindparam, delete, exists, insert, literal, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from src.app.models import Permission, Role, User
-from src.app.models.role import role_permissions
+from src.app.models import AppMeta, Permission, Role, User
+from src.app.models.role import role_closure, role_hierarchy, role_permissions
 from src.app.models.user import user_roles
 from src.app.services.auth import auth_service
+from src.app.services.user_import import BulkImportResult, ImportRow
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# ``includes`` lists the roles whose permissions a role inherits, transitively.
 _ROLE_PRESETS: dict[str, dict[str, Sequence[str]]] = {
-    "admin": {"permissions": ("auth:login", "auth:refresh", "users:manage")},
-    "manager": {"permissions": ("auth:login", "missions:manage")},
-    "tech": {"permissions": ("auth:login", "missions:execute")},
+    "admin": {"permissions": ("auth:refresh", "users:manage"), "includes": ("manager",)},
+    "manager": {"permissions": ("missions:manage",), "includes": ("viewer",)},
+    "tech": {"permissions": ("missions:execute",), "includes": ("viewer",)},
     "viewer": {"permissions": ("auth:login", "missions:view")},
 }
 
@@ -28,36 +41,324 @@ _PERMISSION_DESCRIPTIONS: dict[str, str] = {
     "missions:view": "View missions and planning information.",
 }
 
+_CATALOG_HASH_KEY = "rbac_catalog_hash"
+
+
+def _catalog_hash() -> str:
+    catalog = {
+        "permissions": _PERMISSION_DESCRIPTIONS,
+        "roles": {name: sorted(preset.get("permissions", ())) for name, preset in _ROLE_PRESETS.items()},
+        "includes": {name: sorted(preset.get("includes", ())) for name, preset in _ROLE_PRESETS.items()},
+    }
+    return hashlib.sha256(json.dumps(catalog, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _abatched(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+UserChangeListener = Callable[[str | None], None]
+"""Callback fired after a committed change; receives the user email, or ``None`` for catalog-wide changes."""
+
 
 class UserService:
     """Encapsulate business logic for user and role management."""
 
-    def ensure_default_roles(self, session: Session) -> None:
-        """Ensure the minimal set of roles and permissions exists."""
+    def __init__(self) -> None:
+        self._change_listeners: list[UserChangeListener] = []
+
+    def add_change_listener(self, listener: UserChangeListener) -> None:
+        """Register a callback invoked whenever a user, role or role assignment changes."""
+
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: UserChangeListener) -> None:
+        """Unregister a callback previously added with :meth:`add_change_listener`."""
+
+        self._change_listeners.remove(listener)
+
+    def _notify_change(self, email: str | None) -> None:
+        for listener in tuple(self._change_listeners):
+            listener(email)
+
+    @staticmethod
+    def catalog_hash() -> str:
+        """Return the fingerprint of the built-in role and permission catalog."""
+
+        return _catalog_hash()
+
+    def ensure_default_roles(self, session: Session) -> bool:
+        """Reconcile the stored roles and permissions with the built-in catalog.
+
+        The hash of the catalog is stored in ``app_meta``; when it matches, the
+        check costs a single SELECT and nothing is written. Otherwise the
+        existing rows are fetched in three queries and only the differences are
+        inserted or deleted in bulk. Returns ``True`` when anything was written.
+        """
 
-        for perm_name, description in _PERMISSION_DESCRIPTIONS.items():
-            existing = session.execute(select(Permission).where(Permission.name == perm_name)).scalar_one_or_none()
-            if existing is None:
-                session.add(Permission(name=perm_name, description=description))
+        started = time.perf_counter()
+        catalog_hash = _catalog_hash()
+        stored = session.get(AppMeta, _CATALOG_HASH_KEY)
+        if stored is not None and stored.value == catalog_hash:
+            session.commit()
+            logger.info("RBAC catalog up to date (%.1f ms)", (time.perf_counter() - started) * 1000)
+            return False
 
-        session.flush()
+        permission_ids = dict(session.execute(select(Permission.name, Permission.id)).all())
+        missing_permissions = [
+            {"name": name, "description": description}
+            for name, description in _PERMISSION_DESCRIPTIONS.items()
+            if name not in permission_ids
+        ]
+        if missing_permissions:
+            inserted = session.execute(insert(Permission).returning(Permission.name, Permission.id), missing_permissions)
+            permission_ids.update(inserted.all())
 
-        for role_name, preset in _ROLE_PRESETS.items():
-            role = session.execute(select(Role).where(Role.name == role_name)).scalar_one_or_none()
-            if role is None:
-                role = Role(name=role_name)
-                session.add(role)
-                session.flush([role])
+        role_ids = dict(session.execute(select(Role.name, Role.id).where(Role.name.in_(list(_ROLE_PRESETS)))).all())
+        missing_roles = [{"name": name} for name in _ROLE_PRESETS if name not in role_ids]
+        if missing_roles:
+            role_ids.update(session.execute(insert(Role).returning(Role.name, Role.id), missing_roles).all())
 
-            permissions = list(self._get_permissions(session, preset.get("permissions", ())))
-            role.permissions = permissions
+        desired = {
+            (role_ids[role_name], permission_ids[permission_name])
+            for role_name, preset in _ROLE_PRESETS.items()
+            for permission_name in preset.get("permissions", ())
+        }
+        existing = set(
+            session.execute(
+                select(role_permissions.c.role_id, role_permissions.c.permission_id).where(
+                    role_permissions.c.role_id.in_(role_ids.values())
+                )
+            ).all()
+        )
+        to_add = desired - existing
+        to_remove = existing - desired
+        if to_add:
+            session.execute(
+                insert(role_permissions),
+                [{"role_id": role_id, "permission_id": permission_id} for role_id, permission_id in to_add],
+            )
+        if to_remove:
+            session.execute(
+                delete(role_permissions).where(
+                    tuple_(role_permissions.c.role_id, role_permissions.c.permission_id).in_(sorted(to_remove))
+                )
+            )
 
+        self._ensure_closure_rows(session)
+        desired_edges = {
+            (role_ids[role_name], role_ids[child_name])
+            for role_name, preset in _ROLE_PRESETS.items()
+            for child_name in preset.get("includes", ())
+        }
+        existing_edges = set(
+            session.execute(
+                select(role_hierarchy.c.parent_id, role_hierarchy.c.child_id).where(
+                    role_hierarchy.c.parent_id.in_(role_ids.values())
+                )
+            ).all()
+        )
+        edges_to_remove = existing_edges - desired_edges
+        edges_to_add = desired_edges - existing_edges
+        for parent_id, child_id in sorted(edges_to_remove):
+            self._unlink_roles(session, parent_id, child_id)
+        for parent_id, child_id in sorted(edges_to_add):
+            self._link_roles(session, parent_id, child_id)
+
+        session.merge(AppMeta(key=_CATALOG_HASH_KEY, value=catalog_hash))
+        session.commit()
+        # Rows were written behind the ORM's back; drop any stale relationship state.
+        session.expire_all()
+        changed = bool(
+            missing_permissions or missing_roles or to_add or to_remove or edges_to_add or edges_to_remove
+        )
+        if changed:
+            self._notify_change(None)
+        logger.info(
+            "RBAC catalog reconciled: +%d permissions, +%d roles, +%d/-%d links, +%d/-%d inclusions (%.1f ms)",
+            len(missing_permissions),
+            len(missing_roles),
+            len(to_add),
+            len(to_remove),
+            len(edges_to_add),
+            len(edges_to_remove),
+            (time.perf_counter() - started) * 1000,
+        )
+        return changed
+
+    async def ensure_default_roles_async(self, session: AsyncSession) -> bool:
+        """Awaitable variant of :meth:`ensure_default_roles`."""
+
+        return await session.run_sync(self.ensure_default_roles)
+
+    def include_role(self, session: Session, parent: str, child: str) -> bool:
+        """Make holders of ``parent`` inherit ``child``; ``False`` when it already did directly.
+
+        Only the closure rows between ``parent``'s ancestors and ``child``'s
+        descendants are touched. Raises :class:`ValueError` when the inclusion
+        would create a cycle.
+        """
+
+        parent_id = self._get_or_create_role(session, parent).id
+        child_id = self._get_or_create_role(session, child).id
+        edge = (role_hierarchy.c.parent_id == parent_id) & (role_hierarchy.c.child_id == child_id)
+        if session.execute(select(exists().where(edge))).scalar():
+            session.commit()
+            return False
+        reverse = (role_closure.c.ancestor_id == child_id) & (role_closure.c.descendant_id == parent_id)
+        if session.execute(select(exists().where(reverse))).scalar():
+            session.rollback()
+            raise ValueError(f"Role {child!r} already includes {parent!r}")
+        self._link_roles(session, parent_id, child_id)
+        session.commit()
+        self._notify_change(None)
+        return True
+
+    def exclude_role(self, session: Session, parent: str, child: str) -> bool:
+        """Remove the direct inclusion of ``child`` in ``parent``; ``False`` when there was none."""
+
+        ids = dict(session.execute(select(Role.name, Role.id).where(Role.name.in_([parent, child]))).all())
+        parent_id, child_id = ids.get(parent), ids.get(child)
+        edge = (role_hierarchy.c.parent_id == parent_id) & (role_hierarchy.c.child_id == child_id)
+        if parent_id is None or child_id is None or not session.execute(select(exists().where(edge))).scalar():
+            session.commit()
+            return False
+        self._unlink_roles(session, parent_id, child_id)
         session.commit()
+        self._notify_change(None)
+        return True
+
+    def effective_permission_names(self, session: Session, user_id: int) -> set[str]:
+        """Return the names of every permission ``user_id`` holds, inherited ones included, in one query."""
+
+        statement = (
+            select(Permission.name)
+            .join(role_permissions, role_permissions.c.permission_id == Permission.id)
+            .join(role_closure, role_closure.c.descendant_id == role_permissions.c.role_id)
+            .join(user_roles, user_roles.c.role_id == role_closure.c.ancestor_id)
+            .where(user_roles.c.user_id == user_id)
+            .distinct()
+        )
+        return set(session.scalars(statement))
+
+    async def effective_permission_names_async(self, session: AsyncSession, user_id: int) -> set[str]:
+        """Awaitable variant of :meth:`effective_permission_names`."""
+
+        return await session.run_sync(self.effective_permission_names, user_id)
+
+    @staticmethod
+    def _ensure_closure_rows(session: Session) -> None:
+        # Every role is its own ancestor, so joins through the closure include the assigned role.
+        self_row = (role_closure.c.ancestor_id == Role.id) & (role_closure.c.descendant_id == Role.id)
+        session.execute(
+            insert(role_closure).from_select(
+                ["ancestor_id", "descendant_id", "paths"],
+                select(Role.id, Role.id, literal(1)).where(~exists().where(self_row)),
+            )
+        )
+
+    def _link_roles(self, session: Session, parent_id: int, child_id: int) -> None:
+        session.execute(insert(role_hierarchy).values(parent_id=parent_id, child_id=child_id))
+        self._adjust_closure(session, parent_id, child_id, 1)
+
+    def _unlink_roles(self, session: Session, parent_id: int, child_id: int) -> None:
+        session.execute(
+            delete(role_hierarchy).where(role_hierarchy.c.parent_id == parent_id, role_hierarchy.c.child_id == child_id)
+        )
+        self._adjust_closure(session, parent_id, child_id, -1)
+
+    @staticmethod
+    def _adjust_closure(session: Session, parent_id: int, child_id: int, sign: int) -> None:
+        # Each (ancestor of parent, descendant of child) pair gains or loses
+        # paths(ancestor -> parent) * paths(child -> descendant) paths.
+        ancestors = session.execute(
+            select(role_closure.c.ancestor_id, role_closure.c.paths).where(role_closure.c.descendant_id == parent_id)
+        ).all()
+        # Holders of any ancestor of ``parent`` gain or lose effective roles, so their ETags must change.
+        ancestor_ids = [ancestor_id for ancestor_id, _ in ancestors]
+        holders = select(user_roles.c.user_id).where(user_roles.c.role_id.in_(ancestor_ids))
+        session.execute(
+            update(User).where(User.id.in_(holders)).values(version=User.version + 1),
+            execution_options={"synchronize_session": False},
+        )
+        descendants = session.execute(
+            select(role_closure.c.descendant_id, role_closure.c.paths).where(role_closure.c.ancestor_id == child_id)
+        ).all()
+        deltas = {
+            (ancestor_id, descendant_id): sign * ancestor_paths * descendant_paths
+            for ancestor_id, ancestor_paths in ancestors
+            for descendant_id, descendant_paths in descendants
+        }
+        existing = {
+            (ancestor_id, descendant_id): paths
+            for ancestor_id, descendant_id, paths in session.execute(
+                select(role_closure.c.ancestor_id, role_closure.c.descendant_id, role_closure.c.paths).where(
+                    tuple_(role_closure.c.ancestor_id, role_closure.c.descendant_id).in_(sorted(deltas))
+                )
+            )
+        }
+        inserts, updates, removals = [], [], []
+        for pair, delta in deltas.items():
+            paths = existing.get(pair, 0) + delta
+            if pair not in existing:
+                inserts.append({"ancestor_id": pair[0], "descendant_id": pair[1], "paths": paths})
+            elif paths > 0:
+                updates.append({"a": pair[0], "d": pair[1], "p": paths})
+            else:
+                removals.append(pair)
+        if inserts:
+            session.execute(insert(role_closure), inserts)
+        if updates:
+            session.execute(
+                update(role_closure)
+                .where(role_closure.c.ancestor_id == bindparam("a"), role_closure.c.descendant_id == bindparam("d"))
+                .values(paths=bindparam("p")),
+                updates,
+            )
+        if removals:
+            session.execute(
+                delete(role_closure).where(
+                    tuple_(role_closure.c.ancestor_id, role_closure.c.descendant_id).in_(removals)
+                )
+            )
 
     def create_user(self, session: Session, email: str, password: str, roles: Iterable[str] | None = None) -> User:
         """Create a new user with the provided credentials."""
 
         hashed = auth_service.hash_password(password)
+        return self._persist_user(session, email, hashed, roles)
+
+    async def create_user_async(
+        self,
+        session: AsyncSession,
+        email: str,
+        password: str,
+        roles: Iterable[str] | None = None,
+    ) -> User:
+        """Awaitable variant of :meth:`create_user`; hashing runs off the event loop."""
+
+        hashed = await auth_service.hash_password_async(password)
+        return await session.run_sync(self._persist_user, email, hashed, roles)
+
+    def _persist_user(self, session: Session, email: str, hashed: str, roles: Iterable[str] | None) -> User:
         user = User(email=email, hashed_password=hashed)
         session.add(user)
         session.flush([user])
@@ -68,21 +369,280 @@ class UserService:
 
         session.commit()
         session.refresh(user)
+        self._notify_change(user.email)
+        return user
+
+    def set_user_roles(self, session: Session, user: User, roles: Iterable[str]) -> User:
+        """Replace the roles assigned to ``user``."""
+
+        user.roles = [self._get_or_create_role(session, role_name) for role_name in roles]
+        self._bump_version(user)
+        session.commit()
+        self._notify_change(user.email)
+        return user
+
+    def set_user_active(self, session: Session, user: User, is_active: bool) -> User:
+        """Activate or deactivate ``user``."""
+
+        user.is_active = is_active
+        self._bump_version(user)
+        session.commit()
+        self._notify_change(user.email)
         return user
 
-    def get_by_email(self, session: Session, email: str) -> User | None:
-        """Return a user by email."""
+    @staticmethod
+    def _bump_version(user: User) -> None:
+        # Incremented in SQL so concurrent writers never reuse a version.
+        user.version = User.version + 1
+
+    def upgrade_password_hash(self, session: Session, user: User, new_hash: str) -> bool:
+        """Store ``new_hash`` unless the password changed since ``user`` was loaded.
+
+        Used to roll a new bcrypt cost out at login. The compare-and-set keeps
+        a concurrent password change from being overwritten; ``False`` means it
+        lost that race and nothing was written.
+        """
+
+        result = session.execute(
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(hashed_password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+    async def upgrade_password_hash_async(self, session: AsyncSession, user: User, new_hash: str) -> bool:
+        """Awaitable variant of :meth:`upgrade_password_hash`."""
+
+        return await session.run_sync(self.upgrade_password_hash, user, new_hash)
+
+    def bulk_create_users(
+        self,
+        session: Session,
+        rows: Iterable[ImportRow],
+        *,
+        batch_size: int = 500,
+    ) -> BulkImportResult:
+        """Create users from ``rows`` in batches, committing once per batch.
+
+        Roles are resolved once for the whole import, the passwords of a batch
+        are hashed in parallel, and invalid rows are reported in the result
+        instead of aborting the import.
+        """
+
+        result = BulkImportResult()
+        role_ids = self._role_ids(session)
+        seen: set[str] = set()
+        for batch in _batched(rows, batch_size):
+            pending = self._prepare_import_batch(session, batch, role_ids, seen, result)
+            hashes = auth_service.hash_passwords([row.password for row in pending if row.password_hash is None])
+            self._insert_import_batch(session, pending, hashes, role_ids, result)
+        return result
+
+    async def bulk_create_users_async(
+        self,
+        session: AsyncSession,
+        rows: AsyncIterable[ImportRow],
+        *,
+        batch_size: int = 500,
+    ) -> BulkImportResult:
+        """Awaitable variant of :meth:`bulk_create_users` consuming a streamed row source."""
 
-        return session.execute(select(User).where(User.email == email)).scalar_one_or_none()
+        result = BulkImportResult()
+        role_ids = await session.run_sync(self._role_ids)
+        seen: set[str] = set()
+        async for batch in _abatched(rows, batch_size):
+            pending = await session.run_sync(self._prepare_import_batch, batch, role_ids, seen, result)
+            hashes = await auth_service.hash_passwords_async(
+                [row.password for row in pending if row.password_hash is None]
+            )
+            await session.run_sync(self._insert_import_batch, pending, hashes, role_ids, result)
+        return result
 
-    def _get_permissions(self, session: Session, names: Iterable[str]) -> Iterable[Permission]:
-        for name in names:
-            permission = session.execute(select(Permission).where(Permission.name == name)).scalar_one_or_none()
-            if permission is None:
-                permission = Permission(name=name, description=_PERMISSION_DESCRIPTIONS.get(name))
-                session.add(permission)
-                session.flush([permission])
-            yield permission
+    def _role_ids(self, session: Session) -> dict[str, int]:
+        return {name.lower(): role_id for role_id, name in session.execute(select(Role.id, Role.name))}
+
+    def _prepare_import_batch(
+        self,
+        session: Session,
+        batch: list[ImportRow],
+        role_ids: dict[str, int],
+        seen: set[str],
+        result: BulkImportResult,
+    ) -> list[ImportRow]:
+        candidates: list[ImportRow] = []
+        for row in batch:
+            if row.error:
+                result.add_error(row.line, row.email, row.error)
+            elif "@" not in row.email:
+                result.add_error(row.line, row.email, "invalid email")
+            elif row.password is None and row.password_hash is None:
+                result.add_error(row.line, row.email, "missing password")
+            elif row.password_hash is not None and not row.password_hash.startswith("$2"):
+                result.add_error(row.line, row.email, "password_hash must be a bcrypt hash")
+            elif unknown := [role for role in row.roles if role.lower() not in role_ids]:
+                result.add_error(row.line, row.email, f"unknown roles: {', '.join(unknown)}")
+            elif row.email in seen:
+                result.add_error(row.line, row.email, "duplicate email in import")
+            else:
+                seen.add(row.email)
+                candidates.append(row)
+
+        if not candidates:
+            return []
+        emails = [row.email for row in candidates]
+        existing = set(session.scalars(select(User.email).where(User.email.in_(emails))))
+        pending: list[ImportRow] = []
+        for row in candidates:
+            if row.email in existing:
+                result.add_error(row.line, row.email, "email already exists")
+            else:
+                pending.append(row)
+        return pending
+
+    def _insert_import_batch(
+        self,
+        session: Session,
+        rows: list[ImportRow],
+        hashes: list[str],
+        role_ids: dict[str, int],
+        result: BulkImportResult,
+    ) -> None:
+        if not rows:
+            return
+        computed = iter(hashes)
+        values = [
+            {"email": row.email, "hashed_password": row.password_hash or next(computed), "is_active": row.is_active}
+            for row in rows
+        ]
+        try:
+            created = session.execute(insert(User).returning(User.id, User.email), values).all()
+            user_ids = {email: user_id for user_id, email in created}
+            links = [
+                {"user_id": user_ids[row.email], "role_id": role_id}
+                for row in rows
+                for role_id in {role_ids[role.lower()] for role in row.roles}
+            ]
+            if links:
+                session.execute(insert(user_roles), links)
+            session.commit()
+        except SQLAlchemyError as exc:
+            session.rollback()
+            for row in rows:
+                result.add_error(row.line, row.email, f"batch insert failed: {exc.__class__.__name__}")
+            return
+        result.created += len(rows)
+
+    def get_by_email(
+        self,
+        session: Session,
+        email: str,
+        *,
+        with_roles: bool = False,
+        with_permissions: bool = False,
+        with_access: bool = False,
+    ) -> User | None:
+        """Return a user by email.
+
+        ``with_roles`` / ``with_permissions`` eager-load the relationships with
+        ``selectin`` loading: one extra statement each, whatever the role count.
+        ``with_access`` loads ``effective_roles`` and ``effective_permissions``
+        (inherited ones included) in one statement each through the closure,
+        and joins the assigned ``roles`` onto the user row itself.
+        """
+
+        statement = self._by_email_statement(email, with_roles, with_permissions, with_access)
+        return session.execute(statement).unique().scalar_one_or_none()
+
+    async def get_by_email_async(
+        self,
+        session: AsyncSession,
+        email: str,
+        *,
+        with_roles: bool = False,
+        with_permissions: bool = False,
+        with_access: bool = False,
+    ) -> User | None:
+        """Awaitable variant of :meth:`get_by_email`.
+
+        Relationships cannot be lazy-loaded under asyncio, so callers must ask
+        for every relationship they are going to read.
+        """
+
+        statement = self._by_email_statement(email, with_roles, with_permissions, with_access)
+        result = await session.execute(statement)
+        return result.unique().scalar_one_or_none()
+
+    async def is_active_async(self, session: AsyncSession, email: str) -> bool:
+        """Return whether ``email`` belongs to an active user, reading that one column only."""
+
+        return bool(await session.scalar(select(User.is_active).where(User.email == email)))
+
+    @staticmethod
+    def _by_email_statement(
+        email: str, with_roles: bool, with_permissions: bool, with_access: bool = False
+    ) -> Select[tuple[User]]:
+        statement = select(User).where(User.email == email)
+        if with_access:
+            statement = statement.options(selectinload(User.effective_roles), selectinload(User.effective_permissions))
+        if with_permissions:
+            statement = statement.options(selectinload(User.roles).selectinload(Role.permissions))
+        elif with_roles:
+            statement = statement.options(selectinload(User.roles))
+        elif with_access:
+            # A single user row: joining its few assigned roles costs no extra round trip.
+            statement = statement.options(joinedload(User.roles))
+        return statement
+
+    async def list_users_async(
+        self,
+        session: AsyncSession,
+        *,
+        after_id: int | None = None,
+        limit: int = 100,
+        role: str | None = None,
+    ) -> list[User]:
+        """Return up to ``limit`` users with an id above ``after_id``, ordered by id.
+
+        Keyset pagination keeps every page an index range scan on the primary
+        key; assigned and effective roles are eager-loaded with one extra
+        statement each per page.
+        """
+
+        statement = (
+            select(User)
+            .options(selectinload(User.roles), selectinload(User.effective_roles))
+            .order_by(User.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            statement = statement.where(User.id > after_id)
+        if role is not None:
+            statement = statement.where(User.roles.any(Role.name == role))
+        result = await session.execute(statement)
+        return list(result.scalars())
+
+    async def iter_users_async(
+        self,
+        session: AsyncSession,
+        *,
+        after_id: int | None = None,
+        role: str | None = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[list[User]]:
+        """Yield every matching user page by page, detaching each page once consumed."""
+
+        while True:
+            page = await self.list_users_async(session, after_id=after_id, limit=page_size, role=role)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            after_id = page[-1].id
+            # Drop the consumed page from the identity map so memory stays flat.
+            session.expunge_all()
 
     def _get_or_create_role(self, session: Session, name: str) -> Role:
         role = session.execute(select(Role).where(Role.name == name)).scalar_one_or_none()
@@ -90,6 +650,7 @@ class UserService:
             role = Role(name=name)
             session.add(role)
             session.flush([role])
+            session.execute(insert(role_closure).values(ancestor_id=role.id, descendant_id=role.id, paths=1))
         return role
 
     def list_role_names(self, user: User) -> list[str]:
@@ -97,16 +658,25 @@ class UserService:
 
         return [role.name for role in user.roles]
 
+    def effective_role_names(self, user: User) -> list[str]:
+        """Return the assigned and inherited role names of a user loaded ``with_access``."""
+
+        return sorted(role.name for role in user.effective_roles)
+
 
 def detach_user_relationships(session: Session) -> None:
     """Helper to clear association tables (useful for tests)."""
 
     session.execute(user_roles.delete())
     session.execute(role_permissions.delete())
+    session.execute(role_hierarchy.delete())
+    session.execute(role_closure.delete())
+    session.execute(delete(AppMeta).where(AppMeta.key == _CATALOG_HASH_KEY))
     session.commit()
+    user_service._notify_change(None)
 
 
 user_service = UserService()
 
 
-__all__ = ["UserService", "user_service", "detach_user_relationships"]
+__all__ = ["UserChangeListener", "UserService", "user_service", "detach_user_relationships"]
@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+import os
 from pathlib import Path
 import sys
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 SRC_PATH = ROOT_DIR / "src"
@@ -18,26 +20,46 @@ for candidate in (ROOT_DIR, SRC_PATH):
     if str(candidate) not in sys.path:
         sys.path.insert(0, str(candidate))
 
+# The cheapest bcrypt cost keeps the many logins in this suite fast.
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
 from src.app.db.base import Base  # noqa: E402
-from src.app.db.session import get_session  # noqa: E402
+from src.app.db.session import (  # noqa: E402
+    get_async_session,
+    get_async_session_factory,
+    get_session,
+    to_async_url,
+)
 from src.app.main import app  # noqa: E402
+from src.app.services.activity import ActivityTracker, get_activity_tracker  # noqa: E402
+from src.app.services.audit import AuditLog, get_audit_log  # noqa: E402
+from src.app.services.throttle import build_login_throttle, get_login_throttle  # noqa: E402
 from src.app.services.users import user_service  # noqa: E402
 
-TEST_DATABASE_URL = "sqlite:///:memory:"
-
 
-def _create_engine():
-    connect_args = {"check_same_thread": False} if TEST_DATABASE_URL.startswith("sqlite") else {}
-    pool_kwargs = {"poolclass": StaticPool} if TEST_DATABASE_URL.startswith("sqlite") else {}
-    return create_engine(TEST_DATABASE_URL, connect_args=connect_args, **pool_kwargs)
+@pytest.fixture(scope="session")
+def database_url(tmp_path_factory: pytest.TempPathFactory) -> str:
+    # A file-backed SQLite database lets the sync fixtures and the async
+    # request path see the same data through two different drivers.
+    return f"sqlite:///{tmp_path_factory.mktemp('db') / 'codex-test.db'}"
 
 
 @pytest.fixture(scope="session")
-def engine() -> Generator:
-    engine = _create_engine()
+def engine(database_url: str) -> Generator:
+    engine = create_engine(database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def async_engine(database_url: str) -> Generator:
+    # NullPool: TestClient runs each client on its own event loop, so
+    # aiosqlite connections must not be reused across clients.
+    engine = create_async_engine(to_async_url(database_url), poolclass=NullPool)
+    yield engine
+    engine.sync_engine.dispose()
 
 
 @pytest.fixture()
@@ -54,17 +76,49 @@ def db_session(engine) -> Generator[Session, None, None]:
 
 
 @pytest.fixture()
-def client(db_session: Session) -> Generator[TestClient, None, None]:
+def audit_log(engine) -> AuditLog:
+    # Not started: tests call ``flush()`` to write queued events deterministically.
+    return AuditLog(sessionmaker(bind=engine))
+
+
+@pytest.fixture()
+def activity_tracker(engine) -> ActivityTracker:
+    # Not started either: tests call ``flush()``.
+    return ActivityTracker(sessionmaker(bind=engine))
+
+
+@pytest.fixture()
+def client(
+    db_session: Session, async_engine, audit_log: AuditLog, activity_tracker: ActivityTracker
+) -> Generator[TestClient, None, None]:
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
     def _override_get_session() -> Generator[Session, None, None]:
         try:
             yield db_session
         finally:
             db_session.rollback()
 
+    async def _override_get_async_session() -> AsyncGenerator[AsyncSession, None]:
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_session] = _override_get_session
+    app.dependency_overrides[get_async_session] = _override_get_async_session
+    app.dependency_overrides[get_async_session_factory] = lambda: TestingAsyncSessionLocal
+    # A fresh throttle per test keeps login counters from leaking between tests.
+    throttle = build_login_throttle()
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+    app.dependency_overrides[get_audit_log] = lambda: audit_log
+    app.dependency_overrides[get_activity_tracker] = lambda: activity_tracker
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.pop(get_session, None)
+    app.dependency_overrides.pop(get_async_session, None)
+    app.dependency_overrides.pop(get_async_session_factory, None)
+    app.dependency_overrides.pop(get_login_throttle, None)
+    app.dependency_overrides.pop(get_audit_log, None)
+    app.dependency_overrides.pop(get_activity_tracker, None)
 
 
 @pytest.fixture()
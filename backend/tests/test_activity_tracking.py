@@ -0,0 +1,145 @@
+"""Tests for write-behind activity timestamps."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.app.models import User
+from src.app.services.activity import ActivityTracker
+
+_T0 = datetime(2026, 5, 1, 9, 0, tzinfo=timezone.utc)
+
+
+class _Clock:
+    def __init__(self, now: datetime = _T0) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _timestamps(session: Session, email: str) -> tuple[datetime | None, datetime | None]:
+    session.expire_all()
+    row = session.execute(select(User.last_login_at, User.last_seen_at).where(User.email == email)).one()
+    return tuple(value.replace(tzinfo=timezone.utc) if value else None for value in row)
+
+
+def _updates(engine, action) -> list[bool]:
+    """Run ``action`` and return the ``executemany`` flag of every UPDATE it issued."""
+
+    seen: list[bool] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("UPDATE"):
+            seen.append(executemany)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return seen
+
+
+def test_requests_touch_without_writing(
+    client: TestClient, create_user, db_session: Session, activity_tracker: ActivityTracker
+) -> None:
+    create_user("seen@example.com", "pass", roles=["viewer"])
+    tokens = client.post("/api/v1/auth/login", json={"email": "seen@example.com", "password": "pass"}).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    for _ in range(3):
+        assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    assert _timestamps(db_session, "seen@example.com") == (None, None)
+    stats = activity_tracker.stats()
+    assert (stats.pending, stats.touches, stats.coalesced) == (1, 4, 3)
+
+    assert activity_tracker.flush() == 1
+    login_at, seen_at = _timestamps(db_session, "seen@example.com")
+    assert login_at is not None and seen_at >= login_at
+
+
+def test_touches_coalesce_into_one_bulk_update(db_session: Session, engine, create_user) -> None:
+    for index in range(3):
+        create_user(f"user{index}@example.com", "pass", roles=["viewer"])
+    clock = _Clock()
+    tracker = ActivityTracker(sessionmaker(bind=engine), clock=clock)
+    for minute in range(10):
+        clock.now = _T0 + timedelta(minutes=minute)
+        for index in range(3):
+            tracker.touch(f"user{index}@example.com", login=minute == 0)
+
+    assert tracker.stats().pending == 3
+    assert _updates(engine, tracker.flush) == [True]
+    assert _timestamps(db_session, "user1@example.com") == (_T0, _T0 + timedelta(minutes=9))
+    assert tracker.stats().pending == 0
+    assert tracker.flush() == 0
+
+
+def test_timestamps_never_move_backwards(db_session: Session, engine, create_user) -> None:
+    create_user("late@example.com", "pass", roles=["viewer"])
+    factory = sessionmaker(bind=engine)
+    current = ActivityTracker(factory, clock=_Clock(_T0 + timedelta(hours=1)))
+    current.touch("late@example.com", login=True)
+    current.flush()
+
+    # A worker flushing an older touch afterwards must not rewind either column.
+    stale = ActivityTracker(factory, clock=_Clock(_T0))
+    stale.touch("late@example.com", login=True)
+    stale.flush()
+    later = ActivityTracker(factory, clock=_Clock(_T0 + timedelta(hours=2)))
+    later.touch("late@example.com")
+    later.flush()
+
+    assert _timestamps(db_session, "late@example.com") == (_T0 + timedelta(hours=1), _T0 + timedelta(hours=2))
+
+
+def test_pending_users_are_bounded(engine) -> None:
+    tracker = ActivityTracker(sessionmaker(bind=engine), max_pending=2)
+    for email in ("a@example.com", "b@example.com", "c@example.com", "a@example.com"):
+        tracker.touch(email)
+
+    stats = tracker.stats()
+    assert (stats.pending, stats.dropped, stats.coalesced) == (2, 1, 1)
+
+
+def test_failed_flush_keeps_timestamps_for_retry(tmp_path: Path) -> None:
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'users.db'}")
+    tracker = ActivityTracker(sessionmaker(bind=unreachable))
+    tracker.touch("retry@example.com", login=True)
+
+    assert tracker.flush() == 0
+    stats = tracker.stats()
+    assert (stats.pending, stats.write_failures, stats.rows_written) == (1, 1, 0)
+
+
+def test_writer_flushes_on_interval_and_on_stop(db_session: Session, engine, create_user) -> None:
+    create_user("first@example.com", "pass", roles=["viewer"])
+    create_user("second@example.com", "pass", roles=["viewer"])
+    tracker = ActivityTracker(sessionmaker(bind=engine), flush_interval_seconds=0.05)
+    tracker.start()
+    try:
+        tracker.touch("first@example.com")
+        deadline = time.monotonic() + 5
+        while tracker.stats().rows_written < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert tracker.stats().rows_written == 1
+        tracker.touch("second@example.com", login=True)
+    finally:
+        tracker.stop()
+
+    assert _timestamps(db_session, "first@example.com")[1] is not None
+    assert _timestamps(db_session, "second@example.com")[0] is not None
+
+
+def test_disabled_tracker_ignores_touches(engine) -> None:
+    tracker = ActivityTracker(sessionmaker(bind=engine), enabled=False)
+    tracker.touch("off@example.com")
+
+    assert tracker.stats().touches == 0
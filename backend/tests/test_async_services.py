@@ -0,0 +1,39 @@
+"""Tests for the async database stack and async service variants."""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.app.db.session import to_async_url
+from src.app.services.auth import auth_service
+from src.app.services.users import user_service
+
+
+def test_to_async_url_maps_known_drivers() -> None:
+    assert to_async_url("sqlite:///./codex.db") == "sqlite+aiosqlite:///./codex.db"
+    assert to_async_url("postgresql+psycopg://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert to_async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_async_user_service_roundtrip(db_session: Session, async_engine) -> None:
+    session_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def _scenario() -> tuple[list[str], set[str], bool]:
+        async with session_factory() as session:
+            await user_service.ensure_default_roles_async(session)
+            await user_service.create_user_async(session, "async@example.com", "async-pass", roles=["manager"])
+        async with session_factory() as session:
+            user = await user_service.get_by_email_async(session, "async@example.com", with_permissions=True)
+            assert user is not None
+            permissions = {permission.name for role in user.roles for permission in role.permissions}
+            valid = await auth_service.verify_password_async("async-pass", user.hashed_password)
+            return user_service.list_role_names(user), permissions, valid
+
+    roles, permissions, valid = asyncio.run(_scenario())
+
+    assert roles == ["manager"]
+    assert "missions:manage" in permissions
+    assert valid
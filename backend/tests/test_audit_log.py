@@ -0,0 +1,230 @@
+"""Tests for the batched audit log and its query endpoint."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.app.models import AuditEvent
+from src.app.services.audit import ACCESS_DENIED, LOGIN, LOGIN_FAILED, REFRESH, REFRESH_FAILED, AuditLog
+from src.app.services.auth import auth_service
+
+
+def _events(session: Session) -> list[tuple[str, str | None, str | None]]:
+    rows = session.execute(select(AuditEvent.event_type, AuditEvent.subject, AuditEvent.detail).order_by(AuditEvent.id))
+    return [tuple(row) for row in rows]
+
+
+def _count(session: Session) -> int:
+    return session.scalar(select(func.count()).select_from(AuditEvent))
+
+
+def _headers(email: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {auth_service.create_access_token(email, [])}"}
+
+
+def test_auth_events_are_queued_then_written(
+    client: TestClient, create_user, db_session: Session, audit_log: AuditLog
+) -> None:
+    create_user("audit@example.com", "pass", roles=["viewer"])
+    assert client.post("/api/v1/auth/login", json={"email": "audit@example.com", "password": "nope"}).status_code == 401
+    assert client.post("/api/v1/auth/login", json={"email": "ghost@example.com", "password": "pass"}).status_code == 401
+    tokens = client.post("/api/v1/auth/login", json={"email": "audit@example.com", "password": "pass"}).json()
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+    # Nothing is written on the request path.
+    assert _count(db_session) == 0
+    assert audit_log.flush() == 5
+
+    assert _events(db_session) == [
+        (LOGIN_FAILED, "audit@example.com", "invalid_password"),
+        (LOGIN_FAILED, "ghost@example.com", "unknown_user"),
+        (LOGIN, "audit@example.com", None),
+        (REFRESH, "audit@example.com", None),
+        (REFRESH_FAILED, None, "invalid_token"),
+    ]
+    event = db_session.scalars(select(AuditEvent)).first()
+    assert event.path == "/api/v1/auth/login"
+    assert event.client_ip == "testclient"
+
+
+def test_access_denied_is_recorded(client: TestClient, create_user, db_session: Session, audit_log: AuditLog) -> None:
+    create_user("viewer@example.com", "pass", roles=["viewer"])
+
+    assert client.get("/api/v1/users", headers=_headers("viewer@example.com")).status_code == 403
+    assert client.get("/api/v1/audit/events", headers=_headers("viewer@example.com")).status_code == 403
+    audit_log.flush()
+
+    assert _events(db_session) == [
+        (ACCESS_DENIED, "viewer@example.com", "requires permission users:manage"),
+        (ACCESS_DENIED, "viewer@example.com", "requires role admin"),
+    ]
+
+
+def test_oversized_values_cannot_fail_a_batch(client: TestClient, db_session: Session, audit_log: AuditLog) -> None:
+    huge = "x" * 10_000 + "@example.com"
+    response = client.post("/api/v1/auth/login", json={"email": huge, "password": "pass"})
+    assert response.status_code == 422
+
+    audit_log.record(LOGIN_FAILED, subject=huge, path="/" + huge, detail=huge)
+    audit_log.record(LOGIN, subject="ok@example.com")
+    assert audit_log.flush() == 2
+    assert audit_log.stats().write_failures == 0
+    subject = db_session.scalar(select(AuditEvent.subject).where(AuditEvent.event_type == LOGIN_FAILED))
+    assert subject == huge[:255]
+
+
+def test_events_are_inserted_in_batches(db_session: Session, engine) -> None:
+    log = AuditLog(sessionmaker(bind=engine), batch_size=100)
+    for index in range(250):
+        log.record(LOGIN, subject=f"user{index}@example.com")
+
+    assert log.flush() == 250
+    stats = log.stats()
+    assert (stats.recorded, stats.written, stats.batches, stats.queued) == (250, 250, 3, 0)
+    assert _count(db_session) == 250
+
+
+def test_overflow_spills_and_replays(db_session: Session, engine, tmp_path: Path) -> None:
+    spill = tmp_path / "audit" / "spill.jsonl"
+    log = AuditLog(sessionmaker(bind=engine), queue_size=2, spill_path=spill)
+    for index in range(5):
+        log.record(LOGIN_FAILED, subject=f"user{index}@example.com", detail="invalid_password")
+
+    stats = log.stats()
+    assert (stats.recorded, stats.spilled, stats.dropped) == (2, 3, 0)
+    assert len(spill.read_text().splitlines()) == 3
+
+    log.stop()
+    restarted = AuditLog(sessionmaker(bind=engine), spill_path=spill)
+    assert restarted.replay_spill() == 3
+    assert not spill.exists()
+    assert sorted(subject for _, subject, _ in _events(db_session)) == [f"user{index}@example.com" for index in range(5)]
+
+
+def test_replay_claims_files_of_other_processes(db_session: Session, engine, tmp_path: Path) -> None:
+    factory = sessionmaker(bind=engine)
+    crashed = AuditLog(factory, queue_size=1, spill_path=tmp_path / "audit-111.jsonl")
+    live = AuditLog(factory, queue_size=1, spill_path=tmp_path / "audit-222.jsonl")
+    for log, name in ((crashed, "crashed"), (live, "live")):
+        for index in range(3):
+            log.record(LOGIN, subject=f"{name}{index}@example.com")
+
+    # A restarted worker has a new pid, so it must replay by pattern rather than by its own path.
+    restarted = AuditLog(factory, spill_path=tmp_path / "audit-333.jsonl", spill_glob="audit-*.jsonl")
+    assert restarted.replay_spill() == 4
+    assert not list(tmp_path.glob("audit-*.jsonl"))
+
+    # The live worker notices its file was replayed and starts a new one; nothing is lost or duplicated.
+    live.record(LOGIN, subject="later@example.com")
+    assert restarted.replay_spill() == 1
+    subjects = sorted(subject for _, subject, _ in _events(db_session))
+    # The first event of each log is still in its queue; only the overflow was spilled.
+    expected = ["crashed1", "crashed2", "later", "live1", "live2"]
+    assert subjects == [f"{name}@example.com" for name in expected]
+
+
+def test_overflow_without_spill_file_drops(engine) -> None:
+    log = AuditLog(sessionmaker(bind=engine), queue_size=1)
+    log.record(LOGIN)
+    log.record(LOGIN)
+
+    assert log.stats().dropped == 1
+
+
+def test_failed_write_goes_to_spill_file(tmp_path: Path) -> None:
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'audit.db'}")
+    spill = tmp_path / "spill.jsonl"
+    log = AuditLog(sessionmaker(bind=unreachable), spill_path=spill)
+    log.record(LOGIN, subject="down@example.com")
+
+    assert log.flush() == 0
+    stats = log.stats()
+    assert (stats.write_failures, stats.spilled, stats.written) == (1, 1, 0)
+    assert "down@example.com" in spill.read_text()
+    log.stop()
+
+
+def test_background_writer_flushes_on_interval_and_stop(db_session: Session, engine) -> None:
+    log = AuditLog(sessionmaker(bind=engine), flush_interval_seconds=0.05)
+    log.start()
+    try:
+        log.record(LOGIN, subject="first@example.com")
+        deadline = time.monotonic() + 5
+        while log.stats().written < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert log.stats().written == 1
+        log.record(LOGIN, subject="second@example.com")
+    finally:
+        started = time.monotonic()
+        log.stop()
+    assert time.monotonic() - started < 1
+    assert [subject for _, subject, _ in _events(db_session)] == ["first@example.com", "second@example.com"]
+
+
+def test_disabled_log_records_nothing(engine) -> None:
+    log = AuditLog(sessionmaker(bind=engine), enabled=False)
+    log.record(LOGIN)
+
+    assert log.stats().recorded == 0
+
+
+@pytest.fixture()
+def seeded_events(db_session: Session, create_user) -> datetime:
+    create_user("root@example.com", "pass", roles=["admin"])
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    db_session.add_all(
+        AuditEvent(
+            occurred_at=base + timedelta(minutes=minute),
+            event_type=LOGIN if minute % 2 == 0 else LOGIN_FAILED,
+            subject=f"user{minute % 3}@example.com",
+        )
+        for minute in range(7)
+    )
+    db_session.commit()
+    return base
+
+
+def test_query_endpoint_pages_newest_first(client: TestClient, seeded_events: datetime) -> None:
+    pages: list[list[int]] = []
+    cursor = None
+    while True:
+        params = {"limit": 3, "since": seeded_events.isoformat()}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/audit/events", params=params, headers=_headers("root@example.com"))
+        assert response.status_code == 200
+        body = response.json()
+        pages.append([item["id"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    ids = [event_id for page in pages for event_id in page]
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 7
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+
+def test_query_endpoint_filters(client: TestClient, seeded_events: datetime) -> None:
+    def _query(**params) -> list[dict]:
+        response = client.get("/api/v1/audit/events", params=params, headers=_headers("root@example.com"))
+        assert response.status_code == 200
+        return response.json()["items"]
+
+    since = seeded_events + timedelta(minutes=2)
+    window = _query(since=since.isoformat(), until=(since + timedelta(minutes=3)).isoformat())
+    assert [item["subject"] for item in window] == ["user1@example.com", "user0@example.com", "user2@example.com"]
+    assert {item["event_type"] for item in _query(event_type=LOGIN_FAILED)} == {LOGIN_FAILED}
+    assert len(_query(event_type=LOGIN_FAILED)) == 3
+    assert len(_query(subject="user0@example.com")) == 3
+
+    response = client.get("/api/v1/audit/events", params={"cursor": "garbage"}, headers=_headers("root@example.com"))
+    assert response.status_code == 400
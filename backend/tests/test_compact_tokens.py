@@ -0,0 +1,74 @@
+"""Tests for the compact access-token profile."""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from jose import jwt
+import pytest
+
+from src.app.core.config import settings
+from src.app.services.auth import AuthError, auth_service
+
+
+def _login(client: TestClient, email: str) -> dict[str, str]:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "pass"})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture()
+def compact(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "jwt_token_profile", "compact")
+
+
+def test_compact_access_token_uses_short_claims(client: TestClient, create_user, compact: None) -> None:
+    create_user("compact@example.com", "pass", roles=["viewer", "tech"])
+    tokens = _login(client, "compact@example.com")
+
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert set(claims) == {"sub", "exp", "t", "jti"}
+    assert claims["t"] == "a"
+    assert len(claims["jti"]) == 12
+    # Refresh tokens keep their jti: rotation depends on it.
+    assert "jti" in jwt.get_unverified_claims(tokens["refresh_token"])
+
+
+def test_compact_token_is_smaller(monkeypatch: pytest.MonkeyPatch) -> None:
+    roles = ["admin", "manager", "viewer"]
+    standard = auth_service.create_access_token("size@example.com", roles, 0b1110)
+    monkeypatch.setattr(settings, "jwt_token_profile", "compact")
+    compact = auth_service.create_access_token("size@example.com", roles, 0b1110)
+
+    assert len(compact) < len(standard)
+    assert auth_service.decode_token(compact, expected_type="access")["pm"] == 0b1110
+
+
+def test_both_profiles_authenticate(client: TestClient, create_user, monkeypatch: pytest.MonkeyPatch) -> None:
+    create_user("rollout@example.com", "pass", roles=["viewer"])
+    standard = _login(client, "rollout@example.com")["access_token"]
+    monkeypatch.setattr(settings, "jwt_token_profile", "compact")
+    compact = _login(client, "rollout@example.com")["access_token"]
+
+    for token in (standard, compact):
+        response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json()["email"] == "rollout@example.com"
+
+
+def test_compact_token_type_is_enforced(client: TestClient, create_user, compact: None) -> None:
+    create_user("typed@example.com", "pass", roles=["viewer"])
+    access = _login(client, "typed@example.com")["access_token"]
+
+    assert auth_service.decode_token(access, expected_type="access")["type"] == "access"
+    with pytest.raises(AuthError):
+        auth_service.decode_token(access, expected_type="refresh")
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": access})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_compact_tokens(client: TestClient, create_user, compact: None) -> None:
+    create_user("leaving@example.com", "pass", roles=["viewer"])
+    headers = {"Authorization": f"Bearer {_login(client, 'leaving@example.com')['access_token']}"}
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 204
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
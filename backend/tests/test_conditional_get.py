@@ -0,0 +1,74 @@
+"""Tests for ETag-based conditional GETs on the profile endpoints."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.api import deps
+from src.app.services.principals import PrincipalCache
+from src.app.services.users import user_service
+
+
+def _login(client: TestClient, email: str) -> dict[str, str]:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "pass"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.parametrize("path", ["/api/v1/users/me", "/api/v1/auth/me"])
+def test_matching_etag_returns_304(client: TestClient, create_user, path: str) -> None:
+    create_user("etag@example.com", "pass", roles=["viewer"])
+    headers = _login(client, "etag@example.com")
+
+    first = client.get(path, headers=headers)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_user_changes_produce_a_new_etag(client: TestClient, create_user, db_session: Session) -> None:
+    create_user("versioned@example.com", "pass", roles=["viewer"])
+    headers = _login(client, "versioned@example.com")
+    etag = client.get("/api/v1/users/me", headers=headers).headers["etag"]
+
+    user = user_service.get_by_email(db_session, "versioned@example.com")
+    assert user is not None
+    user_service.set_user_roles(db_session, user, ["viewer", "tech"])
+
+    response = client.get("/api/v1/users/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert {role["name"] for role in response.json()["roles"]} == {"viewer", "tech"}
+
+
+def test_cached_principal_answers_304_without_sql(
+    client: TestClient, create_user, monkeypatch: pytest.MonkeyPatch, async_engine
+) -> None:
+    cache = PrincipalCache(max_size=8, ttl_seconds=60)
+    monkeypatch.setattr(deps, "principal_cache", cache)
+    user_service.add_change_listener(cache.invalidate)
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    try:
+        create_user("cached-etag@example.com", "pass", roles=["viewer"])
+        headers = _login(client, "cached-etag@example.com")
+        etag = client.get("/api/v1/users/me", headers=headers).headers["etag"]
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+        response = client.get("/api/v1/users/me", headers={**headers, "If-None-Match": etag})
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+    finally:
+        user_service.remove_change_listener(cache.invalidate)
+
+    assert response.status_code == 304
+    assert statements == []
@@ -0,0 +1,137 @@
+"""Tests for planning conflict detection and the week-check endpoint."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+import random
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.app.models import Assignment, Mission, User
+from src.app.services.auth import auth_service
+from src.app.services.conflicts import (
+    DOUBLE_BOOKING,
+    REST_PERIOD,
+    Conflict,
+    PlannedAssignment,
+    find_conflicts,
+    week_bounds,
+)
+
+MONDAY = datetime(2026, 5, 4, tzinfo=timezone.utc)
+
+
+def _shift(assignment_id: int, technician_id: int, start_hour: float, hours: float) -> PlannedAssignment:
+    start_at = MONDAY + timedelta(hours=start_hour)
+    return PlannedAssignment(assignment_id, technician_id, assignment_id, start_at, start_at + timedelta(hours=hours))
+
+
+def _pairs(conflicts: list[Conflict], kind: str) -> set[tuple[int, int]]:
+    return {
+        (conflict.first_assignment_id, conflict.second_assignment_id) for conflict in conflicts if conflict.kind == kind
+    }
+
+
+def test_double_bookings_are_found_per_technician() -> None:
+    planning = [
+        _shift(1, 1, 8, 8),  # 08:00-16:00
+        _shift(2, 1, 12, 8),  # 12:00-20:00, overlaps 1
+        _shift(3, 1, 14, 1),  # overlaps 1 and 2
+        _shift(4, 2, 12, 8),  # another technician: no conflict
+        _shift(5, 1, 20, 2),  # starts as 2 ends: touching, not overlapping
+    ]
+    conflicts = find_conflicts(reversed(planning), min_rest=timedelta(0))
+
+    assert _pairs(conflicts, DOUBLE_BOOKING) == {(1, 2), (1, 3), (2, 3)}
+    overlap = next(conflict for conflict in conflicts if conflict.second_assignment_id == 2)
+    assert (overlap.start_at, overlap.end_at) == (MONDAY + timedelta(hours=12), MONDAY + timedelta(hours=16))
+    assert _pairs(conflicts, REST_PERIOD) == set()
+
+
+def test_rest_is_measured_from_the_latest_end() -> None:
+    planning = [
+        _shift(1, 7, 0, 20),  # Monday 00:00-20:00
+        _shift(2, 7, 2, 2),  # inside 1: a double booking, ends early
+        _shift(3, 7, 28, 8),  # Tuesday 04:00: only 8 h after 1 ended
+        _shift(4, 7, 47, 8),  # Tuesday 23:00: exactly 11 h after 3 ended
+    ]
+    conflicts = find_conflicts(planning, min_rest=timedelta(hours=11))
+
+    assert _pairs(conflicts, DOUBLE_BOOKING) == {(1, 2)}
+    assert _pairs(conflicts, REST_PERIOD) == {(1, 3)}
+    rest = next(conflict for conflict in conflicts if conflict.kind == REST_PERIOD)
+    assert (rest.start_at, rest.end_at) == (MONDAY + timedelta(hours=20), MONDAY + timedelta(hours=28))
+
+
+def test_sweep_matches_pairwise_comparison() -> None:
+    rng = random.Random(3)
+    planning = [_shift(index, rng.randrange(5), rng.randrange(0, 150), rng.randrange(1, 12)) for index in range(300)]
+    expected = {
+        (first.id, second.id)
+        for first in planning
+        for second in planning
+        if first.technician_id == second.technician_id
+        and (first.start_at, first.end_at, first.id) < (second.start_at, second.end_at, second.id)
+        and first.start_at < second.end_at
+        and second.start_at < first.end_at
+    }
+
+    assert _pairs(find_conflicts(planning), DOUBLE_BOOKING) == expected
+
+
+def test_inverted_intervals_are_rejected(db_session: Session, create_user) -> None:
+    with pytest.raises(ValueError):
+        find_conflicts([_shift(1, 1, 8, 8), _shift(2, 1, 12, -2)])
+
+    create_user("tech@example.com", "pass", roles=["tech"])
+    user_id = db_session.scalar(select(User.id).where(User.email == "tech@example.com"))
+    mission = Mission(title="Load-in", start_at=MONDAY, end_at=MONDAY + timedelta(hours=4))
+    db_session.add(Assignment(mission=mission, user_id=user_id, start_at=MONDAY, end_at=MONDAY - timedelta(hours=1)))
+    with pytest.raises(IntegrityError):
+        db_session.commit()
+    db_session.rollback()
+
+
+def test_week_bounds_start_on_monday() -> None:
+    assert week_bounds(date(2026, 5, 10)) == (MONDAY, MONDAY + timedelta(days=7))
+    assert week_bounds(date(2026, 5, 4))[0] == MONDAY
+
+
+def _book(session: Session, email: str, start_at: datetime, hours: float) -> int:
+    user_id = session.scalar(select(User.id).where(User.email == email))
+    mission = Mission(title=f"Show {start_at:%a %H:%M}", start_at=start_at, end_at=start_at + timedelta(hours=hours))
+    assignment = Assignment(mission=mission, user_id=user_id, start_at=mission.start_at, end_at=mission.end_at)
+    session.add(assignment)
+    session.commit()
+    return assignment.id
+
+
+def test_week_endpoint_reports_conflicts(client: TestClient, create_user, db_session: Session) -> None:
+    create_user("planner@example.com", "pass", roles=["viewer"])
+    create_user("tech@example.com", "pass", roles=["tech"])
+    sunday_night = _book(db_session, "tech@example.com", MONDAY - timedelta(hours=4), 3)  # Sunday 20:00-23:00
+    monday_early = _book(db_session, "tech@example.com", MONDAY + timedelta(hours=6), 8)  # 7 h rest only
+    monday_late = _book(db_session, "tech@example.com", MONDAY + timedelta(hours=10), 4)  # overlaps 06:00-14:00
+    _book(db_session, "tech@example.com", MONDAY + timedelta(days=9), 4)  # next week: ignored
+
+    token = auth_service.create_access_token("planner@example.com", [])
+    response = client.get(
+        "/api/v1/planning/week/conflicts",
+        params={"day": "2026-05-06"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["assignments"] == 2
+    assert datetime.fromisoformat(body["start_at"]) == MONDAY
+    found = {(item["kind"], item["first_assignment_id"], item["second_assignment_id"]) for item in body["conflicts"]}
+    assert found == {(REST_PERIOD, sunday_night, monday_early), (DOUBLE_BOOKING, monday_early, monday_late)}
+
+
+def test_week_endpoint_requires_permission(client: TestClient) -> None:
+    assert client.get("/api/v1/planning/week/conflicts").status_code == 401
@@ -0,0 +1,76 @@
+"""Tests for pool configuration, SQLite pragmas and pool statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.app.core.config import Settings
+from src.app.db.pool import TimedQueuePool, apply_sqlite_pragmas, engine_options, pool_stats, sqlite_pragmas
+from src.app.db.session import to_async_url
+
+
+def test_file_database_uses_a_sized_timed_pool(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    config = Settings(db_pool_size=2, db_max_overflow=1, db_pool_timeout_seconds=1.5, db_pool_pre_ping=True)
+    engine = create_engine(url, **engine_options(url, config))
+    try:
+        assert isinstance(engine.pool, TimedQueuePool)
+        with engine.connect() as first, engine.connect() as second, engine.connect() as third:
+            for connection in (first, second, third):
+                connection.execute(text("SELECT 1"))
+            stats = pool_stats(engine.pool, "sync")
+            assert stats.size == 2
+            assert stats.checked_out == 3
+            assert stats.overflow == 1
+        stats = pool_stats(engine.pool, "sync")
+        assert stats.checked_out == 0
+        assert stats.acquisitions >= 3
+        assert stats.wait_seconds_total >= 0
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_keeps_the_default_pool() -> None:
+    options = engine_options("sqlite://", Settings())
+
+    assert "poolclass" not in options
+    assert "pool_size" not in options
+
+
+def test_pragmas_are_applied_to_sync_and_async_connections(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path / 'pragmas.db'}"
+    config = Settings(sqlite_busy_timeout_ms=1234, sqlite_mmap_size=1 << 20, sqlite_synchronous="normal")
+    engine = create_engine(url, **engine_options(url, config))
+    apply_sqlite_pragmas(engine, config)
+    async_url = to_async_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, config, is_async=True))
+    apply_sqlite_pragmas(async_engine.sync_engine, config)
+
+    try:
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+
+        async def _read() -> tuple[str, int]:
+            async with async_engine.connect() as connection:
+                mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+                timeout = (await connection.execute(text("PRAGMA busy_timeout"))).scalar()
+            await async_engine.dispose()
+            return mode, timeout
+
+        assert asyncio.run(_read()) == ("wal", 1234)
+    finally:
+        engine.dispose()
+
+
+def test_invalid_pragma_values_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        sqlite_pragmas(Settings(sqlite_journal_mode="wal; DROP TABLE users"))
+
+    assert sqlite_pragmas(Settings(sqlite_journal_mode="", sqlite_synchronous="", sqlite_busy_timeout_ms=0)) == []
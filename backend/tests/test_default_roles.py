@@ -0,0 +1,64 @@
+"""Tests for the set-based RBAC catalog reconciliation."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
+
+from src.app.models import AppMeta, Permission, Role
+from src.app.models.role import role_permissions
+from src.app.services import users as users_module
+from src.app.services.users import user_service
+
+
+@pytest.fixture()
+def statements(engine):
+    executed: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def _links(session: Session) -> set[tuple[str, str]]:
+    rows = session.execute(
+        select(Role.name, Permission.name)
+        .join(role_permissions, role_permissions.c.role_id == Role.id)
+        .join(Permission, Permission.id == role_permissions.c.permission_id)
+    )
+    return {(role, permission) for role, permission in rows}
+
+
+def test_up_to_date_catalog_costs_one_select(db_session: Session, statements: list[str]) -> None:
+    statements.clear()
+    assert user_service.ensure_default_roles(db_session) is False
+
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+    assert not [sql for sql in statements if sql.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+
+
+def test_reconcile_restores_presets(db_session: Session) -> None:
+    expected = _links(db_session)
+    viewer_id = db_session.scalar(select(Role.id).where(Role.name == "viewer"))
+    manage_id = db_session.scalar(select(Permission.id).where(Permission.name == "users:manage"))
+    db_session.execute(insert(role_permissions).values(role_id=viewer_id, permission_id=manage_id))
+    db_session.execute(role_permissions.delete().where(role_permissions.c.role_id != viewer_id))
+    db_session.get(AppMeta, "rbac_catalog_hash").value = "outdated"
+    db_session.commit()
+
+    assert user_service.ensure_default_roles(db_session) is True
+    assert _links(db_session) == expected
+    assert user_service.ensure_default_roles(db_session) is False
+
+
+def test_catalog_change_is_applied(db_session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    presets = dict(users_module._ROLE_PRESETS)
+    presets["auditor"] = {"permissions": ("auth:login", "missions:view")}
+    monkeypatch.setattr(users_module, "_ROLE_PRESETS", presets)
+
+    assert user_service.ensure_default_roles(db_session) is True
+    assert {("auditor", "auth:login"), ("auditor", "missions:view")} <= _links(db_session)
@@ -0,0 +1,63 @@
+"""Statement-count guarantees for the authentication read paths."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from src.app.core.config import settings
+
+
+@pytest.fixture()
+def statements(async_engine):
+    executed: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+
+def _statement_counts(client: TestClient, statements: list[str], email: str) -> dict[str, int]:
+    counts: dict[str, int] = {}
+
+    statements.clear()
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "pass"})
+    counts["login"] = len(statements)
+    tokens = login.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    statements.clear()
+    client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    # Rotation adds exactly one write on top of the read path.
+    rotations = [statement for statement in statements if statement.startswith("INSERT INTO revoked_tokens")]
+    assert len(rotations) == 1
+    counts["refresh"] = len(statements) - len(rotations)
+
+    for path in ("/api/v1/auth/me", "/api/v1/users/me"):
+        statements.clear()
+        assert client.get(path, headers=headers).status_code == 200
+        counts[path] = len(statements)
+    return counts
+
+
+@pytest.mark.parametrize("embed_permissions", [False, True])
+def test_statement_count_is_independent_of_role_count(
+    client: TestClient,
+    create_user,
+    statements: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    embed_permissions: bool,
+) -> None:
+    monkeypatch.setattr(settings, "jwt_embed_permissions", embed_permissions)
+    create_user("one-role@example.com", "pass", roles=["viewer"])
+    create_user("all-roles@example.com", "pass", roles=["admin", "manager", "tech", "viewer"])
+
+    single = _statement_counts(client, statements, "one-role@example.com")
+    many = _statement_counts(client, statements, "all-roles@example.com")
+
+    assert single == many
+    assert max(single.values()) <= 3
@@ -0,0 +1,97 @@
+"""Tests for the bounded password hashing executor."""
+
+from __future__ import annotations
+
+from contextlib import ExitStack
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.config import Settings
+from src.app.services.auth import auth_service
+from src.app.services import hashing
+from src.app.services.hashing import PasswordHasher, PasswordHasherBusy
+
+
+def test_process_pool_roundtrip() -> None:
+    hasher = PasswordHasher(workers=1, queue_limit=4)
+    try:
+        hashed = hasher.hash("pool-secret")
+        assert hasher.verify("pool-secret", hashed)
+        assert not hasher.verify("other", hashed)
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats.completed == 3
+    assert stats.in_flight == 0
+    assert stats.max_seconds > 0
+
+
+def test_full_queue_rejects_work() -> None:
+    hasher = PasswordHasher(workers=0, queue_limit=1, retry_after_seconds=3)
+    with hasher._slot():
+        with pytest.raises(PasswordHasherBusy) as excinfo:
+            hasher.hash("overflow")
+
+    assert excinfo.value.retry_after == 3
+    assert hasher.stats().rejected == 1
+
+
+def test_hash_many_takes_a_slot_per_chunk_and_leaves_the_rest(monkeypatch: pytest.MonkeyPatch) -> None:
+    hasher = PasswordHasher(workers=0, queue_limit=3)
+    seen: list[int] = []
+
+    def fake_batch(passwords: list[str], rounds: int) -> list[str]:
+        seen.append(hasher.stats().in_flight)
+        return [f"hashed-{password}" for password in passwords]
+
+    monkeypatch.setattr(hashing, "_hash_batch", fake_batch)
+    passwords = [f"pw-{index}" for index in range(25)]
+    # Two logins hold slots: the import still runs, one chunk at a time, instead of queueing them.
+    with hasher._slot(), hasher._slot():
+        assert hasher.hash_many(passwords) == [f"hashed-{password}" for password in passwords]
+
+    assert seen and max(seen) == 3
+    stats = hasher.stats()
+    assert (stats.in_flight, stats.completed, stats.max_seconds) == (0, 25, 0.0)
+
+
+def test_queue_depth_counts_jobs_beyond_the_running_ones() -> None:
+    pooled = PasswordHasher(workers=2, queue_limit=8)
+    threaded = PasswordHasher(workers=0, queue_limit=64)
+    with pooled._slot(), pooled._slot(), pooled._slot():
+        assert (pooled.stats().in_flight, pooled.stats().queue_depth) == (3, 1)
+    # Sync callers hash on the thread they arrived on, so none of them is queued.
+    with ExitStack() as stack:
+        for _ in range(40):
+            stack.enter_context(threaded._slot())
+        assert (threaded.stats().in_flight, threaded.stats().queue_depth) == (40, 0)
+    # Async callers wait for asyncio's default executor once its threads are busy.
+    threaded._in_default_executor = min(32, (os.cpu_count() or 1) + 4) + 3
+    assert threaded.stats().queue_depth == 3
+
+
+def test_pool_is_opt_in_and_spawns_its_workers() -> None:
+    assert Settings().password_hash_workers == 0
+    hasher = PasswordHasher(workers=1, queue_limit=4)
+    try:
+        executor = hasher._get_executor()
+        assert executor._mp_context.get_start_method() == "spawn"
+    finally:
+        hasher.shutdown()
+
+
+def test_login_sheds_load_with_retry_after(
+    client: TestClient, create_user, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    create_user("busy@example.com", "pass", roles=["viewer"])
+    hasher = PasswordHasher(workers=0, queue_limit=1, retry_after_seconds=2)
+    monkeypatch.setattr(auth_service, "_hasher", hasher)
+
+    with hasher._slot():
+        response = client.post("/api/v1/auth/login", json={"email": "busy@example.com", "password": "pass"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,110 @@
+"""Tests for the sliding-window login throttle."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi.testclient import TestClient
+import pytest
+
+from src.app.main import app
+from src.app.services.hashing import password_hasher
+from src.app.services.throttle import InMemoryRateLimitBackend, LoginThrottle, LoginThrottled, get_login_throttle
+
+
+class _FakeClock:
+    def __init__(self, start: float) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sliding_window_weights_the_previous_window() -> None:
+    clock = _FakeClock(1000.0)
+    backend = InMemoryRateLimitBackend(clock=clock)
+
+    async def _scenario() -> list[float]:
+        waits = [await backend.hit("k", 4, 10.0) for _ in range(5)]
+        clock.now = 1012.5  # a quarter into the next window: 4 * 0.75 = 3 still counted
+        waits.append(await backend.hit("k", 4, 10.0))
+        waits.append(await backend.hit("k", 4, 10.0))
+        return waits
+
+    waits = asyncio.run(_scenario())
+
+    assert waits[:4] == [0.0] * 4
+    assert waits[4] == 10.0
+    assert waits[5] == 0.0
+    assert waits[6] > 0  # 3 + 1 current
+
+
+def test_map_is_bounded() -> None:
+    backend = InMemoryRateLimitBackend(max_keys=3)
+
+    async def _fill() -> None:
+        for index in range(10):
+            await backend.hit(f"k{index}", 5, 60.0)
+
+    asyncio.run(_fill())
+
+    assert len(backend) == 3
+    assert backend.evictions == 7
+
+
+def test_throttled_login_returns_429_before_hashing(client: TestClient, create_user) -> None:
+    create_user("stuffed@example.com", "pass", roles=["viewer"])
+    throttle = LoginThrottle(InMemoryRateLimitBackend(), per_email=2, per_ip=100, window_seconds=60.0)
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+
+    for _ in range(2):
+        response = client.post("/api/v1/auth/login", json={"email": "stuffed@example.com", "password": "bad"})
+        assert response.status_code == 401
+
+    hashed_before = password_hasher.stats().completed
+    response = client.post("/api/v1/auth/login", json={"email": "STUFFED@example.com", "password": "pass"})
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert password_hasher.stats().completed == hashed_before
+
+
+def test_per_ip_limit_spans_accounts(client: TestClient) -> None:
+    throttle = LoginThrottle(InMemoryRateLimitBackend(), per_email=100, per_ip=3, window_seconds=60.0)
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+
+    codes = [
+        client.post("/api/v1/auth/login", json={"email": f"spray{index}@example.com", "password": "x"}).status_code
+        for index in range(4)
+    ]
+
+    assert codes == [401, 401, 401, 429]
+
+
+def test_successful_logins_do_not_count_against_the_account(client: TestClient, create_user) -> None:
+    create_user("regular@example.com", "pass", roles=["viewer"])
+    throttle = LoginThrottle(InMemoryRateLimitBackend(), per_email=2, per_ip=100, window_seconds=60.0)
+    app.dependency_overrides[get_login_throttle] = lambda: throttle
+
+    def _login(password: str) -> int:
+        response = client.post("/api/v1/auth/login", json={"email": "regular@example.com", "password": password})
+        return response.status_code
+
+    assert [_login("pass") for _ in range(4)] == [200] * 4
+    assert [_login("bad"), _login("pass")] == [401, 200]
+    assert [_login("bad"), _login("bad"), _login("pass")] == [401, 401, 429]
+
+
+def test_ip_rejection_leaves_the_account_counter_alone() -> None:
+    backend = InMemoryRateLimitBackend()
+    throttle = LoginThrottle(backend, per_email=5, per_ip=1, window_seconds=60.0)
+
+    async def _scenario() -> None:
+        await throttle.check("first@example.com", "203.0.113.7")
+        with pytest.raises(LoginThrottled):
+            await throttle.check("victim@example.com", "203.0.113.7")
+
+    asyncio.run(_scenario())
+
+    # The IP and first@ counters only: nothing was charged to victim@.
+    assert len(backend) == 2
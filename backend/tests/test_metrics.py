@@ -0,0 +1,73 @@
+"""Tests for the request metrics middleware and the Prometheus endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.metrics import MetricsRegistry, RequestDbUsage, instrument_engine, metrics_registry
+
+
+@pytest.fixture()
+def metrics(async_engine) -> MetricsRegistry:
+    instrument_engine(async_engine.sync_engine)
+    metrics_registry.reset()
+    return metrics_registry
+
+
+def _login(client: TestClient, email: str, password: str) -> dict[str, str]:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not found")
+
+
+def test_metrics_are_labelled_by_route_template(client: TestClient, create_user, metrics) -> None:
+    create_user("metrics-admin@example.com", "pass", roles=["admin"])
+    headers = _login(client, "metrics-admin@example.com", "pass")
+    client.get("/api/v1/users/me", headers=headers)
+    client.get("/api/v1/users/me", headers=headers)
+    client.get("/api/v1/does-not-exist")
+
+    response = client.get("/api/v1/metrics", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    route = 'method="GET",route="/api/v1/users/me"'
+    assert _sample(body, f'http_requests_total{{{route},status="200"}}') == 2
+    assert _sample(body, f'http_request_duration_seconds_count{{{route}}}') == 2
+    assert _sample(body, f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 2
+    assert _sample(body, f"http_request_db_statements_total{{{route}}}") > 0
+    assert 'route="<unmatched>",status="404"' in body
+    assert "/does-not-exist" not in body
+    assert _sample(body, "db_statements_total") > 0
+    assert 'db_pool_checked_out{pool="sync"}' in body
+
+
+def test_metrics_endpoint_requires_admin(client: TestClient, create_user, metrics) -> None:
+    create_user("metrics-viewer@example.com", "pass", roles=["viewer"])
+    headers = _login(client, "metrics-viewer@example.com", "pass")
+
+    assert client.get("/api/v1/metrics").status_code in {401, 403}
+    assert client.get("/api/v1/metrics", headers=headers).status_code == 403
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.5):
+        registry.request_started()
+        registry.observe_request("GET", "/x", 200, seconds, RequestDbUsage(statements=1, seconds=0.001))
+
+    body = registry.render()
+
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.01"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.1"} 2' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="+Inf"} 3' in body
+    assert 'http_request_db_statements_total{method="GET",route="/x"} 3' in body
+    assert "http_requests_in_flight 0" in body
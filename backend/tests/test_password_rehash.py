@@ -0,0 +1,77 @@
+"""Tests for the configurable bcrypt cost and rehash-on-login."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy.orm import Session
+
+from src.app.models import User
+from src.app.scripts.calibrate_bcrypt import recommend_rounds
+from src.app.services.auth import auth_service
+from src.app.services.hashing import PasswordHasher
+
+
+def _cost(hashed: str) -> int:
+    return int(hashed.split("$")[2])
+
+
+def _stored_hash(db_session: Session, email: str) -> str:
+    db_session.expire_all()
+    return db_session.query(User).filter_by(email=email).one().hashed_password
+
+
+def test_hasher_uses_configured_rounds() -> None:
+    hasher = PasswordHasher(workers=0, queue_limit=4, rounds=5)
+
+    assert _cost(hasher.hash("secret")) == 5
+    with pytest.raises(ValueError):
+        PasswordHasher(workers=0, queue_limit=4, rounds=3)
+
+
+def test_verify_and_update_only_rehashes_outdated_costs() -> None:
+    hasher = PasswordHasher(workers=0, queue_limit=4, rounds=4)
+    outdated = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("secret")
+
+    verified, new_hash = hasher.verify_and_update("secret", outdated)
+    assert verified and new_hash is not None and _cost(new_hash) == 4
+    assert hasher.verify_and_update("secret", new_hash) == (True, None)
+    assert hasher.verify_and_update("wrong", outdated) == (False, None)
+
+
+def test_login_rolls_stored_hash_to_configured_cost(
+    client: TestClient, create_user, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    create_user("rehash@example.com", "secret", roles=["viewer"])
+    monkeypatch.setattr(auth_service, "_hasher", PasswordHasher(workers=0, queue_limit=4, rounds=5))
+
+    response = client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": "secret"})
+    assert response.status_code == 200
+    upgraded = _stored_hash(db_session, "rehash@example.com")
+    assert _cost(upgraded) == 5
+
+    response = client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": "secret"})
+    assert response.status_code == 200
+    assert _stored_hash(db_session, "rehash@example.com") == upgraded
+
+
+def test_failed_login_keeps_stored_hash(
+    client: TestClient, create_user, db_session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    create_user("norehash@example.com", "secret", roles=["viewer"])
+    original = _stored_hash(db_session, "norehash@example.com")
+    monkeypatch.setattr(auth_service, "_hasher", PasswordHasher(workers=0, queue_limit=4, rounds=5))
+
+    response = client.post("/api/v1/auth/login", json={"email": "norehash@example.com", "password": "wrong"})
+
+    assert response.status_code == 401
+    assert _stored_hash(db_session, "norehash@example.com") == original
+
+
+def test_recommend_rounds_respects_target_and_floor() -> None:
+    timings = {10: 0.06, 11: 0.12, 12: 0.25, 13: 0.5}
+
+    assert recommend_rounds(timings, target_seconds=0.3) == 12
+    assert recommend_rounds(timings, target_seconds=0.01) == 10
+    assert recommend_rounds(timings, target_seconds=0.01, floor=11) == 11
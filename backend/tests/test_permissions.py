@@ -0,0 +1,115 @@
+"""Tests for the compiled RBAC permission engine."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.app.api import deps
+from src.app.api.deps import require_permissions
+from src.app.core.config import settings
+from src.app.db.session import get_async_session
+from src.app.models import Permission
+from src.app.services.permissions import PermissionEngine, has_permissions, mask_of, permission_engine
+from src.app.services.users import detach_user_relationships, user_service
+
+
+@pytest.fixture()
+def guarded_client(db_session: Session, async_engine) -> Generator[TestClient, None, None]:
+    session_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def _override() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    guarded = FastAPI()
+
+    @guarded.get("/missions", dependencies=[Depends(require_permissions("missions:manage"))])
+    async def _missions() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @guarded.get("/unknown", dependencies=[Depends(require_permissions("missions:fly"))])
+    async def _unknown() -> dict[str, str]:
+        return {"status": "ok"}
+
+    guarded.dependency_overrides[get_async_session] = _override
+    permission_engine.invalidate()
+    with TestClient(guarded) as test_client:
+        yield test_client
+
+
+def _headers(email: str, roles: list[str], mask: int | None = None) -> dict[str, str]:
+    from src.app.services.auth import auth_service
+
+    return {"Authorization": f"Bearer {auth_service.create_access_token(email, roles, mask)}"}
+
+
+def test_compile_builds_permission_bits(db_session: Session) -> None:
+    engine = PermissionEngine()
+    catalog = engine.compile(db_session)
+
+    manage = engine.required_mask(["missions:manage"])
+    assert manage is not None
+    assert manage == catalog.permission_bits["missions:manage"]
+    granted = mask_of(permission.id for permission in db_session.scalars(select(Permission)))
+    assert has_permissions(granted, manage)
+    assert not has_permissions(granted & ~manage, manage)
+    assert engine.required_mask(["missions:manage", "missions:fly"]) is None
+
+
+def test_catalog_change_marks_engine_stale(db_session: Session) -> None:
+    engine = PermissionEngine()
+    engine.compile(db_session)
+    listener = lambda email: engine.invalidate()  # noqa: E731
+    user_service.add_change_listener(listener)
+    try:
+        detach_user_relationships(db_session)
+    finally:
+        user_service.remove_change_listener(listener)
+
+    assert engine.is_stale
+    assert engine.compile(db_session).version == 2
+
+
+def test_require_permissions_uses_principal_mask(guarded_client: TestClient, create_user) -> None:
+    create_user("manager@example.com", "pass", roles=["manager"])
+    create_user("viewer@example.com", "pass", roles=["viewer"])
+
+    assert guarded_client.get("/missions", headers=_headers("manager@example.com", ["manager"])).status_code == 200
+    assert guarded_client.get("/missions", headers=_headers("viewer@example.com", ["viewer"])).status_code == 403
+    assert guarded_client.get("/unknown", headers=_headers("manager@example.com", ["manager"])).status_code == 403
+    assert guarded_client.get("/missions").status_code == 401
+
+
+def test_embedded_mask_skips_principal_lookup(
+    guarded_client: TestClient,
+    client: TestClient,
+    create_user,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "jwt_embed_permissions", True)
+    create_user("embedded@example.com", "pass", roles=["manager"])
+    login = client.post("/api/v1/auth/login", json={"email": "embedded@example.com", "password": "pass"})
+    token = login.json()["access_token"]
+    assert jwt.get_unverified_claims(token)["pm"] > 0
+
+    async def _fail(*_: object) -> None:
+        raise AssertionError("principal should not be loaded")
+
+    monkeypatch.setattr(deps, "_load_principal", _fail)
+    response = guarded_client.get("/missions", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    # A deactivated account loses access before its token expires.
+    user = user_service.get_by_email(db_session, "embedded@example.com")
+    user_service.set_user_active(db_session, user, False)
+    response = guarded_client.get("/missions", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
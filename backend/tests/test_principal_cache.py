@@ -0,0 +1,88 @@
+"""Tests for the authenticated principal cache."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.app.api import deps
+from src.app.services.principals import Principal, PrincipalCache
+from src.app.services.users import user_service
+
+
+@pytest.fixture()
+def enabled_cache(monkeypatch: pytest.MonkeyPatch):
+    cache = PrincipalCache(max_size=32, ttl_seconds=60)
+    monkeypatch.setattr(deps, "principal_cache", cache)
+    user_service.add_change_listener(cache.invalidate)
+    yield cache
+    user_service.remove_change_listener(cache.invalidate)
+
+
+@pytest.fixture()
+def statements(async_engine):
+    executed: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+
+def _login(client: TestClient, email: str, password: str) -> dict[str, str]:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_cached_principal_requires_no_sql(client: TestClient, create_user, enabled_cache, statements) -> None:
+    create_user("cached@example.com", "pass", roles=["admin"])
+    headers = _login(client, "cached@example.com", "pass")
+
+    statements.clear()
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert statements
+
+    statements.clear()
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert client.get("/api/v1/users/admin/pulse", headers=headers).status_code == 200
+    assert statements == []
+    assert enabled_cache.stats().hit_rate > 0
+
+
+def test_role_change_invalidates_cached_principal(
+    client: TestClient, db_session: Session, create_user, enabled_cache
+) -> None:
+    create_user("promoted@example.com", "pass", roles=["viewer"])
+    headers = _login(client, "promoted@example.com", "pass")
+    assert client.get("/api/v1/users/admin/pulse", headers=headers).status_code == 403
+
+    user = user_service.get_by_email(db_session, "promoted@example.com")
+    assert user is not None
+    user_service.set_user_roles(db_session, user, ["admin"])
+
+    assert client.get("/api/v1/users/admin/pulse", headers=headers).status_code == 200
+    user_service.set_user_active(db_session, user, False)
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+
+
+def test_stale_put_is_discarded_after_invalidation() -> None:
+    cache = PrincipalCache(max_size=4, ttl_seconds=60)
+    principal = Principal(1, "race@example.com", True, ("viewer",), frozenset({"missions:view"}))
+
+    generation = cache.generation
+    cache.invalidate("race@example.com")
+    cache.put(principal, generation)
+
+    assert cache.get("race@example.com") is None
+
+
+def test_disabled_cache_never_stores() -> None:
+    cache = PrincipalCache(max_size=4, ttl_seconds=0)
+    principal = Principal(1, "off@example.com", True, (), frozenset())
+    cache.put(principal, cache.generation)
+
+    assert cache.get("off@example.com") is None
@@ -0,0 +1,140 @@
+"""Tests for read-replica routing, using two SQLite files as primary and replica."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.app.db.base import Base
+from src.app.db.routing import ReplicaSet, RoutingSession
+from src.app.db.session import to_async_url
+from src.app.models import User
+from src.app.services.users import user_service
+
+
+def _database(path: Path, email: str) -> Engine:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), {"email": email, "hashed_password": "x", "is_active": True})
+    return engine
+
+
+@pytest.fixture()
+def primary(tmp_path: Path) -> Engine:
+    return _database(tmp_path / "primary.db", "primary@example.com")
+
+
+@pytest.fixture()
+def replica(tmp_path: Path) -> Engine:
+    return _database(tmp_path / "replica.db", "replica@example.com")
+
+
+def _emails(session: RoutingSession) -> list[str]:
+    return list(session.scalars(select(User.email)))
+
+
+def test_reads_go_to_replica_until_the_session_writes(primary: Engine, replica: Engine) -> None:
+    replicas = ReplicaSet([replica])
+    factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=replicas, expire_on_commit=False)
+
+    with factory() as session:
+        assert _emails(session) == ["replica@example.com"]
+        session.add(User(email="written@example.com", hashed_password="x"))
+        session.commit()
+        assert session.pinned_to_primary
+        assert _emails(session) == ["primary@example.com", "written@example.com"]
+
+    assert replicas.stats().routed_reads == 1
+
+
+def test_locking_and_textual_statements_use_primary(primary: Engine, replica: Engine) -> None:
+    factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=ReplicaSet([replica]))
+
+    with factory() as session:
+        assert session.scalars(select(User.email).with_for_update()).all() == ["primary@example.com"]
+    with factory() as session:
+        assert session.execute(text("SELECT email FROM users")).scalars().all() == ["primary@example.com"]
+    with factory() as session:
+        session.use_primary()
+        assert _emails(session) == ["primary@example.com"]
+
+
+def test_one_replica_per_transaction_round_robin_across(tmp_path: Path, primary: Engine, replica: Engine) -> None:
+    second = _database(tmp_path / "replica-2.db", "second@example.com")
+    replicas = ReplicaSet([replica, second])
+    factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=replicas)
+
+    with factory() as session:
+        # Every read of a transaction sees the same replica...
+        first = {email for _ in range(4) for email in _emails(session)}
+        session.commit()
+        # ...and the next transaction moves on to the next one.
+        after_commit = set(_emails(session))
+    with factory() as session:
+        next_session = set(_emails(session))
+
+    assert len(first) == 1
+    assert first | after_commit == {"replica@example.com", "second@example.com"}
+    assert next_session == first
+    assert replicas.stats().routed_reads == 3
+
+
+def test_failed_replica_is_ejected_and_reads_fall_back(tmp_path: Path, primary: Engine) -> None:
+    now = [0.0]
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet([broken], eject_seconds=30, clock=lambda: now[0])
+    factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=replicas)
+
+    # The failed read is retried on the primary instead of reaching the caller.
+    with factory() as session:
+        assert _emails(session) == ["primary@example.com"]
+        assert _emails(session) == ["primary@example.com"]
+    assert replicas.stats().healthy == 0
+    assert replicas.stats().fallbacks == 1
+
+    with factory() as session:
+        assert _emails(session) == ["primary@example.com"]
+    assert replicas.stats().fallbacks == 2
+
+    now[0] = 31.0
+    assert replicas.choose() is broken
+    assert replicas.stats().ejections == 1
+
+
+def test_query_errors_on_a_healthy_replica_are_not_retried(primary: Engine, replica: Engine) -> None:
+    factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=ReplicaSet([replica]))
+
+    with factory() as session, pytest.raises(OperationalError):
+        session.execute(select(User.email).where(text("no_such_column = 1")))
+
+
+def test_async_sessions_route_reads(tmp_path: Path, primary: Engine, replica: Engine) -> None:
+    async_primary = create_async_engine(to_async_url(str(primary.url)))
+    async_replica = create_async_engine(to_async_url(str(replica.url)))
+    factory = async_sessionmaker(
+        bind=async_primary,
+        sync_session_class=RoutingSession,
+        replicas=ReplicaSet([async_replica.sync_engine]),
+        expire_on_commit=False,
+    )
+
+    async def _run() -> tuple[bool, bool]:
+        try:
+            async with factory() as session:
+                on_replica = await user_service.get_by_email_async(session, "replica@example.com") is not None
+                await user_service.create_user_async(session, "async@example.com", "pass")
+                after_write = await user_service.get_by_email_async(session, "async@example.com") is not None
+            return on_replica, after_write
+        finally:
+            await async_primary.dispose()
+            await async_replica.dispose()
+
+    assert asyncio.run(_run()) == (True, True)
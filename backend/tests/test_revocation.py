@@ -0,0 +1,147 @@
+"""Tests for refresh-token rotation, logout and the revocation denylist."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.app.models import RevokedToken
+from src.app.services.auth import AuthError, AuthService
+from src.app.services.revocation import RevocationService, TokenDenylist
+
+
+class _FakeClock:
+    def __init__(self, start: float) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _login(client: TestClient, email: str) -> dict[str, str]:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "pass"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_refresh_token_is_single_use(client: TestClient, create_user) -> None:
+    create_user("rotate@example.com", "pass", roles=["viewer"])
+    tokens = _login(client, "rotate@example.com")
+
+    first = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    replay = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    chained = client.post("/api/v1/auth/refresh", json={"refresh_token": first.json()["refresh_token"]})
+
+    assert first.status_code == 200
+    assert replay.status_code == 401
+    assert chained.status_code == 200
+
+
+def test_reuse_is_detected_through_the_database(client: TestClient, create_user, db_session: Session) -> None:
+    # Another worker's denylist never saw the rotation; the primary key still stops the replay.
+    create_user("replay@example.com", "pass", roles=["viewer"])
+    tokens = _login(client, "replay@example.com")
+    service = AuthService(denylist=TokenDenylist())
+    payload = service.decode_token(tokens["refresh_token"], expected_type="refresh")
+    other_worker = RevocationService(TokenDenylist())
+
+    assert other_worker.rotate(db_session, payload) is True
+    assert other_worker.rotate(db_session, payload) is False
+
+
+def test_logout_revokes_access_and_refresh_tokens(
+    client: TestClient, create_user, db_session: Session, async_engine
+) -> None:
+    create_user("logout@example.com", "pass", roles=["viewer"])
+    tokens = _login(client, "logout@example.com")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 204
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+        assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+    assert statements == []
+
+    reasons = db_session.execute(select(RevokedToken.token_type, RevokedToken.reason)).all()
+    assert sorted(reasons) == [("access", "logout"), ("refresh", "logout")]
+
+
+def test_startup_load_skips_and_purges_expired_rows(db_session: Session) -> None:
+    now = int(time.time())
+    db_session.add_all(
+        [
+            RevokedToken(jti="live", subject="a", token_type="refresh", reason="logout", expires_at=now + 600),
+            RevokedToken(jti="gone", subject="a", token_type="refresh", reason="logout", expires_at=now - 1),
+        ]
+    )
+    db_session.commit()
+    denylist = TokenDenylist()
+
+    assert RevocationService(denylist).load(db_session) == 1
+    assert "live" in denylist
+    assert "gone" not in denylist
+    assert db_session.execute(select(RevokedToken.jti)).scalars().all() == ["live"]
+
+
+def test_sync_picks_up_revocations_of_other_workers(db_session: Session, engine) -> None:
+    now = int(time.time())
+    revoking, other = RevocationService(TokenDenylist()), RevocationService(TokenDenylist())
+    assert other.load(db_session) == 0
+
+    revoking.revoke(db_session, {"jti": "first", "exp": now + 600, "sub": "a", "type": "access"}, reason="logout")
+    assert "first" not in other.denylist
+    assert other.sync(db_session) == 1
+    assert "first" in other.denylist
+
+    revoking.revoke(db_session, {"jti": "second", "exp": now + 600, "sub": "a", "type": "access"}, reason="logout")
+    # The background thread does the same on its own sessions.
+    syncing = RevocationService(other.denylist, sessionmaker(bind=engine), sync_interval_seconds=0.02)
+    syncing.start()
+    try:
+        deadline = time.monotonic() + 5
+        while "second" not in other.denylist and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        started = time.monotonic()
+        syncing.stop()
+    assert "second" in other.denylist
+    assert time.monotonic() - started < 1
+
+
+def test_denylist_prunes_entries_at_expiry() -> None:
+    clock = _FakeClock(1000.0)
+    denylist = TokenDenylist(clock=clock)
+    denylist.add("a", 1010.0)
+    denylist.add("b", 1100.0)
+
+    assert "a" in denylist and "b" in denylist
+    clock.now = 1050.0
+    assert "a" not in denylist
+    assert denylist.prune() == 1
+    assert len(denylist) == 1
+    assert denylist.stats().pruned == 1
+
+
+def test_decode_rejects_denylisted_jti() -> None:
+    denylist = TokenDenylist()
+    service = AuthService(denylist=denylist)
+    token = service.create_access_token("deny@example.com", ["viewer"])
+    payload = service.decode_token(token)
+    denylist.add(payload["jti"], float(payload["exp"]))
+
+    with pytest.raises(AuthError):
+        service.decode_token(token)
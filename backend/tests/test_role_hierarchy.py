@@ -0,0 +1,168 @@
+"""Tests for role inheritance and the incrementally maintained role closure."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.app.api.deps import require_roles
+from src.app.db.session import get_async_session
+from src.app.models import AppMeta, Role, User
+from src.app.models.role import role_closure, role_hierarchy
+from src.app.services.auth import auth_service
+from src.app.services.users import user_service
+
+
+def _closure(session: Session) -> dict[tuple[str, str], int]:
+    ancestor = select(Role.name).where(Role.id == role_closure.c.ancestor_id).scalar_subquery()
+    descendant = select(Role.name).where(Role.id == role_closure.c.descendant_id).scalar_subquery()
+    rows = session.execute(select(ancestor, descendant, role_closure.c.paths))
+    return {(parent, child): paths for parent, child, paths in rows}
+
+
+def _recomputed_closure(session: Session) -> dict[tuple[str, str], int]:
+    names = dict(session.execute(select(Role.id, Role.name)).all())
+    children: dict[int, list[int]] = {role_id: [] for role_id in names}
+    for parent_id, child_id in session.execute(select(role_hierarchy.c.parent_id, role_hierarchy.c.child_id)):
+        children[parent_id].append(child_id)
+
+    def _paths(role_id: int) -> dict[int, int]:
+        counts = {role_id: 1}
+        for child_id in children[role_id]:
+            for descendant_id, paths in _paths(child_id).items():
+                counts[descendant_id] = counts.get(descendant_id, 0) + paths
+        return counts
+
+    return {
+        (names[ancestor_id], names[descendant_id]): paths
+        for ancestor_id in names
+        for descendant_id, paths in _paths(ancestor_id).items()
+    }
+
+
+def _user_id(session: Session, email: str) -> int:
+    return session.scalar(select(User.id).where(User.email == email))
+
+
+def test_presets_inherit_permissions(db_session: Session, create_user, engine) -> None:
+    create_user("admin@example.com", "pass", roles=["admin"])
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    user_id = _user_id(db_session, "admin@example.com")
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        permissions = user_service.effective_permission_names(db_session, user_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert permissions == {"auth:login", "auth:refresh", "users:manage", "missions:manage", "missions:view"}
+    assert len(statements) == 1
+    assert _closure(db_session) == _recomputed_closure(db_session)
+
+
+def test_closure_tracks_diamonds_incrementally(db_session: Session) -> None:
+    for parent, child in (("top", "left"), ("top", "right"), ("left", "base"), ("right", "base")):
+        assert user_service.include_role(db_session, parent, child) is True
+    assert user_service.include_role(db_session, "top", "left") is False
+    assert _closure(db_session)[("top", "base")] == 2
+
+    assert user_service.exclude_role(db_session, "left", "base") is True
+    assert _closure(db_session)[("top", "base")] == 1
+    assert _closure(db_session) == _recomputed_closure(db_session)
+
+    assert user_service.exclude_role(db_session, "right", "base") is True
+    assert ("top", "base") not in _closure(db_session)
+    assert user_service.exclude_role(db_session, "right", "base") is False
+    assert _closure(db_session) == _recomputed_closure(db_session)
+
+
+def test_cycles_are_rejected(db_session: Session) -> None:
+    with pytest.raises(ValueError):
+        user_service.include_role(db_session, "viewer", "admin")
+    with pytest.raises(ValueError):
+        user_service.include_role(db_session, "viewer", "viewer")
+
+    assert _closure(db_session) == _recomputed_closure(db_session)
+
+
+def test_reconcile_rebuilds_hierarchy(db_session: Session) -> None:
+    expected = _closure(db_session)
+    user_service.exclude_role(db_session, "admin", "manager")
+    user_service.include_role(db_session, "admin", "tech")
+    db_session.execute(role_closure.delete().where(role_closure.c.ancestor_id == role_closure.c.descendant_id))
+    db_session.get(AppMeta, "rbac_catalog_hash").value = "outdated"
+    db_session.commit()
+
+    assert user_service.ensure_default_roles(db_session) is True
+    assert _closure(db_session) == expected
+
+
+def test_hierarchy_changes_produce_a_new_etag(client: TestClient, create_user, db_session: Session) -> None:
+    create_user("lead@example.com", "pass", roles=["manager"])
+    create_user("field@example.com", "pass", roles=["tech"])
+
+    def _profile(email: str, etag: str | None = None):
+        headers = {"Authorization": f"Bearer {auth_service.create_access_token(email, [])}"}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        return client.get("/api/v1/users/me", headers=headers)
+
+    lead_etag = _profile("lead@example.com").headers["etag"]
+    field_etag = _profile("field@example.com").headers["etag"]
+    user_service.include_role(db_session, "viewer", "auditor")
+
+    response = _profile("lead@example.com", lead_etag)
+    assert response.status_code == 200
+    assert "auditor" in {role["name"] for role in response.json()["effective_roles"]}
+    # Tech also includes viewer, so it is affected as well.
+    assert _profile("field@example.com", field_etag).status_code == 200
+
+    lead_etag = response.headers["etag"]
+    user_service.exclude_role(db_session, "viewer", "auditor")
+    assert _profile("lead@example.com", lead_etag).status_code == 200
+
+
+@pytest.fixture()
+def role_client(db_session: Session, async_engine) -> Generator[TestClient, None, None]:
+    session_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def _override() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    guarded = FastAPI()
+
+    @guarded.get("/plans", dependencies=[Depends(require_roles("viewer"))])
+    async def _plans() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @guarded.get("/planning", dependencies=[Depends(require_roles("manager"))])
+    async def _planning() -> dict[str, str]:
+        return {"status": "ok"}
+
+    guarded.dependency_overrides[get_async_session] = _override
+    with TestClient(guarded) as test_client:
+        yield test_client
+
+
+def test_require_roles_honours_inherited_roles(role_client: TestClient, create_user) -> None:
+    create_user("boss@example.com", "pass", roles=["admin"])
+    create_user("field@example.com", "pass", roles=["tech"])
+
+    def _get(path: str, email: str) -> int:
+        token = auth_service.create_access_token(email, [])
+        return role_client.get(path, headers={"Authorization": f"Bearer {token}"}).status_code
+
+    assert _get("/plans", "boss@example.com") == 200
+    assert _get("/planning", "boss@example.com") == 200
+    assert _get("/plans", "field@example.com") == 200
+    assert _get("/planning", "field@example.com") == 403
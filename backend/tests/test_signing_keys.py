@@ -0,0 +1,110 @@
+"""Tests for asymmetric token signing and the JWKS endpoint."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+
+from src.app.api import well_known
+from src.app.main import app
+from src.app.scripts.generate_signing_key import generate_private_pem
+from src.app.services.auth import AuthError, AuthService
+from src.app.services.keys import KeyConfigurationError, KeyRegistry
+from src.app.services.revocation import TokenDenylist
+
+
+@pytest.fixture()
+def keys_dir(tmp_path: Path) -> Path:
+    (tmp_path / "k1.pem").write_bytes(generate_private_pem("RS256"))
+    (tmp_path / "k2.pem").write_bytes(generate_private_pem("RS256"))
+    return tmp_path
+
+
+def test_tokens_carry_kid_and_verify_with_the_published_key(keys_dir: Path) -> None:
+    registry = KeyRegistry(keys_dir, "k1", "RS256")
+    service = AuthService(keys=registry, denylist=TokenDenylist())
+
+    token = service.create_access_token("rs@example.com", ["viewer"])
+
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert service.decode_token(token, expected_type="access")["sub"] == "rs@example.com"
+    # A downstream service only needs the JWKS entry to verify locally.
+    body, _ = registry.jwks()
+    published = next(key for key in json.loads(body)["keys"] if key["kid"] == "k1")
+    assert jwt.decode(token, jwk.construct(published, "RS256"), algorithms=["RS256"])["sub"] == "rs@example.com"
+
+
+def test_rotation_keeps_old_tokens_valid_until_the_key_is_removed(keys_dir: Path) -> None:
+    registry = KeyRegistry(keys_dir, "k1", "RS256")
+    service = AuthService(keys=registry, denylist=TokenDenylist())
+    old_token = service.create_access_token("rotate@example.com", ["viewer"])
+
+    registry.reload(active_kid="k2")
+    new_token = service.create_access_token("rotate@example.com", ["viewer"])
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+    assert service.decode_token(old_token)["sub"] == "rotate@example.com"
+
+    (keys_dir / "k1.pem").unlink()
+    registry.reload()
+    with pytest.raises(AuthError):
+        service.decode_token(old_token)
+
+
+def test_key_files_are_reloaded_when_they_change(keys_dir: Path) -> None:
+    now = [0.0]
+    registry = KeyRegistry(keys_dir, "k1", "RS256", reload_seconds=30, clock=lambda: now[0])
+    _, etag = registry.jwks()
+
+    (keys_dir / "k3.pem").write_bytes(generate_private_pem("RS256"))
+    assert registry.verification_key("k3") is None
+    now[0] = 31.0
+    assert registry.verification_key("k3") is not None
+    assert registry.jwks()[1] != etag
+
+    # A broken file keeps the previous keys in service.
+    (keys_dir / "k4.pem").write_text("not a key")
+    now[0] = 62.0
+    assert registry.verification_key("k3") is not None
+    assert registry.verification_key("k4") is None
+
+
+def test_hmac_tokens_are_rejected_by_an_asymmetric_registry(keys_dir: Path) -> None:
+    hmac_token = AuthService(denylist=TokenDenylist()).create_access_token("hs@example.com", ["viewer"])
+    service = AuthService(keys=KeyRegistry(keys_dir, "k1", "RS256"), denylist=TokenDenylist())
+
+    with pytest.raises(AuthError):
+        service.decode_token(hmac_token)
+
+
+def test_active_key_must_be_private(keys_dir: Path) -> None:
+    with pytest.raises(KeyConfigurationError):
+        KeyRegistry(keys_dir, "missing", "RS256")
+
+
+def test_jwks_endpoint_sets_cache_headers(keys_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(well_known, "key_registry", KeyRegistry(keys_dir, "k1", "RS256"))
+    client = TestClient(app)
+
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/jwk-set+json"
+    assert "max-age=" in response.headers["cache-control"]
+    keys = response.json()["keys"]
+    assert {key["kid"] for key in keys} == {"k1", "k2"}
+    assert all("d" not in key for key in keys)
+
+    etag = response.headers["etag"]
+    cached = client.get("/.well-known/jwks.json", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert cached.status_code == 304
+    assert client.get("/.well-known/jwks.json", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/.well-known/jwks.json", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_jwks_endpoint_is_absent_for_hmac_signing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(well_known, "key_registry", None)
+
+    assert TestClient(app).get("/.well-known/jwks.json").status_code == 404
@@ -0,0 +1,103 @@
+"""Tests for the application factory and the one-time startup coordinator."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from src.app import main
+from src.app.core.config import Settings
+from src.app.db.base import Base
+from src.app.db.bootstrap import StartupCoordinator, upgrade_schema
+
+
+def _coordinator(tmp_path: Path, fingerprint: str = "v1") -> StartupCoordinator:
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}", connect_args={"check_same_thread": False})
+    return StartupCoordinator(engine, fingerprint=fingerprint, lock_path=tmp_path / "startup.lock", timeout_seconds=10)
+
+
+def _create_schema(session: Session) -> None:
+    Base.metadata.create_all(bind=session.get_bind())
+
+
+def test_concurrent_workers_initialise_exactly_once(tmp_path: Path) -> None:
+    runs: list[int] = []
+    results: list[bool] = []
+
+    def _initialise(session: Session) -> None:
+        runs.append(1)
+        time.sleep(0.2)
+        _create_schema(session)
+
+    workers = [
+        threading.Thread(target=lambda: results.append(_coordinator(tmp_path).run(_initialise))) for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(runs) == 1
+    assert sorted(results) == [False, False, False, True]
+
+
+def test_new_fingerprint_reinitialises(tmp_path: Path) -> None:
+    assert _coordinator(tmp_path, "v1").run(_create_schema) is True
+    assert _coordinator(tmp_path, "v1").run(_create_schema) is False
+    assert _coordinator(tmp_path, "v2").run(_create_schema) is True
+
+
+def test_upgrade_adds_columns_missing_from_a_baseline_database(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        # The users and revoked_tokens tables as the first releases created them.
+        connection.execute(
+            text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255) UNIQUE, "
+                "hashed_password VARCHAR(255), is_active BOOLEAN NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE revoked_tokens (jti VARCHAR(64) PRIMARY KEY, subject VARCHAR(255), "
+                "token_type VARCHAR(16), reason VARCHAR(32), expires_at INTEGER, "
+                "revoked_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO users (email, hashed_password, is_active) VALUES ('old@example.com', 'x', 1)")
+        )
+    Base.metadata.create_all(bind=engine)
+
+    added = upgrade_schema(engine)
+
+    assert {"users.version", "users.last_login_at", "users.last_seen_at"} <= set(added)
+    assert "ix_revoked_tokens_revoked_at" in added
+    with engine.connect() as connection:
+        row = connection.execute(text("SELECT version, last_login_at, last_seen_at FROM users")).one()
+    assert tuple(row) == (1, None, None)
+    assert "ix_users_email" in {index["name"] for index in inspect(engine).get_indexes("users")}
+    assert upgrade_schema(engine) == []
+
+
+def test_create_app_uses_the_given_settings() -> None:
+    app = main.create_app(Settings(app_name="Factory Test", app_version="9.9.9", metrics_enabled=False))
+
+    assert app.title == "Factory Test"
+    assert app.version == "9.9.9"
+    assert not any(middleware.cls is main.MetricsMiddleware for middleware in app.user_middleware)
+
+
+def test_replica_startup_skips_database_initialisation(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(session: Session) -> None:
+        raise AssertionError("replicas must not initialise the database")
+
+    monkeypatch.setattr(main, "_initialise_database", _fail)
+
+    main.startup(Settings(startup_db_init=False))
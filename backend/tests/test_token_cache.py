@@ -0,0 +1,76 @@
+"""Tests for the verified access-token cache."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.app.core.cache import TTLCache
+from src.app.services.auth import AuthError, AuthService
+
+
+class _FakeClock:
+    def __init__(self, start: float) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(2)
+    expiry = cache.now() + 60
+    cache.set("a", 1, expiry)
+    cache.set("b", 2, expiry)
+    assert cache.get("a") == 1
+    cache.set("c", 3, expiry)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.hits == 3 and stats.misses == 1
+
+
+def test_ttl_cache_drops_expired_entries() -> None:
+    clock = _FakeClock(100.0)
+    cache: TTLCache[str, int] = TTLCache(4, clock=clock)
+    cache.set("a", 1, 110.0)
+    assert cache.get("a") == 1
+
+    clock.now = 110.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_decode_token_skips_verification_on_cache_hit(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = AuthService(token_cache=TTLCache(16, clock=time.time))
+    token = service.create_access_token("cached@example.com", ["viewer"])
+
+    first = service.decode_token(token, expected_type="access")
+
+    def _fail(_: str) -> dict[str, object]:
+        raise AssertionError("signature verified again")
+
+    monkeypatch.setattr(service, "_verify_token", _fail)
+    second = service.decode_token(token, expected_type="access")
+
+    assert second == first
+    assert second is not first
+    stats = service.token_cache_stats()
+    assert stats is not None and stats.hits == 1 and stats.misses == 1
+
+
+def test_cached_token_still_checks_expected_type() -> None:
+    service = AuthService(token_cache=TTLCache(16, clock=time.time))
+    token = service.create_refresh_token("cached@example.com")
+    service.decode_token(token, expected_type="refresh")
+
+    with pytest.raises(AuthError):
+        service.decode_token(token, expected_type="access")
+
+
+def test_token_cache_disabled_by_default() -> None:
+    assert AuthService().token_cache_stats() is None
@@ -0,0 +1,105 @@
+"""Tests for the streaming bulk user import."""
+
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.app.services.auth import auth_service
+from src.app.services.user_import import CsvRowParser, NdjsonRowParser, iter_rows
+from src.app.services.users import user_service
+
+_HASH = auth_service.hash_password("imported")
+
+
+def test_csv_parser_reads_header_and_roles() -> None:
+    lines = ["email,password,roles", "", "A@Example.com,pw,tech;viewer", "broken,row,with,extra"]
+    rows = list(iter_rows(lines, CsvRowParser()))
+
+    assert rows[0].email == "a@example.com"
+    assert rows[0].roles == ("tech", "viewer")
+    assert rows[0].line == 3
+    assert rows[1].error is not None and rows[1].line == 4
+
+
+def test_csv_parser_joins_quoted_fields_across_lines() -> None:
+    lines = [
+        'email,password,"roles',
+        'list"',
+        'a@example.com,"pass,',
+        'word with ""quotes""",viewer',
+        "b@example.com,pw,tech",
+        'c@example.com,"never closed,viewer',
+        "d@example.com,pw,viewer",
+    ]
+    rows = list(iter_rows(lines, CsvRowParser()))
+
+    assert rows[0].line == 3 and rows[0].password == 'pass,\nword with "quotes"' and rows[0].roles == ()
+    assert rows[1].line == 5 and rows[1].email == "b@example.com"
+    # The open quote swallows the following lines until the end of input, which reports it once.
+    assert len(rows) == 3 and rows[2].line == 6 and rows[2].error == "unterminated quoted field"
+
+
+def test_ndjson_parser_reports_invalid_lines() -> None:
+    lines = [json.dumps({"email": "x@example.com", "password_hash": _HASH, "roles": ["tech"]}), "{nope", "[1]"]
+    rows = list(iter_rows(lines, NdjsonRowParser()))
+
+    assert rows[0].password_hash == _HASH and rows[0].roles == ("tech",)
+    assert rows[1].error and rows[2].error
+
+
+def test_bulk_create_users_reports_row_errors(db_session: Session, create_user) -> None:
+    create_user("existing@example.com", "pass", roles=["viewer"])
+    lines = [
+        "email,password,password_hash,roles",
+        "new1@example.com,first-pass,,tech",
+        f"new2@example.com,,{_HASH},viewer|manager",
+        f"new3@example.com,,{_HASH},",
+        "existing@example.com,pass,,viewer",
+        f"new2@example.com,,{_HASH},viewer",
+        "new4@example.com,pass,,pilot",
+        "not-an-email,pass,,viewer",
+        "new5@example.com,,,viewer",
+    ]
+
+    result = user_service.bulk_create_users(db_session, iter_rows(lines, CsvRowParser()), batch_size=2)
+
+    assert result.created == 3
+    assert {error.line: error.message for error in result.errors} == {
+        5: "email already exists",
+        6: "duplicate email in import",
+        7: "unknown roles: pilot",
+        8: "invalid email",
+        9: "missing password",
+    }
+    user = user_service.get_by_email(db_session, "new2@example.com", with_roles=True)
+    assert user is not None
+    assert sorted(user_service.list_role_names(user)) == ["manager", "viewer"]
+    first = user_service.get_by_email(db_session, "new1@example.com")
+    assert first is not None and auth_service.verify_password("first-pass", first.hashed_password)
+
+
+def test_import_endpoint_streams_ndjson(client: TestClient, create_user) -> None:
+    create_user("admin@example.com", "admin-pass", roles=["admin"])
+    create_user("viewer@example.com", "viewer-pass", roles=["viewer"])
+
+    def _headers(email: str, password: str, content_type: str) -> dict[str, str]:
+        login = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+        return {"Authorization": f"Bearer {login.json()['access_token']}", "Content-Type": content_type}
+
+    body = "\n".join(
+        json.dumps({"email": f"tech{index}@example.com", "password_hash": _HASH, "roles": "tech"}) for index in range(5)
+    )
+    body += "\n{broken\n"
+
+    admin = _headers("admin@example.com", "admin-pass", "application/x-ndjson")
+    response = client.post("/api/v1/users/import?batch_size=2", content=body, headers=admin)
+    assert response.status_code == 200
+    assert response.json()["created"] == 5
+    assert response.json()["errors"][0]["line"] == 6
+
+    assert client.post("/api/v1/users/import", content="x", headers={**admin, "Content-Type": "text/plain"}).status_code == 415
+    viewer = _headers("viewer@example.com", "viewer-pass", "text/csv")
+    assert client.post("/api/v1/users/import", content="email,password\n", headers=viewer).status_code == 403
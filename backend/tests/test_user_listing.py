@@ -0,0 +1,106 @@
+"""Tests for the keyset-paginated user listing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.services.users import user_service
+
+
+@pytest.fixture()
+def admin_headers(client: TestClient, create_user) -> dict[str, str]:
+    create_user("lister@example.com", "pass", roles=["admin"])
+    for index in range(5):
+        create_user(f"member{index}@example.com", "pass", roles=["tech"] if index % 2 else ["viewer"])
+    response = client.post("/api/v1/auth/login", json={"email": "lister@example.com", "password": "pass"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_keyset_pages_cover_every_user_once(client: TestClient, admin_headers) -> None:
+    emails: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "after": cursor}
+        response = client.get("/api/v1/users", params=params, headers=admin_headers)
+        assert response.status_code == 200
+        page = response.json()
+        emails += [item["email"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(emails) == len(set(emails)) == 6
+    assert emails[0] == "lister@example.com"
+
+
+def test_role_filter(client: TestClient, admin_headers) -> None:
+    response = client.get("/api/v1/users", params={"role": "tech"}, headers=admin_headers)
+
+    items = response.json()["items"]
+    assert [item["email"] for item in items] == ["member1@example.com", "member3@example.com"]
+    assert all(item["roles"] == [{"name": "tech"}] for item in items)
+    assert response.json()["next_cursor"] is None
+
+
+def test_page_costs_three_statements(admin_headers, async_engine) -> None:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    async def _list() -> list:
+        async with AsyncSession(async_engine) as session:
+            event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+            try:
+                return await user_service.list_users_async(session, limit=4)
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+    users = asyncio.run(_list())
+
+    assert len(users) == 4
+    assert all(user.roles and user.effective_roles for user in users)
+    assert len(statements) == 3
+
+
+def test_ndjson_mode_streams_the_directory(client: TestClient, admin_headers) -> None:
+    headers = {**admin_headers, "Accept": "application/x-ndjson"}
+    with client.stream("GET", "/api/v1/users", params={"role": "viewer"}, headers=headers) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [record["email"] for record in records] == [
+        "member0@example.com",
+        "member2@example.com",
+        "member4@example.com",
+    ]
+    assert records[0]["roles"] == [{"name": "viewer"}]
+    assert records[0]["effective_roles"] == [{"name": "viewer"}]
+
+
+def test_listing_and_profile_agree_on_roles(client: TestClient, admin_headers) -> None:
+    response = client.get("/api/v1/users", params={"role": "tech"}, headers=admin_headers)
+    listed = response.json()["items"][0]
+    login = client.post("/api/v1/auth/login", json={"email": listed["email"], "password": "pass"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    assert listed["roles"] == [{"name": "tech"}]
+    assert listed["effective_roles"] == [{"name": "tech"}, {"name": "viewer"}]
+    for path in ("/api/v1/users/me", "/api/v1/auth/me"):
+        profile = client.get(path, headers=headers).json()
+        assert (profile["roles"], profile["effective_roles"]) == (listed["roles"], listed["effective_roles"])
+
+
+def test_listing_requires_users_manage(client: TestClient, create_user) -> None:
+    create_user("plain@example.com", "pass", roles=["viewer"])
+    response = client.post("/api/v1/auth/login", json={"email": "plain@example.com", "password": "pass"})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    assert client.get("/api/v1/users", headers=headers).status_code == 403